@@ -1,19 +1,24 @@
 """Main orchestrator agent for research coordination."""
 
-import os
-import uuid
+import asyncio
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import inspect
+import logging
+import secrets
+import string
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Annotated, Any, Literal, TypedDict
 
-from deepagents import create_deep_agent
-from deepagents.backends import CompositeBackend, StateBackend, StoreBackend
-from langchain.chat_models import init_chat_model
-from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.store.memory import InMemoryStore
+import orjson
 
-from ..backends.memory import ChromaMemoryStore, MemoryManager
+from ..backends.memory import MemoryManager, create_memory_store
 from ..backends.persistence import PersistenceManager
 from ..config import Settings
 from ..middleware.hooks import HookManager
@@ -25,17 +30,83 @@ from ..middleware.lifecycle import (
     QualityGateMiddleware,
     ResearchWriteMiddleware,
     SearchMiddleware,
+    middleware_session,
 )
 from ..skills.loader import SkillRegistry
 from ..utils.logging import get_logger
+from ..utils.rate_limit import AsyncRateLimiter
 from .subagents import SubagentConfig, SubagentManager
-from .tools import create_file_context_tool, create_file_tools, create_memory_tools, create_search_tool
+from .tools import (
+    create_file_context_tool,
+    create_file_tools,
+    create_memory_tools,
+    create_parallel_search_tool,
+    create_search_tool,
+)
+
+if TYPE_CHECKING:
+    import httpx
+
+    # deepagents and the model integrations are slow to import, so they are
+    # imported where first used to keep session queries and the CLI fast.
+    from deepagents.backends import CompositeBackend
+    from langchain_core.messages import AnyMessage
+    from langgraph.graph.message import add_messages
+
+    # Type alias for the backend factory
+    BackendFactory = CompositeBackend
 
-# Type alias for the backend factory
-BackendFactory = CompositeBackend
+    class ResearchState(TypedDict, total=False):
+        """State shared by the plan, subagent, and synthesize nodes."""
+
+        problem: str
+        subagents: list[dict]
+        messages: Annotated[list[AnyMessage], add_messages]
 
 logger = get_logger(__name__)
 
+# Tool implementations bound to the running session. Cached graphs hold routing
+# wrappers that dispatch through this, so one compiled graph serves every session.
+_session_tools: ContextVar[dict[str, Callable[..., Any]]] = ContextVar("session_tools")
+
+
+def _route_to_session(tool: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a tool so each call dispatches to the current session's binding."""
+    name = tool.__name__
+
+    if inspect.iscoroutinefunction(tool):
+        @functools.wraps(tool)
+        async def routed_async(*args: Any, **kwargs: Any) -> Any:
+            return await _session_tools.get()[name](*args, **kwargs)
+
+        return routed_async
+
+    @functools.wraps(tool)
+    def routed(*args: Any, **kwargs: Any) -> Any:
+        return _session_tools.get()[name](*args, **kwargs)
+
+    return routed
+
+
+def _make_backend(runtime: object) -> "CompositeBackend":
+    """Create the agent backend, routing /memories/ to the shared store."""
+    from deepagents.backends import CompositeBackend, StateBackend, StoreBackend
+
+    return CompositeBackend(
+        default=StateBackend(runtime),
+        routes={
+            "/memories/": StoreBackend(runtime),
+        },
+    )
+
+
+# Maps spaces to hyphens when deriving subagent names from focus areas
+_NAME_TRANSLATION = str.maketrans(" ", "-")
+
+# LangGraph durability per Settings.checkpoint_mode: "exit" keeps checkpoints in
+# memory during the run and persists once when the graph finishes.
+CHECKPOINT_DURABILITY = {"per_step": "async", "end_of_workflow": "exit"}
+
 
 ORCHESTRATOR_SYSTEM_PROMPT = """You are a DEEP RESEARCH orchestrator agent. You conduct rigorous, multi-cycle research that produces novel, well-evidenced insights.
 
@@ -47,6 +118,12 @@ You are NOT a simple summarizer. You are a critical researcher who:
 - Iterates through multiple cycles of research and refinement
 - Produces novel insights, not just summaries of existing knowledge
 
+## Subagent Findings
+
+Focus-area subagents research the problem in parallel before you start. Their
+summaries arrive as "Findings from <subagent>" messages and their detailed notes
+are in their output directories - build on them rather than repeating their work.
+
 ## Research Process (MUST Follow All Phases)
 
 ### PHASE 1: Problem Decomposition & Initial Research
@@ -118,11 +195,13 @@ Your research MUST:
   - Use search_depth="advanced" for important queries
   - Use topic="news" for recent developments
   - Use topic="finance" for business/market topics
+- **internet_search_many(queries, max_results, topic, search_depth)**: Run up to 10 searches at once - use it for independent query variations
 - **write_file(file_path, content)**: Write research output files
 - **read_file(file_path)**: Read your previous research files
 - **list_files(directory)**: List files in the output directory
 - **remember(content, memory_type, tags)**: Store key insights in long-term memory
 - **recall(query, n_results)**: Recall relevant memories from past research
+- **recall_batch(queries, n_results)**: Recall memories for several queries in one lookup
 
 ## Output Structure
 
@@ -145,6 +224,103 @@ Create these files in order:
 """
 
 
+FOCUS_AREA_PLANNING_PROMPT = """You are planning a deep research session.
+
+## Problem Statement
+{problem}
+
+Identify 3-5 distinct research dimensions that together cover this problem.
+Respond with one dimension per line, a few words each, and nothing else."""
+
+
+SUBAGENT_TASK_MESSAGE = """# Focused Research Assignment
+
+## Problem Statement
+{problem}
+
+## Your Focus Area
+{description}
+
+Research the problem strictly from the perspective of your focus area.
+Write your detailed findings to markdown files under `{name}/`.
+Finish with a concise summary of your key findings, including sources and confidence ratings.
+"""
+
+
+# Built once at import; run_research only substitutes the per-session values.
+INPUT_FILES_TEMPLATE = string.Template("""
+## Input Files
+
+The following files have been provided:
+$files
+
+Use the `get_input_context` tool to read their contents.
+""")
+
+INITIAL_MESSAGE_TEMPLATE = string.Template("""# Deep Research Request
+
+## Problem Statement
+$problem
+$files_section
+## Your Mission
+
+Conduct RIGOROUS, MULTI-PHASE research on this problem. You must:
+
+### Phase 1: Initial Exploration (Required)
+- Start by conducting at least 5 web searches to understand the problem space
+- Search for: fundamentals, current state, key players, recent developments
+- Write findings to `phase1_initial_research.md`
+
+### Phase 2: Deep Investigation (Required)
+- Based on Phase 1, identify the most promising angles
+- Conduct 10+ additional targeted searches
+- Look for academic papers, case studies, expert opinions
+- Write detailed findings to `phase2_deep_dive.md`
+
+### Phase 3: Critical Challenge (Required)
+- Re-read your findings critically
+- Search for counterarguments and potential failures
+- Identify gaps and weaknesses in your research
+- Write critical analysis to `phase3_critical_review.md`
+
+### Phase 4: Synthesis (Required)
+- Connect insights across all research
+- Develop novel conclusions with confidence ratings
+- Write synthesis to `phase4_synthesis.md`
+
+### Phase 5: Final Report (Required)
+- Compile everything into `FINAL_REPORT.md`
+
+## Critical Requirements
+
+1. You MUST conduct at least 15-20 web searches total
+2. You MUST cite sources for factual claims
+3. You MUST complete ALL phases - no shortcuts
+4. You MUST search for contradicting evidence, not just confirming evidence
+5. You MUST write each phase file before proceeding to the next
+
+Begin with Phase 1 now. Start by writing your RESEARCH_PLAN.md with research questions, then conduct your initial web searches.
+""")
+
+
+@functools.cache
+def _research_state() -> "type[ResearchState]":
+    """Build ``ResearchState`` at runtime.
+
+    Built on first use so importing this module doesn't load LangGraph; type
+    checkers see the module-level definition instead.
+    """
+    from langchain_core.messages import AnyMessage
+    from langgraph.graph.message import add_messages
+
+    class ResearchState(TypedDict, total=False):
+        problem: str
+        subagents: list[dict]
+        messages: Annotated[list[AnyMessage], add_messages]
+
+    return ResearchState
+
+
 class ResearchOrchestrator:
     """Orchestrates research sessions using DeepAgents."""
 
@@ -166,30 +342,128 @@ class ResearchOrchestrator:
         self.persistence = PersistenceManager(
             db_path=settings.sqlite_db_path,
             base_output_dir=output_dir,
+            pragmas=settings.get_sqlite_pragmas(),
         )
 
         # Initialize memory
-        self.chroma_store = ChromaMemoryStore(
+        self.memory_store = create_memory_store(
+            settings.memory_backend,
             persist_directory=settings.chromadb_path,
         )
-        self.memory_manager = MemoryManager(self.chroma_store)
+        self.memory_manager = MemoryManager(
+            self.memory_store,
+            batch_size=settings.memory_batch_size,
+            flush_interval=settings.memory_flush_interval_seconds,
+            keyword_store=self.persistence.store,
+        )
+
+        # Shared across sessions (keyed by thread_id) so compiled graphs can be
+        # reused; opened on the first session by _open_graph_state
+        self.checkpointer: Any = None
+        self.store: Any = None
+        self._graph_connections: list[Any] = []
+        self._routed_tools: dict[str, Callable[..., Any]] = {}
+        self._graph_cache: dict[tuple[str, tuple[str, ...], str], Any] = {}
+        self._get_agent = functools.lru_cache(maxsize=32)(self._build_agent)
+
+        # Middleware is built once and reads each session's MiddlewareContext
+        # from the context activated in run_research
+        self._middleware = [
+            PlanCreationMiddleware(),
+            AgentSpawnMiddleware(),
+            ResearchWriteMiddleware(),
+            SearchMiddleware(),
+            AgentCompletionMiddleware(),
+        ]
+        self.quality_gate = QualityGateMiddleware()
+
+        self._skills_prompt_cache: str | None = None
+        self._system_prompt_cache: str | None = None
+        self._warmed = False
+        # Kept so the warm-up isn't collected mid-request and aclose() can cancel it
+        self._warmup_task: asyncio.Task[None] | None = None
+        # Caps concurrent subagents across all sessions on this orchestrator
+        self._sem = asyncio.Semaphore(settings.max_parallel_agents)
+        # Shared by every session's search tool so bursts of parallel searches
+        # stay under the provider's rate limit
+        self._search_limiter = (
+            AsyncRateLimiter(settings.search_rate_limit) if settings.search_rate_limit > 0 else None
+        )
+
+        logger.info(f"Initialized ResearchOrchestrator with model: {settings.default_llm_model}")
+
+    @functools.cached_property
+    def _http_transport(self) -> "httpx.AsyncHTTPTransport":
+        """Connection pool shared by the model and search clients.
+
+        Multiplexes requests over HTTP/2 when ``h2`` is installed (the ``fast``
+        extra) and retries failed connection attempts once.
+        """
+        import httpx
+
+        return httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            http2=importlib.util.find_spec("h2") is not None,
+            retries=1,
+        )
+
+    def _pooled_http_client(self) -> "httpx.AsyncClient":
+        """Create a client over the shared pool; headers stay per client."""
+        import httpx
+
+        return httpx.AsyncClient(transport=self._http_transport, timeout=60.0)
+
+    @functools.cached_property
+    def _search_http_client(self) -> "httpx.AsyncClient":
+        """Pooled client for web search, kept alive across sessions."""
+        return self._pooled_http_client()
+
+    @functools.cached_property
+    def model(self) -> Any:
+        """Chat model for the orchestrator, initialized on first use."""
+        if self.settings.default_llm_provider == "openrouter":
+            from langchain_openai import ChatOpenAI
 
-        # Initialize model
-        if settings.default_llm_provider == "openrouter":
             # OpenRouter uses OpenAI-compatible API
-            self.model = ChatOpenAI(
-                model=settings.default_llm_model,
-                api_key=settings.openrouter_api_key,
+            return ChatOpenAI(
+                model=self.settings.default_llm_model,
+                api_key=self.settings.openrouter_api_key,
                 base_url="https://openrouter.ai/api/v1",
+                http_async_client=self._pooled_http_client(),
             )
-        else:
-            self.model = init_chat_model(settings.get_model_string())
 
-        logger.info(f"Initialized ResearchOrchestrator with model: {settings.default_llm_model}")
+        from langchain.chat_models import init_chat_model
+
+        if self.settings.default_llm_provider == "openai":
+            return init_chat_model(
+                self.settings.get_model_string(),
+                http_async_client=self._pooled_http_client(),
+            )
+        return init_chat_model(self.settings.get_model_string())
+
+    def _register_subagents(self, session_id: str, subagents: list[dict]) -> None:
+        """Record a session's subagent roster with a single write."""
+        if not subagents:
+            return
+        self.persistence.store.append_session_activity(
+            session_id,
+            agents=[
+                {
+                    "id": f"{session_id}:{config['name']}",
+                    "agent_name": config["name"],
+                    "focus_area": config.get("description", ""),
+                    "state_data": {"model": config.get("model")},
+                }
+                for config in subagents
+            ],
+        )
 
     def _create_subagents_config(self, focus_areas: list[str]) -> list[dict]:
         """Create subagent configurations for focus areas."""
         subagents = []
+        # Subagent names must be unique within a session: they key agent_states
+        # rows and the task tool's subagent lookup
+        names: set[str] = set()
 
         for focus_area in focus_areas:
             # Try to find a matching configured subagent
@@ -197,12 +471,24 @@ class ResearchOrchestrator:
                 matches = self.subagent_manager.match_for_focus(focus_area)
                 if matches:
                     config = matches[0]
-                    subagents.append(config.to_deepagent_config())
+                    # Several focus areas can map to one configured subagent
+                    if config.name not in names:
+                        names.add(config.name)
+                        subagents.append(config.deepagent_config)
                     continue
 
+            # Truncated focus areas can collide, so number repeated names
+            base_name = f"research-{focus_area.lower().translate(_NAME_TRANSLATION)[:20]}"
+            name = base_name
+            suffix = 2
+            while name in names:
+                name = f"{base_name}-{suffix}"
+                suffix += 1
+            names.add(name)
+
             # Create dynamic subagent with deep research capabilities
             dynamic_config = SubagentConfig(
-                name=f"research-{focus_area.lower().replace(' ', '-')[:20]}",
+                name=name,
                 description=f"Deep research agent for: {focus_area}",
                 system_prompt=f"""You are a DEEP RESEARCH subagent focused on: {focus_area}
 
@@ -245,12 +531,223 @@ Write your findings to markdown files with:
 
         return subagents
 
+    async def _plan_focus_areas(self, problem: str) -> list[str]:
+        """Ask the orchestrator model to decompose a problem into focus areas."""
+        from langchain_core.messages import HumanMessage
+
+        response = await self.model.ainvoke(
+            [HumanMessage(content=FOCUS_AREA_PLANNING_PROMPT.format(problem=problem))]
+        )
+        content = response.content if isinstance(response.content, str) else str(response.content)
+        focus_areas = []
+        for line in content.splitlines():
+            area = line.strip().lstrip("-*0123456789.) ").strip()
+            if area:
+                focus_areas.append(area)
+        return focus_areas[:5]
+
+    @property
+    def _base_system_prompt(self) -> str:
+        """Session-independent system prompt: orchestrator instructions plus skills.
+
+        Rebuilt only when the registry's combined skills prompt changes.
+        """
+        skills_prompt = self.skills_registry.get_combined_prompt() if self.skills_registry else ""
+        if self._system_prompt_cache is None or skills_prompt is not self._skills_prompt_cache:
+            parts = [ORCHESTRATOR_SYSTEM_PROMPT]
+            if skills_prompt:
+                parts += ["\n\n## Available Skills\n\n", skills_prompt]
+            self._skills_prompt_cache = skills_prompt
+            self._system_prompt_cache = "".join(parts)
+        return self._system_prompt_cache
+
+    async def warmup(self) -> None:
+        """Send a 1-token request so connection setup and auth happen off the critical path."""
+        if self._warmed:
+            return
+        from langchain_core.messages import HumanMessage
+
+        self._warmed = True
+        try:
+            await self.model.ainvoke([HumanMessage(content="ping")], max_tokens=1)
+        except Exception as e:
+            logger.debug(f"Model warm-up failed: {e}")
+
+    async def _open_graph_state(self) -> None:
+        """Create the shared checkpointer and store for the configured backend."""
+        if self.checkpointer is not None:
+            return
+
+        if self.settings.checkpoint_backend == "sqlite":
+            try:
+                import aiosqlite
+                from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+                from langgraph.store.sqlite.aio import AsyncSqliteStore
+            except ImportError as e:
+                raise ImportError(
+                    "CHECKPOINT_BACKEND=sqlite requires langgraph-checkpoint-sqlite. "
+                    "Install with: pip install 'brainstormer[sqlite]'"
+                ) from e
+
+            db_path = str(self.settings.sqlite_db_path)
+            checkpoint_conn = await aiosqlite.connect(db_path)
+            store_conn = await aiosqlite.connect(db_path, isolation_level=None)
+            self._graph_connections = [checkpoint_conn, store_conn]
+            self.checkpointer = AsyncSqliteSaver(checkpoint_conn)
+            self.store = AsyncSqliteStore(store_conn)
+            logger.info(f"Using SQLite checkpointer and store at {db_path}")
+        else:
+            from langgraph.checkpoint.memory import MemorySaver
+            from langgraph.store.memory import InMemoryStore
+
+            self.checkpointer = MemorySaver()
+            self.store = InMemoryStore()
+
+    async def aclose(self) -> None:
+        """Close shared connections: checkpointer/store, session database and HTTP pool."""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._warmup_task
+        self._warmup_task = None
+        # Buffered memories are indexed into the session database closed below
+        await self.memory_manager.aflush()
+        for conn in self._graph_connections:
+            await conn.close()
+        self._graph_connections = []
+        self.checkpointer = None
+        self.store = None
+        # Cached graphs and agents hold the closed checkpointer and store
+        self._graph_cache.clear()
+        self._get_agent.cache_clear()
+        self.persistence.store.close()
+
+        # Release pooled HTTP connections; clients are rebuilt on next use
+        if "_http_transport" in self.__dict__:
+            await self._http_transport.aclose()
+            for name in ("_http_transport", "_search_http_client", "model"):
+                self.__dict__.pop(name, None)
+
+    def _build_agent(
+        self,
+        model_name: str | None,
+        system_prompt: str,
+        tool_names: tuple[str, ...],
+    ) -> Any:
+        """Compile a deep agent whose tools dispatch to the current session."""
+        from deepagents import create_deep_agent
+        from langchain.chat_models import init_chat_model
+
+        model = init_chat_model(model_name) if model_name else self.model
+        return create_deep_agent(
+            model=model,
+            tools=[self._routed_tools[name] for name in tool_names],
+            system_prompt=system_prompt,
+            store=self.store,
+            backend=_make_backend,
+        )
+
+    def _get_research_graph(self, tool_names: tuple[str, ...], system_prompt: str) -> Any:
+        """Get the compiled research graph, building it on first use."""
+        key = (
+            self.settings.default_llm_model,
+            tool_names,
+            hashlib.sha256(system_prompt.encode()).hexdigest(),
+        )
+        if key not in self._graph_cache:
+            self._graph_cache[key] = self._build_research_graph(tool_names, system_prompt)
+        return self._graph_cache[key]
+
+    def _build_research_graph(self, tool_names: tuple[str, ...], system_prompt: str) -> Any:
+        """Build the plan -> parallel subagents -> synthesize research graph.
+
+        Every subagent is dispatched with ``Send`` in the same super-step, so
+        focus areas are researched concurrently before the orchestrator
+        synthesizes their findings.
+        """
+        from langchain_core.messages import AIMessage
+        from langchain_core.runnables import RunnableConfig
+        from langgraph.graph import END, START, StateGraph
+        from langgraph.types import Send
+
+        async def plan(state: "ResearchState", config: RunnableConfig) -> dict[str, Any]:
+            if state.get("subagents"):
+                return {}
+            focus_areas = await self._plan_focus_areas(state["problem"])
+            logger.info(f"Planned {len(focus_areas)} focus areas: {focus_areas}")
+            subagents = self._create_subagents_config(focus_areas)
+            self._register_subagents(config["configurable"]["thread_id"], subagents)
+            return {"subagents": subagents}
+
+        # LangGraph resolves a branch's type hints eagerly, and ResearchState
+        # only exists under TYPE_CHECKING, so the router takes a plain dict.
+        def dispatch(state: dict[str, Any]) -> list[Send] | str:
+            subagents = state.get("subagents") or []
+            if not subagents:
+                return "synthesize"
+            return [
+                Send("subagent", {"config": config, "problem": state["problem"]})
+                for config in subagents
+            ]
+
+        async def subagent(state: dict[str, Any]) -> dict[str, Any]:
+            config = state["config"]
+            name = config["name"]
+            agent = self._get_agent(config.get("model"), config["system_prompt"], tool_names)
+            async with self._sem:
+                logger.info(f"Subagent started: {name}")
+                try:
+                    result = await asyncio.wait_for(
+                        agent.ainvoke({
+                            "messages": [{
+                                "role": "user",
+                                "content": SUBAGENT_TASK_MESSAGE.format(
+                                    problem=state["problem"],
+                                    description=config["description"],
+                                    name=name,
+                                ),
+                            }],
+                        }),
+                        timeout=self.settings.agent_timeout_seconds,
+                    )
+                except TimeoutError:
+                    logger.warning(
+                        f"Subagent {name} timed out after "
+                        f"{self.settings.agent_timeout_seconds}s"
+                    )
+                    result = {"messages": [AIMessage(
+                        content="Research did not finish within the time limit; "
+                        "no findings were returned.",
+                    )]}
+            messages = result.get("messages", [])
+            summary = messages[-1].content if messages else ""
+            logger.info(f"Subagent completed: {name}")
+            return {
+                "messages": [AIMessage(content=f"## Findings from {name}\n\n{summary}", name=name)],
+            }
+
+        async def synthesize(state: "ResearchState") -> dict[str, Any]:
+            agent = self._get_agent(None, system_prompt, tool_names)
+            result = await agent.ainvoke({"messages": state["messages"]})
+            return {"messages": result.get("messages", [])}
+
+        graph: StateGraph[ResearchState] = StateGraph(_research_state())
+        graph.add_node("plan", plan)
+        graph.add_node("subagent", subagent)
+        graph.add_node("synthesize", synthesize)
+        graph.add_edge(START, "plan")
+        graph.add_conditional_edges("plan", dispatch, ["subagent", "synthesize"])
+        graph.add_edge("subagent", "synthesize")
+        graph.add_edge("synthesize", END)
+        return graph.compile(checkpointer=self.checkpointer)
+
     async def run_research(
         self,
         problem: str,
         input_files: list[dict] | None = None,
         focus_areas: list[str] | None = None,
         session_id: str | None = None,
+        checkpoint_mode: Literal["per_step", "end_of_workflow"] | None = None,
     ) -> dict:
         """
         Run a research session.
@@ -260,211 +757,188 @@ Write your findings to markdown files with:
             input_files: Parsed input files (from file_parser)
             focus_areas: Optional predefined focus areas
             session_id: Optional session ID (generated if not provided)
+            checkpoint_mode: Override Settings.checkpoint_mode for this session
 
         Returns:
             Research session results
         """
-        session_id = session_id or f"research-{datetime.now(tz=UTC).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        # Warm the model connection while the session is being set up; the
+        # graph starts without waiting for it
+        if self.settings.model_warmup and self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self.warmup())
 
-        # Create session in persistence
-        self.persistence.store.create_session(
-            session_id=session_id,
-            problem=problem,
-            metadata={
-                "input_files": [f["name"] for f in (input_files or [])],
-                "start_time": datetime.now(tz=UTC).isoformat(),
-            },
-        )
+        started_at = time.time()
+        if not session_id:
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(started_at))
+            session_id = f"research-{stamp}-{secrets.token_hex(4)}"
 
-        # Create middleware context
-        middleware_context = MiddlewareContext(
-            session_id=session_id,
-            hook_manager=self.hook_manager,
-            persistence=self.persistence,
-            memory=self.memory_manager,
-        )
-
-        # Initialize middleware
-        _ = PlanCreationMiddleware(middleware_context)
-        _ = AgentSpawnMiddleware(middleware_context)
-        _ = ResearchWriteMiddleware(middleware_context)
-        _ = SearchMiddleware(middleware_context)
-        _ = AgentCompletionMiddleware(middleware_context)
-        quality_gate = QualityGateMiddleware(middleware_context)
-
-        # Get the session output directory
-        session_output_dir = self.persistence.get_session_dir(session_id)
-        session_output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create tools (using Any for heterogeneous callable types)
-        tools: list[Any] = []
-
-        # Add file tools for writing research output (with quality tracking)
-        file_tools = create_file_tools(
-            str(session_output_dir),
-            on_write=quality_gate.record_write,
-        )
-        tools.extend(file_tools.values())
-
-        # Add search tool (with quality tracking)
-        if self.settings.tavily_api_key:
-            tools.append(create_search_tool(
-                self.settings.tavily_api_key,
-                on_search=quality_gate.record_search,
-            ))
-
-        # Add memory tools
-        memory_tools = create_memory_tools(self.memory_manager)
-        tools.extend(memory_tools.values())
-
-        # Add input context tool
-        if input_files:
-            tools.append(create_file_context_tool(input_files))
-
-        # Build system prompt
-        system_prompt = ORCHESTRATOR_SYSTEM_PROMPT
-
-        # Add skills to prompt
-        if self.skills_registry:
-            skills_prompt = self.skills_registry.get_combined_prompt()
-            if skills_prompt:
-                system_prompt += f"\n\n## Available Skills\n\n{skills_prompt}"
-
-        # Add input file context to prompt
-        if input_files:
-            files_context = "\n".join([
-                f"- {f['name']} ({f['type']}, {f['size']} bytes)"
-                for f in input_files
-            ])
-            system_prompt += f"\n\n## Input Files\n\nThe following files have been provided:\n{files_context}\n\nUse the `get_input_context` tool to read their contents."
-
-        # Create subagent configurations
+        # Create subagent configurations (planned by the graph when empty)
         subagents = []
         if focus_areas:
             subagents = self._create_subagents_config(focus_areas)
         elif self.subagent_manager:
             # Use all configured subagents
-            subagents = [c.to_deepagent_config() for c in self.subagent_manager.list_all()]
-
-        # Create the deep agent
-        checkpointer = MemorySaver()
-        store = InMemoryStore()
-
-        def make_backend(runtime: object) -> CompositeBackend:
-            return CompositeBackend(
-                default=StateBackend(runtime),
-                routes={
-                    "/memories/": StoreBackend(runtime),
+            subagents = list(self.subagent_manager.deepagent_configs)
+
+        # Create the session and register its subagents in one commit
+        with self.persistence.transaction():
+            self.persistence.store.create_session(
+                session_id=session_id,
+                problem=problem,
+                metadata={
+                    "input_files": [f["name"] for f in (input_files or [])],
+                    "start_time": datetime.fromtimestamp(started_at, UTC).isoformat(
+                        timespec="seconds"
+                    ),
                 },
             )
+            self._register_subagents(session_id, subagents)
 
-        agent = create_deep_agent(
-            model=self.model,
-            tools=tools,
-            system_prompt=system_prompt,
-            subagents=subagents if subagents else None,
-            store=store,
-            backend=make_backend,
-            checkpointer=checkpointer,
-        )
+        # Get the session output directory
+        session_output_dir = self.persistence.get_session_dir(session_id)
 
-        # Execute pre-session hooks
-        await self.hook_manager.execute_pre(
-            "session_start",
-            {"session_id": session_id, "problem": problem},
+        # Create middleware context
+        middleware_context = MiddlewareContext(
+            session_id=session_id,
+            hook_manager=self.hook_manager,
+            persistence=self.persistence,
+            memory=self.memory_manager,
+            session_dir=session_output_dir,
         )
 
-        # Run the agent
-        logger.info(f"Starting research session: {session_id}")
-
-        config = {"configurable": {"thread_id": session_id}}
-        initial_message = f"""# Deep Research Request
+        with middleware_session(middleware_context):
+            # Create tools (using Any for heterogeneous callable types)
+            tools: list[Any] = []
 
-## Problem Statement
-{problem}
-
-## Your Mission
-
-Conduct RIGOROUS, MULTI-PHASE research on this problem. You must:
-
-### Phase 1: Initial Exploration (Required)
-- Start by conducting at least 5 web searches to understand the problem space
-- Search for: fundamentals, current state, key players, recent developments
-- Write findings to `phase1_initial_research.md`
-
-### Phase 2: Deep Investigation (Required)
-- Based on Phase 1, identify the most promising angles
-- Conduct 10+ additional targeted searches
-- Look for academic papers, case studies, expert opinions
-- Write detailed findings to `phase2_deep_dive.md`
-
-### Phase 3: Critical Challenge (Required)
-- Re-read your findings critically
-- Search for counterarguments and potential failures
-- Identify gaps and weaknesses in your research
-- Write critical analysis to `phase3_critical_review.md`
-
-### Phase 4: Synthesis (Required)
-- Connect insights across all research
-- Develop novel conclusions with confidence ratings
-- Write synthesis to `phase4_synthesis.md`
-
-### Phase 5: Final Report (Required)
-- Compile everything into `FINAL_REPORT.md`
-
-## Critical Requirements
-
-1. You MUST conduct at least 15-20 web searches total
-2. You MUST cite sources for factual claims
-3. You MUST complete ALL phases - no shortcuts
-4. You MUST search for contradicting evidence, not just confirming evidence
-5. You MUST write each phase file before proceeding to the next
+            # Add file tools for writing research output (with quality tracking)
+            file_tools = create_file_tools(
+                str(session_output_dir),
+                on_write=self.quality_gate.record_write,
+            )
+            tools.extend(file_tools.values())
+
+            # Add search tool (with quality tracking)
+            if self.settings.tavily_api_key:
+                search_tool = create_search_tool(
+                    self.settings.tavily_api_key,
+                    on_search=self.quality_gate.record_search,
+                    http_client=self._search_http_client,
+                    cache_ttl=self.settings.search_cache_ttl_seconds,
+                    cache_store=self.persistence.store,
+                    rate_limiter=self._search_limiter,
+                )
+                tools.extend([search_tool, create_parallel_search_tool(search_tool)])
+
+            # Add memory tools
+            memory_tools = create_memory_tools(
+                self.memory_manager,
+                dedup_store=self.persistence.store,
+            )
+            tools.extend(memory_tools.values())
+
+            # Add input context tool
+            if input_files:
+                tools.append(create_file_context_tool(input_files))
+
+            # Input files are per-session, so they go in the initial message rather
+            # than the cached system prompt
+            files_section = ""
+            if input_files:
+                files_context = "\n".join(
+                    f"- {f['name']} ({f['type']}, {f['size']} bytes)"
+                    for f in input_files
+                )
+                files_section = INPUT_FILES_TEMPLATE.substitute(files=files_context)
+
+            # Bind this session's tools and reuse the compiled graph for this tool set
+            session_tools = {tool.__name__: tool for tool in tools}
+            for name, tool in session_tools.items():
+                if name not in self._routed_tools:
+                    self._routed_tools[name] = _route_to_session(tool)
+            await self._open_graph_state()
+            graph = self._get_research_graph(tuple(session_tools), self._base_system_prompt)
+
+            # Execute pre-session hooks
+            await self.hook_manager.execute_pre(
+                "session_start",
+                {"session_id": session_id, "problem": problem},
+            )
 
-Begin with Phase 1 now. Start by writing your RESEARCH_PLAN.md with research questions, then conduct your initial web searches.
-"""
+            # Run the agent
+            logger.info(f"Starting research session: {session_id}")
 
-        result = await agent.ainvoke(
-            {"messages": [{"role": "user", "content": initial_message}]},
-            config=config,
-        )
+            config = {"configurable": {"thread_id": session_id}, "recursion_limit": 1000}
+            initial_message = INITIAL_MESSAGE_TEMPLATE.substitute(
+                problem=problem,
+                files_section=files_section,
+            )
 
-        # Debug: Log what the agent returned
-        messages = result.get("messages", [])
-        logger.info(f"Agent returned {len(messages)} messages")
-        for i, msg in enumerate(messages[-5:]):  # Last 5 messages
-            msg_type = type(msg).__name__
-            content = getattr(msg, 'content', str(msg))[:500] if hasattr(msg, 'content') else str(msg)[:500]
-            tool_calls = getattr(msg, 'tool_calls', None)
-            logger.info(f"Message {i}: [{msg_type}] tool_calls={tool_calls}")
-            logger.info(f"  Content: {content}...")
-
-        # Execute post-session hooks
-        await self.hook_manager.execute_post(
-            "session_end",
-            {"session_id": session_id, "result": result},
-        )
+            token = _session_tools.set(session_tools)
+            try:
+                result = await graph.ainvoke(
+                    {
+                        "problem": problem,
+                        "subagents": subagents,
+                        "messages": [{"role": "user", "content": initial_message}],
+                    },
+                    config=config,
+                    durability=CHECKPOINT_DURABILITY[
+                        checkpoint_mode or self.settings.checkpoint_mode
+                    ],
+                )
+            finally:
+                _session_tools.reset(token)
+
+            messages = result.get("messages", [])
+            logger.info(f"Agent returned {len(messages)} messages")
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, msg in enumerate(messages[-5:]):  # Last 5 messages
+                    logger.debug(
+                        "Message %d: [%s] tool_calls=%s",
+                        i, type(msg).__name__, getattr(msg, "tool_calls", None),
+                    )
+                    logger.debug("  Content: %.500s...", getattr(msg, "content", msg))
+
+            # Persist buffered memories before session_end hooks can recall them
+            await self.memory_manager.aflush()
+
+            # Execute post-session hooks
+            await self.hook_manager.execute_post(
+                "session_end",
+                {"session_id": session_id, "result": result},
+            )
 
-        # Generate and save quality report
-        quality_report = quality_gate.get_quality_report()
-        import json
-        report_path = session_output_dir / "QUALITY_REPORT.json"
-        report_path.write_text(json.dumps(quality_report, indent=2))
-        logger.info(
-            f"Quality Report - Score: {quality_report['score']}/100 "
-            f"(Grade: {quality_report['grade']})"
-        )
+            # Generate and save quality report
+            quality_report = self.quality_gate.get_quality_report()
+            self.quality_gate.clear_metrics()
+            report_path = session_output_dir / "QUALITY_REPORT.json"
+            report_data = orjson.dumps(quality_report, option=orjson.OPT_INDENT_2)
+            await asyncio.to_thread(report_path.write_bytes, report_data)
+            logger.info(
+                f"Quality Report - Score: {quality_report['score']}/100 "
+                f"(Grade: {quality_report['grade']})"
+            )
 
-        # Update session status
-        self.persistence.store.update_session(
-            session_id,
-            status="completed",
-            metadata={
-                "end_time": datetime.now(tz=UTC).isoformat(),
-                "message_count": len(result.get("messages", [])),
-                "quality_score": quality_report["score"],
-                "quality_grade": quality_report["grade"],
-            },
-        )
+            # Update session status and record the report in one commit
+            with self.persistence.transaction():
+                self.persistence.store.update_session(
+                    session_id,
+                    status="completed",
+                    metadata={
+                        "end_time": datetime.now(tz=UTC).isoformat(timespec="seconds"),
+                        "message_count": len(result.get("messages", [])),
+                        "quality_score": quality_report["score"],
+                        "quality_grade": quality_report["grade"],
+                    },
+                )
+                self.persistence.store.append_session_activity(
+                    session_id,
+                    artifacts=[{
+                        "id": f"{session_id}:quality-report",
+                        "artifact_type": "quality_report",
+                        "file_path": str(report_path),
+                    }],
+                )
 
         logger.info(f"Research session completed: {session_id}")
 
@@ -509,6 +983,11 @@ Begin with Phase 1 now. Start by writing your RESEARCH_PLAN.md with research que
             "output_dir": str(self.persistence.get_session_dir(session_id)),
         }
 
-    def list_sessions(self, status: str | None = None) -> list[dict]:
-        """List all research sessions."""
-        return self.persistence.store.list_sessions(status)
+    def list_sessions(
+        self,
+        status: str | None = None,
+        limit: int | None = None,
+        after_id: str | None = None,
+    ) -> list[dict]:
+        """List research sessions, newest first, optionally one page at a time."""
+        return self.persistence.store.list_sessions(status, limit=limit, after_id=after_id)
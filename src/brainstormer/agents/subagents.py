@@ -1,17 +1,26 @@
 """Subagent configuration and management via JSONL."""
 
-import json
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import orjson
+
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
+def _trigrams(text: str) -> set[str]:
+    """Character trigrams of a string, used to index substring matches."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass(slots=True)
 class SubagentConfig:
-    """Configuration for a subagent."""
+    """Configuration for a subagent.
+
+    Serializes directly with ``orjson.dumps``; underscore fields are skipped.
+    """
 
     name: str
     description: str
@@ -22,6 +31,7 @@ class SubagentConfig:
     max_depth: int = 2  # Max recursion depth for sub-subagents
     capabilities: list[str] = field(default_factory=list)
     metadata: dict = field(default_factory=dict)
+    _deepagent_config: dict | None = field(default=None, init=False, repr=False, compare=False)
 
     def to_deepagent_config(self) -> dict:
         """Convert to deepagents subagent format."""
@@ -34,6 +44,13 @@ class SubagentConfig:
             config["model"] = self.model
         return config
 
+    @property
+    def deepagent_config(self) -> dict:
+        """Deepagents format, built once; treat as read-only."""
+        if self._deepagent_config is None:
+            self._deepagent_config = self.to_deepagent_config()
+        return self._deepagent_config
+
     @classmethod
     def from_dict(cls, data: dict) -> "SubagentConfig":
         """Create from dictionary."""
@@ -72,18 +89,18 @@ def load_subagents_from_jsonl(file_path: Path) -> list[SubagentConfig]:
         logger.warning(f"Subagents file not found: {file_path}")
         return subagents
 
-    with file_path.open(encoding="utf-8") as f:
+    with file_path.open("rb") as f:
         for line_num, line in enumerate(f, 1):
             line = line.strip()
-            if not line or line.startswith("#"):
+            if not line or line.startswith(b"#"):
                 continue
 
             try:
-                data = json.loads(line)
+                data = orjson.loads(line)
                 subagent = SubagentConfig.from_dict(data)
                 subagents.append(subagent)
                 logger.debug(f"Loaded subagent config: {subagent.name}")
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Invalid JSON on line {line_num}: {e}")
             except KeyError as e:
                 logger.error(f"Missing required field on line {line_num}: {e}")
@@ -92,11 +109,35 @@ def load_subagents_from_jsonl(file_path: Path) -> list[SubagentConfig]:
     return subagents
 
 
+# Resolved JSONL path -> ((mtime_ns, size), parsed configs)
+_parsed_files: dict[Path, tuple[tuple[int, int], tuple[SubagentConfig, ...]]] = {}
+
+
+def _load_subagents_cached(file_path: Path) -> tuple[SubagentConfig, ...]:
+    """Parsed configs for a JSONL file, re-read only when the file changes."""
+    path = file_path.resolve()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return tuple(load_subagents_from_jsonl(file_path))
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _parsed_files.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, tuple(load_subagents_from_jsonl(path)))
+        _parsed_files[path] = cached
+    return cached[1]
+
+
+def _dump_subagents(subagents: list[SubagentConfig]) -> bytes:
+    """Serialize subagent configurations as JSONL."""
+    return b"".join(
+        orjson.dumps(subagent, option=orjson.OPT_APPEND_NEWLINE) for subagent in subagents
+    )
+
+
 def save_subagents_to_jsonl(subagents: list[SubagentConfig], file_path: Path) -> None:
     """Save subagent configurations to a JSONL file."""
-    with file_path.open("w", encoding="utf-8") as f:
-        for subagent in subagents:
-            f.write(json.dumps(subagent.to_dict()) + "\n")
+    file_path.write_bytes(_dump_subagents(subagents))
 
     logger.info(f"Saved {len(subagents)} subagent configurations to {file_path}")
 
@@ -107,6 +148,17 @@ class SubagentManager:
     def __init__(self, config_path: Path | None = None):
         self.config_path = config_path
         self._configs: dict[str, SubagentConfig] = {}
+        # Lowercased (focus_areas, description, capabilities) per config name
+        self._match_terms: dict[str, tuple[tuple[str, ...], str, tuple[str, ...]]] = {}
+        # Trigram -> config names. One string containing another implies they
+        # share a trigram, so this narrows substring matching to candidates.
+        # Configs with focus areas or capabilities under 3 characters can't be
+        # indexed that way and are always candidates.
+        self._trigram_index: dict[str, set[str]] = {}
+        self._short_terms: set[str] = set()
+        # match_for_focus results keyed by lowercased focus area
+        self._by_focus: dict[str, list[SubagentConfig]] = {}
+        self._deepagent_configs: tuple[dict, ...] | None = None
 
         if config_path and config_path.exists():
             self.reload()
@@ -115,8 +167,43 @@ class SubagentManager:
         """Reload configurations from file."""
         if self.config_path:
             self._configs.clear()
-            for config in load_subagents_from_jsonl(self.config_path):
-                self._configs[config.name] = config
+            self._deepagent_configs = None
+            self._match_terms.clear()
+            self._trigram_index.clear()
+            self._short_terms.clear()
+            self._by_focus.clear()
+            for config in _load_subagents_cached(self.config_path):
+                self._add(config)
+
+    def _add(self, config: SubagentConfig) -> None:
+        """Store a configuration and index its match terms."""
+        if config.name in self._match_terms:
+            self._unindex(config.name)
+        self._configs[config.name] = config
+        self._deepagent_configs = None
+
+        focus_areas = tuple(fa.lower() for fa in config.focus_areas)
+        description = config.description.lower()
+        capabilities = tuple(cap.lower() for cap in config.capabilities)
+        self._match_terms[config.name] = (focus_areas, description, capabilities)
+
+        for term in (*focus_areas, description, *capabilities):
+            for gram in _trigrams(term):
+                self._trigram_index.setdefault(gram, set()).add(config.name)
+        if any(len(term) < 3 for term in (*focus_areas, *capabilities)):
+            self._short_terms.add(config.name)
+
+    def _unindex(self, name: str) -> None:
+        """Drop a configuration's terms from the trigram index."""
+        focus_areas, description, capabilities = self._match_terms.pop(name)
+        for term in (*focus_areas, description, *capabilities):
+            for gram in _trigrams(term):
+                names = self._trigram_index.get(gram)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del self._trigram_index[gram]
+        self._short_terms.discard(name)
 
     def get(self, name: str) -> SubagentConfig | None:
         """Get a subagent configuration by name."""
@@ -126,9 +213,21 @@ class SubagentManager:
         """List all configurations."""
         return list(self._configs.values())
 
+    @property
+    def deepagent_configs(self) -> tuple[dict, ...]:
+        """All configurations in deepagents format, converted once per change."""
+        if self._deepagent_configs is None:
+            self._deepagent_configs = tuple(
+                config.deepagent_config for config in self._configs.values()
+            )
+        return self._deepagent_configs
+
     def register(self, config: SubagentConfig) -> None:
         """Register a configuration."""
-        self._configs[config.name] = config
+        # The config may have been edited since its deepagents dict was cached
+        config._deepagent_config = None
+        self._add(config)
+        self._by_focus.clear()
 
     def save(self) -> None:
         """Save current configurations to file."""
@@ -137,16 +236,33 @@ class SubagentManager:
 
     def match_for_focus(self, focus_area: str) -> list[SubagentConfig]:
         """Find subagents suitable for a focus area."""
-        matches = []
         focus_lower = focus_area.lower()
+        cached = self._by_focus.get(focus_lower)
+        if cached is not None:
+            return list(cached)
 
-        for config in self._configs.values():
+        if len(focus_lower) < 3:
+            candidates: set[str] = set(self._configs)
+        else:
+            candidates = self._short_terms.union(
+                *(self._trigram_index.get(gram, ()) for gram in _trigrams(focus_lower))
+            )
+
+        matches = []
+        for name, config in self._configs.items():
+            if name not in candidates:
+                continue
+            focus_areas, description, capabilities = self._match_terms[name]
             # Check if focus area matches any configured focus areas
-            if any(fa.lower() in focus_lower or focus_lower in fa.lower()
-                   for fa in config.focus_areas) or focus_lower in config.description.lower() or any(cap.lower() in focus_lower for cap in config.capabilities):
+            if (
+                any(fa in focus_lower or focus_lower in fa for fa in focus_areas)
+                or focus_lower in description
+                or any(cap in focus_lower for cap in capabilities)
+            ):
                 matches.append(config)
 
-        return matches
+        self._by_focus[focus_lower] = matches
+        return list(matches)
 
     def create_dynamic_subagent(
         self,
@@ -186,13 +302,11 @@ Your responsibilities:
         )
 
 
-def create_default_subagents_file(file_path: Path) -> None:
-    """Create a default subagents.jsonl file with example configurations."""
-    default_subagents = [
-        SubagentConfig(
-            name="literature-researcher",
-            description="Expert at finding and analyzing academic and technical literature",
-            system_prompt="""You are an expert literature researcher. Your task is to:
+_DEFAULT_SUBAGENTS = [
+    SubagentConfig(
+        name="literature-researcher",
+        description="Expert at finding and analyzing academic and technical literature",
+        system_prompt="""You are an expert literature researcher. Your task is to:
 1. Search for relevant academic papers, articles, and technical documentation
 2. Analyze and summarize key findings
 3. Identify trends and patterns in the literature
@@ -200,14 +314,14 @@ def create_default_subagents_file(file_path: Path) -> None:
 5. Compile comprehensive literature reviews
 
 Focus on accuracy and proper attribution of sources.""",
-            focus_areas=["literature", "academic", "papers", "research"],
-            tools=["internet_search", "write_file", "read_file"],
-            capabilities=["literature_review", "academic_research", "citation"],
-        ),
-        SubagentConfig(
-            name="market-analyst",
-            description="Specialist in market research, trends, and competitive analysis",
-            system_prompt="""You are a market research analyst. Your responsibilities:
+        focus_areas=["literature", "academic", "papers", "research"],
+        tools=["internet_search", "write_file", "read_file"],
+        capabilities=["literature_review", "academic_research", "citation"],
+    ),
+    SubagentConfig(
+        name="market-analyst",
+        description="Specialist in market research, trends, and competitive analysis",
+        system_prompt="""You are a market research analyst. Your responsibilities:
 1. Research market trends and dynamics
 2. Analyze competitive landscape
 3. Identify market opportunities and threats
@@ -215,14 +329,14 @@ Focus on accuracy and proper attribution of sources.""",
 5. Compile actionable market intelligence reports
 
 Use multiple sources to validate findings.""",
-            focus_areas=["market", "competitive", "trends", "business"],
-            tools=["internet_search", "write_file", "read_file"],
-            capabilities=["market_research", "competitive_analysis", "trend_analysis"],
-        ),
-        SubagentConfig(
-            name="technical-analyst",
-            description="Expert in technical research, architecture analysis, and technology evaluation",
-            system_prompt="""You are a technical research analyst. Your focus:
+        focus_areas=["market", "competitive", "trends", "business"],
+        tools=["internet_search", "write_file", "read_file"],
+        capabilities=["market_research", "competitive_analysis", "trend_analysis"],
+    ),
+    SubagentConfig(
+        name="technical-analyst",
+        description="Expert in technical research, architecture analysis, and technology evaluation",
+        system_prompt="""You are a technical research analyst. Your focus:
 1. Research technical implementations and architectures
 2. Evaluate technologies and frameworks
 3. Analyze technical trade-offs
@@ -230,14 +344,14 @@ Use multiple sources to validate findings.""",
 5. Identify technical risks and considerations
 
 Provide detailed technical analysis with practical recommendations.""",
-            focus_areas=["technical", "technology", "architecture", "engineering"],
-            tools=["internet_search", "write_file", "read_file"],
-            capabilities=["technical_research", "architecture_analysis", "tech_evaluation"],
-        ),
-        SubagentConfig(
-            name="data-researcher",
-            description="Specialist in finding, analyzing, and synthesizing data from various sources",
-            system_prompt="""You are a data research specialist. Your tasks:
+        focus_areas=["technical", "technology", "architecture", "engineering"],
+        tools=["internet_search", "write_file", "read_file"],
+        capabilities=["technical_research", "architecture_analysis", "tech_evaluation"],
+    ),
+    SubagentConfig(
+        name="data-researcher",
+        description="Specialist in finding, analyzing, and synthesizing data from various sources",
+        system_prompt="""You are a data research specialist. Your tasks:
 1. Find relevant data sources and datasets
 2. Analyze quantitative information
 3. Identify statistical trends and patterns
@@ -245,11 +359,17 @@ Provide detailed technical analysis with practical recommendations.""",
 5. Present data-driven insights clearly
 
 Focus on accuracy and proper data interpretation.""",
-            focus_areas=["data", "statistics", "quantitative", "metrics"],
-            tools=["internet_search", "write_file", "read_file"],
-            capabilities=["data_analysis", "statistical_research", "quantitative_analysis"],
-        ),
-    ]
+        focus_areas=["data", "statistics", "quantitative", "metrics"],
+        tools=["internet_search", "write_file", "read_file"],
+        capabilities=["data_analysis", "statistical_research", "quantitative_analysis"],
+    ),
+]
+
+# Contents of a default subagents.jsonl, serialized once at import
+DEFAULT_SUBAGENTS_JSONL = _dump_subagents(_DEFAULT_SUBAGENTS)
 
-    save_subagents_to_jsonl(default_subagents, file_path)
+
+def create_default_subagents_file(file_path: Path) -> None:
+    """Create a default subagents.jsonl file with example configurations."""
+    file_path.write_bytes(DEFAULT_SUBAGENTS_JSONL)
     logger.info(f"Created default subagents file at {file_path}")
@@ -1,34 +1,77 @@
 """Custom tools for the research agents."""
 
+import asyncio
+import copy
+import functools
+import hashlib
 import os
-from collections.abc import Callable
-from typing import Any, Literal
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, Literal
 
-from tavily import TavilyClient
+import orjson
+from tavily import AsyncTavilyClient
 
 from ..backends.memory import MemoryManager
 from ..utils.logging import get_logger
+from ..utils.rate_limit import AsyncRateLimiter
+
+if TYPE_CHECKING:
+    import httpx
+
+    from ..backends.persistence import SQLiteStore
 
 logger = get_logger(__name__)
 
+# In-process search results keyed by _search_cache_key: (stored_at, results)
+_SEARCH_CACHE_SIZE = 1024
+# Topics whose results go stale too quickly to reuse
+_UNCACHED_SEARCH_TOPICS = frozenset({"news"})
+_search_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+
+def _search_cache_key(query: str, *params: Any) -> str:
+    """Content-addressed key for a search, ignoring case and surrounding whitespace."""
+    payload = orjson.dumps([query.strip().lower(), *params])
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_search_client(
+    api_key: str, http_client: "httpx.AsyncClient | None" = None
+) -> AsyncTavilyClient:
+    """Tavily client shared by every session using the same key and HTTP client."""
+    return AsyncTavilyClient(api_key=api_key, client=http_client)
+
 
 def create_search_tool(
     api_key: str | None = None,
     on_search: Callable[[str], None] | None = None,
-) -> Callable[..., dict[str, Any]]:
+    http_client: "httpx.AsyncClient | None" = None,
+    cache_ttl: float = 0,
+    cache_store: "SQLiteStore | None" = None,
+    rate_limiter: AsyncRateLimiter | None = None,
+) -> Callable[..., Awaitable[dict[str, Any]]]:
     """Create a Tavily web search tool.
 
     Args:
         api_key: Tavily API key
         on_search: Optional callback called with query string on each search
+        http_client: Optional pooled client to reuse connections across sessions
+        cache_ttl: Seconds to reuse results of an identical search (0 disables);
+            news searches are never cached
+        cache_store: Optional store that keeps cached results across processes
+        rate_limiter: Optional limiter shared by every search hitting the API
     """
     key = api_key or os.environ.get("TAVILY_API_KEY")
     if not key:
         raise ValueError("TAVILY_API_KEY is required for web search")
 
-    client = TavilyClient(api_key=key)
+    client = _get_search_client(key, http_client)
 
-    def internet_search(
+    async def internet_search(
         query: str,
         max_results: int = 5,
         topic: Literal["general", "news", "finance"] = "general",
@@ -53,14 +96,29 @@ def create_search_tool(
             if on_search:
                 on_search(query)
 
-            results: dict[str, Any] = client.search(
+            max_results = min(max_results, 10)
+            key = ""
+            if cache_ttl > 0 and topic not in _UNCACHED_SEARCH_TOPICS:
+                key = _search_cache_key(
+                    query, max_results, topic, include_raw_content, search_depth
+                )
+                cached = await _get_cached_search(key, cache_ttl, cache_store)
+                if cached is not None:
+                    logger.debug(f"Search cache hit: {query}")
+                    return cached
+
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            results: dict[str, Any] = await client.search(
                 query=query,
-                max_results=min(max_results, 10),
+                max_results=max_results,
                 topic=topic,
                 include_raw_content=include_raw_content,
                 search_depth=search_depth,
             )
             logger.debug(f"Search completed: {query} ({len(results.get('results', []))} results)")
+            if key:
+                await _cache_search(key, query, results, cache_store)
             return results
         except Exception as e:
             logger.error(f"Search failed: {e}")
@@ -69,8 +127,109 @@ def create_search_tool(
     return internet_search
 
 
-def create_memory_tools(memory_manager: MemoryManager) -> dict[str, Callable[..., Any]]:
-    """Create tools for interacting with long-term memory."""
+async def _get_cached_search(
+    key: str, ttl: float, store: "SQLiteStore | None"
+) -> dict[str, Any] | None:
+    """Look up fresh results in memory, then in the persistent store.
+
+    Hits are deep copies, so callers can't change what later searches get.
+    The store is read on a worker thread, off the event loop.
+    """
+    entry = _search_cache.get(key)
+    if entry is not None:
+        stored_at, results = entry
+        if time.time() - stored_at < ttl:
+            _search_cache.move_to_end(key)
+            return copy.deepcopy(results)
+        del _search_cache[key]
+
+    if store is not None:
+        stored = await asyncio.to_thread(store.get_search_result, key, max_age_seconds=ttl)
+        if stored is not None:
+            _remember_search(key, stored)
+            return copy.deepcopy(stored)
+    return None
+
+
+async def _cache_search(
+    key: str, query: str, results: dict[str, Any], store: "SQLiteStore | None"
+) -> None:
+    """Store results in memory and, if given, in the persistent store.
+
+    The store write takes its writer lock, so it runs on a worker thread.
+    """
+    # A copy, since the caller goes on to hand the results to the agent
+    _remember_search(key, copy.deepcopy(results))
+    if store is not None:
+        await asyncio.to_thread(store.put_search_result, key, query, results)
+
+
+def _remember_search(key: str, results: dict[str, Any]) -> None:
+    """Add results to the in-process LRU, evicting the oldest entry when full."""
+    _search_cache[key] = (time.time(), results)
+    _search_cache.move_to_end(key)
+    if len(_search_cache) > _SEARCH_CACHE_SIZE:
+        _search_cache.popitem(last=False)
+
+
+def create_parallel_search_tool(
+    search: Callable[..., Awaitable[dict[str, Any]]],
+) -> Callable[..., Awaitable[list[dict[str, Any]]]]:
+    """Create a tool that runs several web searches concurrently.
+
+    Args:
+        search: The single-query search tool from ``create_search_tool``
+    """
+
+    async def internet_search_many(
+        queries: list[str],
+        max_results: int = 5,
+        topic: Literal["general", "news", "finance"] = "general",
+        search_depth: Literal["basic", "advanced"] = "basic",
+    ) -> list[dict[str, Any]]:
+        """
+        Run several internet searches at once.
+
+        Args:
+            queries: The search queries (up to 10)
+            max_results: Maximum number of results per query (1-10)
+            topic: The topic category for the searches
+            search_depth: Search depth - 'basic' for quick, 'advanced' for thorough
+
+        Returns:
+            One result set per query, in the same order as the queries
+        """
+        return await asyncio.gather(*(
+            search(query, max_results=max_results, topic=topic, search_depth=search_depth)
+            for query in queries[:10]
+        ))
+
+    return internet_search_many
+
+
+def create_memory_tools(
+    memory_manager: MemoryManager,
+    dedup_store: "SQLiteStore | None" = None,
+) -> dict[str, Callable[..., Any]]:
+    """Create tools for interacting with long-term memory.
+
+    Args:
+        memory_manager: Manager the tools read from and write to
+        dedup_store: Optional store that remembers stored content across sessions
+    """
+    # Content hash -> memory ID, so repeated remember calls skip re-embedding.
+    # Entries move from pending to the dedup store (or seen, without one) only
+    # once the memory is written, so a failed write never leaves a dangling ID.
+    pending: dict[bytes, str] = {}
+    seen: dict[bytes, str] = {}
+
+    def stored(digest: bytes, memory_id: str) -> None:
+        """Make a written memory's ID the lasting answer for its content hash."""
+        if dedup_store is not None:
+            dedup_store.record_remembered_memory(digest, memory_id)
+        else:
+            seen[digest] = memory_id
+        pending.pop(digest, None)
 
     def remember(
         content: str,
@@ -88,19 +247,46 @@ def create_memory_tools(memory_manager: MemoryManager) -> dict[str, Callable[...
         Returns:
             Memory ID for the stored content
         """
-        if memory_type == "research":
-            memory_id = memory_manager.remember_research(
-                session_id="",  # Will be set by context
-                agent_name="user",
-                content=content,
-                focus_area="general",
-                tags=tags,
-            )
-        else:
-            memory_id = memory_manager.remember_insight(
-                content=content,
-                source=memory_type,
-            )
+        digest = hashlib.blake2b(f"{memory_type}\0{content}".encode(), digest_size=16).digest()
+        memory_id = pending.get(digest)
+        if memory_id is None:
+            if dedup_store is not None:
+                # The store drops entries when their memory is deleted or rewritten
+                memory_id = dedup_store.get_remembered_memory(digest)
+            elif (memory_id := seen.get(digest)) is not None and (
+                memory_manager.store.get_memory(memory_id) is None
+            ):
+                del seen[digest]
+                memory_id = None
+        if memory_id is not None:
+            logger.debug(f"Skipped duplicate memory: {memory_id}")
+            return f"Stored with ID: {memory_id}"
+
+        # Chosen up front so the pending entry exists before any flush can run
+        memory_id = secrets.token_hex(8)
+        pending[digest] = memory_id
+        on_stored = functools.partial(stored, digest, memory_id)
+        try:
+            if memory_type == "research":
+                memory_manager.remember_research(
+                    session_id="",  # Will be set by context
+                    agent_name="user",
+                    content=content,
+                    focus_area="general",
+                    tags=tags,
+                    memory_id=memory_id,
+                    on_stored=on_stored,
+                )
+            else:
+                memory_manager.remember_insight(
+                    content=content,
+                    source=memory_type,
+                    memory_id=memory_id,
+                    on_stored=on_stored,
+                )
+        except Exception:
+            pending.pop(digest, None)
+            raise
         logger.debug(f"Stored memory: {memory_id}")
         return f"Stored with ID: {memory_id}"
 
@@ -122,11 +308,37 @@ def create_memory_tools(memory_manager: MemoryManager) -> dict[str, Callable[...
         logger.debug(f"Recalled {len(memories)} memories for: {query}")
         return memories
 
-    return {"remember": remember, "recall": recall}
+    def recall_batch(
+        queries: list[str],
+        n_results: int = 5,
+    ) -> list[list[dict]]:
+        """
+        Recall relevant memories for several queries in one lookup.
+
+        Args:
+            queries: What to search for in memory, one entry per facet
+            n_results: Maximum number of memories to return per query
+
+        Returns:
+            One list of relevant memories per query, in the same order
+        """
+        memories = memory_manager.recall_many(queries, n_results=n_results)
+        logger.debug(f"Recalled memories for {len(queries)} queries")
+        return memories
+
+    return {"remember": remember, "recall": recall, "recall_batch": recall_batch}
 
 
 def create_file_context_tool(input_files: list[dict[str, Any]]) -> Callable[..., str | list[dict[str, Any]]]:
     """Create a tool for accessing input file context."""
+    # Built once per session; the tool is called repeatedly during research
+    by_name: dict[str, dict[str, Any]] = {}
+    for f in input_files:
+        by_name.setdefault(f["name"], f)
+    summary = [
+        {"name": f["name"], "type": f["type"], "size": f["size"]}
+        for f in input_files
+    ]
 
     def get_input_context(file_name: str | None = None) -> str | list[dict[str, Any]]:
         """
@@ -139,16 +351,15 @@ def create_file_context_tool(input_files: list[dict[str, Any]]) -> Callable[...,
             Content of the specified file or list of all input files
         """
         if file_name:
-            for f in input_files:
-                if f["name"] == file_name or file_name in f["path"]:
-                    return str(f["content"])
+            match = by_name.get(file_name)
+            if match is None:
+                match = next((f for f in input_files if file_name in f["path"]), None)
+            if match is not None:
+                return str(match["content"])
             return f"File not found: {file_name}"
 
         # Return summary of all files
-        return [
-            {"name": f["name"], "type": f["type"], "size": f["size"]}
-            for f in input_files
-        ]
+        return summary
 
     return get_input_context
 
@@ -167,6 +378,12 @@ def create_file_tools(
 
     base_dir = Path(output_dir)
     base_dir.mkdir(parents=True, exist_ok=True)
+    # Resolved once; only the target still needs a realpath walk per call
+    base_resolved = base_dir.resolve()
+
+    def _inside_base(target: Path) -> bool:
+        """Whether ``target`` stays inside the output directory once resolved."""
+        return target.resolve().is_relative_to(base_resolved)
 
     def write_file(file_path: str, content: str) -> str:
         """
@@ -183,14 +400,14 @@ def create_file_tools(
             # Ensure path is relative and within output directory
             target = base_dir / file_path
             # Prevent path traversal
-            if not str(target.resolve()).startswith(str(base_dir.resolve())):
+            if not _inside_base(target):
                 return f"Error: Cannot write outside output directory"
 
             # Create parent directories if needed
             target.parent.mkdir(parents=True, exist_ok=True)
 
             # Write the file
-            target.write_text(content, encoding="utf-8")
+            target.write_bytes(content.encode("utf-8"))
             logger.info(f"Wrote file: {target}")
 
             # Notify callback if provided
@@ -215,7 +432,7 @@ def create_file_tools(
         try:
             target = base_dir / file_path
             # Prevent path traversal
-            if not str(target.resolve()).startswith(str(base_dir.resolve())):
+            if not _inside_base(target):
                 return f"Error: Cannot read outside output directory"
 
             if not target.exists():
@@ -240,16 +457,23 @@ def create_file_tools(
         """
         try:
             target = base_dir / directory
-            if not str(target.resolve()).startswith(str(base_dir.resolve())):
+            if not _inside_base(target):
                 return ["Error: Cannot list outside output directory"]
 
             if not target.exists():
                 return []
 
+            # scandir reports entry types from the directory listing itself,
+            # so files are classified without a stat call each
             files = []
-            for item in target.rglob("*"):
-                if item.is_file():
-                    files.append(str(item.relative_to(base_dir)))
+            stack = [str(target)]
+            while stack:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            files.append(os.path.relpath(entry.path, base_dir))
             return sorted(files)
         except Exception as e:
             logger.error(f"Failed to list files: {e}")
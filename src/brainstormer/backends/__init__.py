@@ -1,6 +1,20 @@
 """Backend modules for persistence and memory."""
 
-from .memory import ChromaMemoryStore, MemoryManager
+from .memory import (
+    ChromaMemoryStore,
+    FaissMemoryStore,
+    MemoryManager,
+    MemoryStore,
+    create_memory_store,
+)
 from .persistence import PersistenceManager, SQLiteStore
 
-__all__ = ["ChromaMemoryStore", "MemoryManager", "PersistenceManager", "SQLiteStore"]
+__all__ = [
+    "ChromaMemoryStore",
+    "FaissMemoryStore",
+    "MemoryManager",
+    "MemoryStore",
+    "PersistenceManager",
+    "SQLiteStore",
+    "create_memory_store",
+]
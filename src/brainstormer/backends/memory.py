@@ -1,48 +1,116 @@
 """Long-term memory using ChromaDB for vector storage."""
 
-import hashlib
-import json
+import asyncio
+import atexit
+import contextlib
+import secrets
+import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import chromadb
-from chromadb.config import Settings as ChromaSettings
+import orjson
 
 from ..utils.logging import get_logger
 
+if TYPE_CHECKING:
+    import numpy as np
+    from chromadb.api import ClientAPI
+    from chromadb.api.models.Collection import Collection
+
+    from .persistence import SQLiteStore
+
 logger = get_logger(__name__)
 
+_QUERY_EMBEDDING_CACHE_SIZE = 512
 
-class ChromaMemoryStore:
-    """ChromaDB-based vector memory store for semantic search."""
+# Reciprocal rank fusion constant; damps the weight of top ranks
+_RRF_K = 60
 
-    def __init__(
-        self,
-        persist_directory: Path,
-        collection_name: str = "brainstormer_memory",
-        embedding_function: Any = None,
-    ):
+# Rowids bound per IN (...) query, within SQLite's default variable limit
+_SQLITE_MAX_VARIABLES = 32000
+
+
+def _stringify_value(value: Any) -> str:
+    """Convert a metadata value to a string, as ChromaDB only stores scalars."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return str(value)
+
+
+def _stringify_metadata(metadata: dict) -> dict[str, str]:
+    """Convert every metadata value to a string."""
+    return {k: _stringify_value(v) for k, v in metadata.items()}
+
+
+class MemoryStore(ABC):
+    """Shared record preparation and query embedding for vector memory stores.
+
+    When ``keyword_store`` is set, every add, update, delete and clear is
+    mirrored into its BM25 index so keyword recall matches the vector store,
+    and remember dedup entries for deleted or rewritten memories are dropped.
+    """
+
+    def __init__(self, persist_directory: Path, embedding_function: Any = None):
         self.persist_directory = persist_directory
-        self.collection_name = collection_name
+        self.embedding_function = embedding_function
+        self.keyword_store: SQLiteStore | None = None
+        self._embedder: Any = embedding_function
+        self._query_embeddings: OrderedDict[str, Any] = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
 
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=str(persist_directory),
-            settings=ChromaSettings(
-                anonymized_telemetry=False,
-                allow_reset=True,
-            ),
-        )
+    @property
+    def embedder(self) -> Any:
+        """Embedding function, defaulting to ChromaDB's local model."""
+        if self._embedder is None:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
 
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
-            embedding_function=embedding_function,
-            metadata={"hnsw:space": "cosine"},
-        )
+            self._embedder = DefaultEmbeddingFunction()
+        return self._embedder
+
+    def _embed_queries(self, queries: list[str]) -> list[Any]:
+        """Embed query texts, reusing cached vectors for repeated queries."""
+        with self._query_embeddings_lock:
+            cached = {q: self._query_embeddings.get(q) for q in queries}
+        missing = list(dict.fromkeys(q for q, vec in cached.items() if vec is None))
 
-        logger.info(f"Initialized ChromaDB memory store at {persist_directory}")
+        if missing:
+            for query, vector in zip(missing, self.embedder(missing), strict=True):
+                cached[query] = vector
+
+        with self._query_embeddings_lock:
+            for query in queries:
+                self._query_embeddings[query] = cached[query]
+                self._query_embeddings.move_to_end(query)
+            while len(self._query_embeddings) > _QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+
+        return [cached[q] for q in queries]
+
+    def prepare_memory(
+        self,
+        content: str,
+        metadata: dict | None = None,
+        memory_id: str | None = None,
+    ) -> dict:
+        """Build the id/document/metadata record for a memory without storing it."""
+        timestamp = datetime.now(tz=UTC).isoformat()
+        if memory_id is None:
+            memory_id = secrets.token_hex(8)
+
+        # Built in one pass, stringifying caller metadata as it is copied
+        full_metadata = {"timestamp": timestamp, "content_length": str(len(content))}
+        for k, v in (metadata or {}).items():
+            full_metadata[k] = _stringify_value(v)
+
+        return {"id": memory_id, "document": content, "metadata": full_metadata}
 
     def add_memory(
         self,
@@ -51,31 +119,43 @@ class ChromaMemoryStore:
         memory_id: str | None = None,
     ) -> str:
         """Add a memory to the store."""
-        if memory_id is None:
-            memory_id = hashlib.sha256(
-                f"{content}{datetime.now(tz=UTC).isoformat()}".encode()
-            ).hexdigest()[:16]
-
-        full_metadata = {
-            "timestamp": datetime.now(tz=UTC).isoformat(),
-            "content_length": len(content),
-            **(metadata or {}),
-        }
+        return self.add_records([self.prepare_memory(content, metadata, memory_id)])[0]
 
-        # Convert any non-string metadata values to strings for ChromaDB
-        full_metadata = {
-            k: json.dumps(v) if isinstance(v, (dict, list)) else str(v)
-            for k, v in full_metadata.items()
-        }
-
-        self.collection.add(
-            ids=[memory_id],
-            documents=[content],
-            metadatas=[full_metadata],
+    def add_memories(
+        self,
+        contents: list[str],
+        metadatas: list[dict | None] | None = None,
+    ) -> list[str]:
+        """Add several memories with a single write and embedding pass."""
+        if metadatas is None:
+            metadatas = [None] * len(contents)
+        return self.add_records(
+            [
+                self.prepare_memory(content, metadata)
+                for content, metadata in zip(contents, metadatas, strict=True)
+            ]
         )
 
-        logger.debug(f"Added memory: {memory_id}")
-        return memory_id
+    @abstractmethod
+    def add_records(self, records: list[dict]) -> list[str]:
+        """Add prepared memory records with a single write."""
+
+    def _reindex_keywords(
+        self, memory_id: str, memory: dict | None, content_changed: bool
+    ) -> None:
+        """Replace a memory's keyword index entry with its current stored state.
+
+        New content also drops the memory's remember dedup entries, which
+        were keyed by the old text.
+        """
+        if self.keyword_store is None:
+            return
+        if memory is None or content_changed:
+            self.keyword_store.forget_memories([memory_id])
+        if memory is not None:
+            self.keyword_store.index_memories(
+                [{"id": memory_id, "document": memory["content"], "metadata": memory["metadata"]}]
+            )
 
     def search(
         self,
@@ -84,23 +164,137 @@ class ChromaMemoryStore:
         where: dict | None = None,
     ) -> list[dict]:
         """Search memories by semantic similarity."""
+        return self.search_many([query], n_results=n_results, where=where)[0]
+
+    @abstractmethod
+    def search_many(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        where: dict | None = None,
+    ) -> list[list[dict]]:
+        """Search memories for several queries at once."""
+
+    @abstractmethod
+    def get_memory(self, memory_id: str) -> dict | None:
+        """Get a specific memory by ID."""
+
+    @abstractmethod
+    def delete_memory(self, memory_id: str) -> None:
+        """Delete a memory by ID."""
+
+    @abstractmethod
+    def update_memory(
+        self,
+        memory_id: str,
+        content: str | None = None,
+        metadata: dict | None = None,
+    ) -> None:
+        """Update an existing memory."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Get the total number of memories."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Clear all memories."""
+
+
+class ChromaMemoryStore(MemoryStore):
+    """ChromaDB-based vector memory store for semantic search.
+
+    Pass ``client`` to use an existing ChromaDB client, such as an in-memory
+    ``EphemeralClient``, instead of a persistent one in ``persist_directory``.
+    """
+
+    def __init__(
+        self,
+        persist_directory: Path,
+        collection_name: str = "brainstormer_memory",
+        embedding_function: Any = None,
+        client: "ClientAPI | None" = None,
+    ):
+        super().__init__(persist_directory, embedding_function)
+        self.collection_name = collection_name
+
+        # chromadb is slow to import, so the client is opened on first memory access
+        self._client: ClientAPI | None = client
+        self._collection: Collection | None = None
+
+    @property
+    def client(self) -> "ClientAPI":
+        """ChromaDB client, created on first use."""
+        if self._client is None:
+            import chromadb
+            from chromadb.config import Settings as ChromaSettings
+
+            self._client = chromadb.PersistentClient(
+                path=str(self.persist_directory),
+                settings=ChromaSettings(
+                    anonymized_telemetry=False,
+                    allow_reset=True,
+                ),
+            )
+            logger.info(f"Initialized ChromaDB memory store at {self.persist_directory}")
+        return self._client
+
+    @property
+    def collection(self) -> "Collection":
+        """Memory collection, created on first use."""
+        if self._collection is None:
+            self._collection = self.client.get_or_create_collection(
+                name=self.collection_name,
+                embedding_function=self.embedding_function,
+                metadata={"hnsw:space": "cosine"},
+            )
+        return self._collection
+
+    def add_records(self, records: list[dict]) -> list[str]:
+        """Add prepared memory records with a single collection write."""
+        if not records:
+            return []
+
+        ids = [record["id"] for record in records]
+        self.collection.add(
+            ids=ids,
+            documents=[record["document"] for record in records],
+            metadatas=[record["metadata"] for record in records],
+        )
+        if self.keyword_store is not None:
+            self.keyword_store.index_memories(records)
+
+        logger.debug(f"Added {len(ids)} memories")
+        return ids
+
+    def search_many(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        where: dict | None = None,
+    ) -> list[list[dict]]:
+        """Search memories for several queries with one collection query."""
+        if not queries:
+            return []
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=self._embed_queries(queries),
             n_results=n_results,
             where=where,
         )
 
-        memories = []
-        if results["ids"] and results["ids"][0]:
-            for i, memory_id in enumerate(results["ids"][0]):
+        all_memories = []
+        for q in range(len(queries)):
+            memories = []
+            for i, memory_id in enumerate(results["ids"][q] if results["ids"] else []):
                 memories.append({
                     "id": memory_id,
-                    "content": results["documents"][0][i] if results["documents"] else None,
-                    "metadata": results["metadatas"][0][i] if results["metadatas"] else None,
-                    "distance": results["distances"][0][i] if results["distances"] else None,
+                    "content": results["documents"][q][i] if results["documents"] else None,
+                    "metadata": results["metadatas"][q][i] if results["metadatas"] else None,
+                    "distance": results["distances"][q][i] if results["distances"] else None,
                 })
+            all_memories.append(memories)
 
-        return memories
+        return all_memories
 
     def get_memory(self, memory_id: str) -> dict | None:
         """Get a specific memory by ID."""
@@ -116,6 +310,8 @@ class ChromaMemoryStore:
     def delete_memory(self, memory_id: str) -> None:
         """Delete a memory by ID."""
         self.collection.delete(ids=[memory_id])
+        if self.keyword_store is not None:
+            self.keyword_store.forget_memories([memory_id])
         logger.debug(f"Deleted memory: {memory_id}")
 
     def update_memory(
@@ -126,23 +322,18 @@ class ChromaMemoryStore:
     ) -> None:
         """Update an existing memory."""
         if content and metadata:
-            clean_metadata = {
-                k: json.dumps(v) if isinstance(v, (dict, list)) else str(v)
-                for k, v in metadata.items()
-            }
             self.collection.update(
                 ids=[memory_id],
                 documents=[content],
-                metadatas=[clean_metadata],
+                metadatas=[_stringify_metadata(metadata)],
             )
         elif content:
             self.collection.update(ids=[memory_id], documents=[content])
         elif metadata:
-            clean_metadata = {
-                k: json.dumps(v) if isinstance(v, (dict, list)) else str(v)
-                for k, v in metadata.items()
-            }
-            self.collection.update(ids=[memory_id], metadatas=[clean_metadata])
+            self.collection.update(ids=[memory_id], metadatas=[_stringify_metadata(metadata)])
+        else:
+            return
+        self._reindex_keywords(memory_id, self.get_memory(memory_id), bool(content))
 
     def count(self) -> int:
         """Get the total number of memories."""
@@ -151,18 +342,482 @@ class ChromaMemoryStore:
     def clear(self) -> None:
         """Clear all memories from the collection."""
         self.client.delete_collection(self.collection_name)
-        self.collection = self.client.create_collection(
+        self._collection = self.client.create_collection(
             name=self.collection_name,
+            embedding_function=self.embedding_function,
             metadata={"hnsw:space": "cosine"},
         )
+        if self.keyword_store is not None:
+            self.keyword_store.forget_all_memories()
+        logger.info("Cleared all memories")
+
+
+class FaissMemoryStore(MemoryStore):
+    """FAISS-backed vector memory store for read-heavy workloads.
+
+    Normalized embeddings live in an exact inner-product index held in memory;
+    ids, documents, metadata and the raw vectors are kept in a SQLite file in
+    ``persist_directory`` and the index is rebuilt from it on first use.
+    Requires the ``faiss`` extra.
+    """
+
+    def __init__(self, persist_directory: Path, embedding_function: Any = None):
+        super().__init__(persist_directory, embedding_function)
+        self.db_path = persist_directory / "faiss_memory.db"
+        self._conn: sqlite3.Connection | None = None
+        self._index: Any = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _faiss() -> Any:
+        try:
+            import faiss
+        except ImportError as e:
+            raise ImportError(
+                "MEMORY_BACKEND=faiss requires faiss. "
+                "Install with: pip install 'brainstormer[faiss]'"
+            ) from e
+        return faiss
+
+    def _vectors(self, embeddings: Iterable[Any]) -> "np.ndarray":
+        """Stack embeddings into a contiguous, L2-normalized float32 matrix."""
+        import numpy as np
+
+        vectors = np.ascontiguousarray(np.asarray(list(embeddings), dtype=np.float32))
+        self._faiss().normalize_L2(vectors)
+        return vectors
+
+    def _new_index(self, dim: int) -> Any:
+        faiss = self._faiss()
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    def _load(self) -> sqlite3.Connection:
+        """Open the sidecar database and rebuild the index from it once."""
+        if self._conn is not None:
+            return self._conn
+        import numpy as np
+
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memories (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL,
+                document TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                embedding BLOB NOT NULL
+            )
+        """)
+        rows = conn.execute("SELECT rowid, embedding FROM memories").fetchall()
+        if rows:
+            vectors = np.vstack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+            self._index = self._new_index(vectors.shape[1])
+            self._index.add_with_ids(vectors, np.array([r for r, _ in rows], dtype=np.int64))
+        self._conn = conn
+        logger.info(
+            f"Initialized FAISS memory store at {self.persist_directory} ({len(rows)} memories)"
+        )
+        return conn
+
+    def _remove_rowids(self, rowids: list[int]) -> None:
+        import numpy as np
+
+        if rowids and self._index is not None:
+            self._index.remove_ids(np.array(rowids, dtype=np.int64))
+
+    def add_records(self, records: list[dict]) -> list[str]:
+        """Embed and add prepared memory records in one batch."""
+        if not records:
+            return []
+        import numpy as np
+
+        ids = [record["id"] for record in records]
+        vectors = self._vectors(self.embedder([record["document"] for record in records]))
+        with self._lock:
+            conn = self._load()
+            placeholders = ",".join("?" * len(ids))
+            replaced = conn.execute(
+                f"SELECT rowid FROM memories WHERE id IN ({placeholders})", ids
+            ).fetchall()
+            with conn:
+                rowids = [
+                    conn.execute(
+                        "INSERT OR REPLACE INTO memories (id, document, metadata, embedding) "
+                        "VALUES (?, ?, ?, ?)",
+                        (record["id"], record["document"], orjson.dumps(record["metadata"]),
+                         vector.tobytes()),
+                    ).lastrowid
+                    for record, vector in zip(records, vectors, strict=True)
+                ]
+            # Only once the rows are committed, so a failed write leaves the index intact
+            self._remove_rowids([r for (r,) in replaced])
+            if self._index is None:
+                self._index = self._new_index(vectors.shape[1])
+            self._index.add_with_ids(vectors, np.array(rowids, dtype=np.int64))
+        if self.keyword_store is not None:
+            self.keyword_store.index_memories(records)
+
+        logger.debug(f"Added {len(ids)} memories")
+        return ids
+
+    def search_many(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        where: dict | None = None,
+    ) -> list[list[dict]]:
+        """Search memories for several queries with one index search.
+
+        ``where`` supports equality on metadata keys, e.g. ``{"session_id": ...}``;
+        matching rows are selected in SQLite and only they are searched.
+        """
+        if not queries:
+            return []
+        import numpy as np
+
+        with self._lock:
+            conn = self._load()
+            if self._index is None or self._index.ntotal == 0:
+                return [[] for _ in queries]
+            params = None
+            candidates = self._index.ntotal
+            if where:
+                matching = self._filter_rowids(conn, where)
+                if not matching:
+                    return [[] for _ in queries]
+                params = self._faiss().SearchParameters(
+                    sel=self._faiss().IDSelectorBatch(np.array(matching, dtype=np.int64))
+                )
+                candidates = len(matching)
+            scores, rowids = self._index.search(
+                self._vectors(self._embed_queries(queries)),
+                min(n_results, candidates),
+                params=params,
+            )
+            rows = self._rows_by_rowid(conn, {int(r) for r in rowids.ravel() if r >= 0})
+
+        all_memories = []
+        for q in range(len(queries)):
+            memories = []
+            for score, rowid in zip(scores[q], rowids[q], strict=True):
+                row = rows.get(int(rowid))
+                if row is None:
+                    continue
+                memory_id, document, metadata = row
+                memories.append({
+                    "id": memory_id,
+                    "content": document,
+                    "metadata": metadata,
+                    "distance": 1.0 - float(score),
+                })
+            all_memories.append(memories)
+
+        return all_memories
+
+    @staticmethod
+    def _filter_rowids(conn: sqlite3.Connection, where: dict) -> list[int]:
+        """Rowids whose metadata equals every ``where`` value, as stored strings."""
+        clauses = " AND ".join("json_extract(CAST(metadata AS TEXT), ?) = ?" for _ in where)
+        params: list[str] = []
+        for key, value in where.items():
+            params += [f'$."{key}"', _stringify_value(value)]
+        return [
+            rowid
+            for (rowid,) in conn.execute(f"SELECT rowid FROM memories WHERE {clauses}", params)
+        ]
+
+    @staticmethod
+    def _rows_by_rowid(
+        conn: sqlite3.Connection, rowids: set[int]
+    ) -> dict[int, tuple[str, str, dict]]:
+        """Fetch rows by rowid, in chunks that stay under SQLite's variable limit."""
+        wanted = list(rowids)
+        rows = {}
+        for start in range(0, len(wanted), _SQLITE_MAX_VARIABLES):
+            chunk = wanted[start : start + _SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            for rowid, memory_id, document, metadata in conn.execute(
+                "SELECT rowid, id, document, metadata FROM memories "
+                f"WHERE rowid IN ({placeholders})",
+                chunk,
+            ):
+                rows[rowid] = (memory_id, document, orjson.loads(metadata))
+        return rows
+
+    def get_memory(self, memory_id: str) -> dict | None:
+        """Get a specific memory by ID."""
+        with self._lock:
+            row = self._load().execute(
+                "SELECT id, document, metadata FROM memories WHERE id = ?", (memory_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "content": row[1], "metadata": orjson.loads(row[2])}
+
+    def delete_memory(self, memory_id: str) -> None:
+        """Delete a memory by ID."""
+        with self._lock:
+            conn = self._load()
+            row = conn.execute("SELECT rowid FROM memories WHERE id = ?", (memory_id,)).fetchone()
+            if row is None:
+                return
+            self._remove_rowids([row[0]])
+            with conn:
+                conn.execute("DELETE FROM memories WHERE rowid = ?", (row[0],))
+        if self.keyword_store is not None:
+            self.keyword_store.forget_memories([memory_id])
+        logger.debug(f"Deleted memory: {memory_id}")
+
+    def update_memory(
+        self,
+        memory_id: str,
+        content: str | None = None,
+        metadata: dict | None = None,
+    ) -> None:
+        """Update an existing memory."""
+        existing = self.get_memory(memory_id)
+        if existing is None or not (content or metadata):
+            return
+        record = {
+            "id": memory_id,
+            "document": content or existing["content"],
+            # Merged like Chroma's update, so metadata-only updates keep the rest
+            "metadata": {**existing["metadata"], **_stringify_metadata(metadata or {})},
+        }
+        if content and self.keyword_store is not None:
+            # Dedup entries were keyed by the old text
+            self.keyword_store.forget_memories([memory_id])
+        self.add_records([record])
+
+    def count(self) -> int:
+        """Get the total number of memories."""
+        with self._lock:
+            row = self._load().execute("SELECT COUNT(*) FROM memories").fetchone()
+        return int(row[0])
+
+    def clear(self) -> None:
+        """Clear all memories."""
+        with self._lock:
+            conn = self._load()
+            with conn:
+                conn.execute("DELETE FROM memories")
+            self._index = None
+        if self.keyword_store is not None:
+            self.keyword_store.forget_all_memories()
         logger.info("Cleared all memories")
 
+    def close(self) -> None:
+        """Close the sidecar database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._index = None
+
+
+def create_memory_store(backend: str, persist_directory: Path) -> MemoryStore:
+    """Create the vector memory store selected by ``MEMORY_BACKEND``."""
+    if backend == "faiss":
+        return FaissMemoryStore(persist_directory)
+    return ChromaMemoryStore(persist_directory)
+
 
 class MemoryManager:
-    """High-level memory manager integrating with the agent system."""
+    """High-level memory manager integrating with the agent system.
+
+    Writes are buffered and sent to the store in batches of ``batch_size``,
+    after ``flush_interval`` seconds, and at interpreter exit; call ``flush()``
+    at phase transitions and at the end of a session. Inside an event loop the
+    store writes run on a worker thread, off the middleware hot path.
+    Recalls flush first so pending memories are always searchable.
+
+    With a ``keyword_store``, the store also keeps its memories in that BM25
+    index and ``recall_relevant`` fuses keyword and vector rankings.
+    """
 
-    def __init__(self, chroma_store: ChromaMemoryStore):
+    def __init__(
+        self,
+        chroma_store: MemoryStore,
+        batch_size: int = 128,
+        flush_interval: float = 0.5,
+        keyword_store: "SQLiteStore | None" = None,
+    ):
         self.store = chroma_store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.keyword_store = keyword_store
+        if keyword_store is not None:
+            # The store keeps the keyword index in step with its own writes
+            chroma_store.keyword_store = keyword_store
+        self._pending: list[dict] = []
+        # Memory ID -> callback run once that memory has been written
+        self._on_stored: dict[str, Callable[[], None]] = {}
+        # Pending timed flush and, for a TimerHandle, the loop that owns it.
+        # Both are guarded by _lock, as flush() runs on worker threads too.
+        self._flush_timer: asyncio.TimerHandle | threading.Timer | None = None
+        self._flush_loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        # Held for a whole pop-and-write, so a flush also waits for one in flight
+        self._write_lock = threading.Lock()
+        # Flushes handed to executor threads, awaited by aflush()
+        self._background_flushes: set[asyncio.Future[int]] = set()
+        _live_managers.add(self)
+
+    def _enqueue(
+        self,
+        content: str,
+        metadata: dict,
+        memory_id: str | None = None,
+        on_stored: Callable[[], None] | None = None,
+    ) -> str:
+        """Buffer a memory record, flushing once the batch is full."""
+        record = self.store.prepare_memory(content=content, metadata=metadata, memory_id=memory_id)
+        with self._lock:
+            self._pending.append(record)
+            if on_stored is not None:
+                self._on_stored[record["id"]] = on_stored
+            batch_full = len(self._pending) >= self.batch_size
+        if batch_full:
+            self.flush_soon()
+        else:
+            self._schedule_flush()
+        return str(record["id"])
+
+    def flush_soon(self) -> None:
+        """Flush now, on a worker thread when called from a running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_in_background(loop)
+
+    def _flush_in_background(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Run flush() on an executor thread, keeping its future until it settles."""
+        future = loop.run_in_executor(None, self.flush)
+        self._background_flushes.add(future)
+        future.add_done_callback(self._on_background_flush_done)
+
+    def _on_background_flush_done(self, future: "asyncio.Future[int]") -> None:
+        """Log a failed background flush; flush() has already requeued its records."""
+        self._background_flushes.discard(future)
+        if not future.cancelled() and (error := future.exception()) is not None:
+            logger.error(f"Background memory flush failed: {error}")
+
+    async def aflush(self) -> int:
+        """Wait for background flushes, then write what is left on a worker thread."""
+        if self._background_flushes:
+            await asyncio.gather(*self._background_flushes, return_exceptions=True)
+        return await asyncio.to_thread(self.flush)
+
+    def _schedule_flush(self) -> None:
+        """Schedule a flush once ``flush_interval`` has elapsed."""
+        if self.flush_interval <= 0:
+            return
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            if self._flush_timer is not None:
+                return
+            if loop is None:
+                # Synchronous callers get a daemon timer thread instead
+                timer = threading.Timer(self.flush_interval, self._on_thread_timer)
+                timer.daemon = True
+                self._flush_timer = timer
+                timer.start()
+            else:
+                self._flush_timer = loop.call_later(
+                    self.flush_interval, self._on_flush_timer, loop
+                )
+                self._flush_loop = loop
+
+    def _on_flush_timer(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Hand the timed flush to a worker thread so the loop isn't blocked."""
+        with self._lock:
+            self._flush_timer = self._flush_loop = None
+        self._flush_in_background(loop)
+
+    def _on_thread_timer(self) -> None:
+        """Flush from the timer thread once ``flush_interval`` has elapsed."""
+        with self._lock:
+            self._flush_timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Timed memory flush failed: {e}")
+
+    def _cancel_flush_timer(self) -> None:
+        """Cancel any pending timed flush; safe to call from any thread."""
+        with self._lock:
+            timer, self._flush_timer = self._flush_timer, None
+            loop, self._flush_loop = self._flush_loop, None
+        if timer is None:
+            return
+        if loop is None:
+            # threading.Timer.cancel is thread-safe
+            timer.cancel()
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            timer.cancel()
+            return
+        # TimerHandle is not thread-safe, so cancel it on its own loop. A
+        # closed loop raises RuntimeError, but then the handle can't fire anyway.
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(timer.cancel)
+
+    def flush(self) -> int:
+        """Write all buffered memories to the store.
+
+        If the store write fails the records are put back, ahead of anything
+        buffered since, and the error is raised. A write already in flight on
+        another thread is waited for, so everything buffered before the call
+        is stored when it returns.
+        """
+        self._cancel_flush_timer()
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            try:
+                self.store.add_records(pending)
+            except Exception:
+                with self._lock:
+                    self._pending[:0] = pending
+                raise
+            with self._lock:
+                callbacks = [
+                    callback
+                    for record in pending
+                    if (callback := self._on_stored.pop(record["id"], None)) is not None
+                ]
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Memory stored callback failed: {e}")
+        logger.debug(f"Flushed {len(pending)} buffered memories")
+        return len(pending)
+
+    def remember_batch(self, items: Iterable[dict]) -> list[str]:
+        """Store many memories with a single write.
+
+        Each item is a dict with ``content`` and optional ``metadata``.
+        """
+        records = [
+            self.store.prepare_memory(content=item["content"], metadata=item.get("metadata"))
+            for item in items
+        ]
+        with self._lock:
+            self._pending.extend(records)
+        self.flush()
+        return [str(record["id"]) for record in records]
 
     def remember_research(
         self,
@@ -171,9 +826,14 @@ class MemoryManager:
         content: str,
         focus_area: str,
         tags: list[str] | None = None,
+        memory_id: str | None = None,
+        on_stored: Callable[[], None] | None = None,
     ) -> str:
-        """Store a research finding in long-term memory."""
-        return self.store.add_memory(
+        """Store a research finding in long-term memory.
+
+        ``on_stored`` is called once the memory has been written to the store.
+        """
+        return self._enqueue(
             content=content,
             metadata={
                 "type": "research",
@@ -182,6 +842,8 @@ class MemoryManager:
                 "focus_area": focus_area,
                 "tags": tags or [],
             },
+            memory_id=memory_id,
+            on_stored=on_stored,
         )
 
     def remember_insight(
@@ -189,15 +851,22 @@ class MemoryManager:
         content: str,
         session_id: str | None = None,
         source: str | None = None,
+        memory_id: str | None = None,
+        on_stored: Callable[[], None] | None = None,
     ) -> str:
-        """Store a general insight or learning."""
-        return self.store.add_memory(
+        """Store a general insight or learning.
+
+        ``on_stored`` is called once the memory has been written to the store.
+        """
+        return self._enqueue(
             content=content,
             metadata={
                 "type": "insight",
                 "session_id": session_id,
                 "source": source,
             },
+            memory_id=memory_id,
+            on_stored=on_stored,
         )
 
     def recall_relevant(
@@ -207,10 +876,35 @@ class MemoryManager:
         session_id: str | None = None,
     ) -> list[dict]:
         """Recall relevant memories for a query."""
+        self.flush()
         where = None
         if session_id:
             where = {"session_id": session_id}
-        return self.store.search(query, n_results=n_results, where=where)
+        if self.keyword_store is None:
+            return self.store.search(query, n_results=n_results, where=where)
+
+        # Rank a wider pool from each retriever, then fuse
+        candidates = n_results * 2
+        semantic = self.store.search(query, n_results=candidates, where=where)
+        keyword = [
+            memory
+            for memory in self.keyword_store.search_memories(query, limit=candidates * 2)
+            if not session_id or memory["metadata"].get("session_id") == session_id
+        ][:candidates]
+        return _reciprocal_rank_fusion([semantic, keyword], n_results)
+
+    def recall_many(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        session_id: str | None = None,
+    ) -> list[list[dict]]:
+        """Recall relevant memories for several queries at once."""
+        self.flush()
+        where = None
+        if session_id:
+            where = {"session_id": session_id}
+        return self.store.search_many(queries, n_results=n_results, where=where)
 
     def recall_by_type(
         self,
@@ -219,6 +913,7 @@ class MemoryManager:
         n_results: int = 5,
     ) -> list[dict]:
         """Recall memories of a specific type."""
+        self.flush()
         return self.store.search(
             query,
             n_results=n_results,
@@ -227,9 +922,37 @@ class MemoryManager:
 
     def get_session_memories(self, session_id: str, limit: int = 50) -> list[dict]:
         """Get all memories for a session."""
+        self.flush()
         # Use a broad query to get session memories
         return self.store.search(
             query="research findings insights",
             n_results=limit,
             where={"session_id": session_id},
         )
+
+
+def _reciprocal_rank_fusion(rankings: list[list[dict]], n_results: int) -> list[dict]:
+    """Merge ranked memory lists by summed ``1 / (k + rank)`` scores."""
+    scores: dict[str, float] = {}
+    memories: dict[str, dict] = {}
+    for ranking in rankings:
+        for rank, memory in enumerate(ranking, 1):
+            scores[memory["id"]] = scores.get(memory["id"], 0.0) + 1.0 / (_RRF_K + rank)
+            memories.setdefault(memory["id"], memory)
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [memories[memory_id] for memory_id in ranked[:n_results]]
+
+
+# Managers flushed at interpreter exit; weak, so this never keeps one alive
+_live_managers: "weakref.WeakSet[MemoryManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    """Write any memories still buffered when the interpreter exits."""
+    for manager in list(_live_managers):
+        if manager._pending:
+            try:
+                manager.flush()
+            except Exception as e:
+                logger.error(f"Memory flush at exit failed: {e}")
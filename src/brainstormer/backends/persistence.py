@@ -1,22 +1,108 @@
 """SQLite-based persistence for agent state and research sessions."""
 
-import json
+import atexit
+import os
+import queue
+import re
 import sqlite3
-from collections.abc import Generator
-from contextlib import contextmanager
+import threading
+import time
+import weakref
+from collections.abc import Generator, Iterator
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
+
+import orjson
 
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Fixed query text, so sqlite3's per-connection statement cache reuses the
+# compiled statements instead of re-parsing them on every call.
+_SQL_GET_SESSION = "SELECT * FROM research_sessions WHERE id = ?"
+_SQL_GET_AGENT_STATE = "SELECT * FROM agent_states WHERE id = ?"
+_SQL_GET_SESSION_AGENTS = "SELECT * FROM agent_states WHERE session_id = ? ORDER BY created_at"
+_SQL_GET_SESSION_ARTIFACTS = (
+    "SELECT * FROM research_artifacts WHERE session_id = ? ORDER BY created_at"
+)
+_SQL_GET_SEARCH_RESULT = "SELECT results FROM search_cache WHERE key = ? AND created_at >= ?"
+_SQL_GET_REMEMBERED_MEMORY = "SELECT memory_id FROM remember_dedup WHERE hash = ?"
+_SQL_SEARCH_MEMORIES = (
+    "SELECT id, content, metadata FROM memories_fts WHERE memories_fts MATCH ? "
+    "ORDER BY bm25(memories_fts) LIMIT ?"
+)
+
+_FTS_TERM = re.compile(r"\w+")
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value to JSON text with orjson (stored in TEXT columns)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> list[dict]:
+    """Fetch all rows as dicts, reading the column names once per query."""
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row, strict=True)) for row in cursor]
+
+
+def _fetch_dict(cursor: sqlite3.Cursor) -> dict | None:
+    """Fetch the first row as a dict, or None."""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([column[0] for column in cursor.description], row, strict=True))
+
 
 class SQLiteStore:
     """SQLite storage for research sessions and agent state."""
 
-    def __init__(self, db_path: Path):
+    # WAL + synchronous=NORMAL avoids an fsync per transaction while staying
+    # crash-safe; overridable through Settings.get_sqlite_pragmas().
+    DEFAULT_PRAGMAS: ClassVar[dict[str, str | int]] = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -65536,
+        "mmap_size": 10 * 1024**3,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    }
+
+    # PRAGMAs that write to the database file and cannot run on read-only connections
+    WRITE_ONLY_PRAGMAS: ClassVar[frozenset[str]] = frozenset({"journal_mode"})
+
+    # Most hook log rows written per transaction by the background writer
+    HOOK_LOG_BATCH_SIZE: ClassVar[int] = 256
+
+    def __init__(
+        self,
+        db_path: Path,
+        pragmas: dict[str, str | int] | None = None,
+        read_pool_size: int | None = None,
+    ):
         self.db_path = db_path
+        self.pragmas = {**self.DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.read_pool_size = read_pool_size or os.cpu_count() or 4
+
+        # One serialized writer, plus a pool of read-only connections so status
+        # queries don't queue behind session writes.
+        self._in_memory = str(db_path) == ":memory:"
+        self._writer: sqlite3.Connection | None = None
+        self._write_lock = threading.RLock()
+        self._tx_owner: int | None = None
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        # Hook log rows are written in batches by a background thread
+        self._hook_queue: queue.Queue[tuple | None] = queue.Queue()
+        self._hook_writer: threading.Thread | None = None
+        self._hook_writer_lock = threading.Lock()
+        # Connections stay open for the store's lifetime; close them at exit
+        atexit.register(_close_at_exit, weakref.ref(self))
+
         self._init_db()
 
     def _init_db(self) -> None:
@@ -30,7 +116,8 @@ class SQLiteStore:
                     plan TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    metadata TEXT
+                    metadata TEXT,
+                    plan_path TEXT
                 );
 
                 CREATE TABLE IF NOT EXISTS agent_states (
@@ -69,27 +156,171 @@ class SQLiteStore:
                     executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_agent_states_session
-                    ON agent_states(session_id);
-                CREATE INDEX IF NOT EXISTS idx_artifacts_session
-                    ON research_artifacts(session_id);
-                CREATE INDEX IF NOT EXISTS idx_hooks_session
-                    ON hooks_log(session_id);
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    results TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS remember_dedup (
+                    hash BLOB PRIMARY KEY,
+                    memory_id TEXT NOT NULL
+                );
+
+                -- BM25 keyword index over long-term memories, complementing
+                -- vector search for exact terms (names, ids, URLs)
+                CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+                    content,
+                    id UNINDEXED,
+                    metadata UNINDEXED
+                );
+
+                -- Serves purging dedup entries when their memory is deleted
+                CREATE INDEX IF NOT EXISTS idx_remember_dedup_memory
+                    ON remember_dedup(memory_id);
+
+                CREATE INDEX IF NOT EXISTS idx_sessions_created
+                    ON research_sessions(created_at DESC, id DESC);
+                CREATE INDEX IF NOT EXISTS idx_sessions_status_created
+                    ON research_sessions(status, created_at DESC, id DESC);
+
+                -- (session_id, created_at) serves both the lookup and the ORDER BY;
+                -- the single-column indexes they replace only cost writes
+                DROP INDEX IF EXISTS idx_agent_states_session;
+                DROP INDEX IF EXISTS idx_artifacts_session;
+                DROP INDEX IF EXISTS idx_hooks_session;
+                CREATE INDEX IF NOT EXISTS idx_agent_states_session_created
+                    ON agent_states(session_id, created_at);
+                CREATE INDEX IF NOT EXISTS idx_artifacts_session_created
+                    ON research_artifacts(session_id, created_at);
+                CREATE INDEX IF NOT EXISTS idx_hooks_session_executed
+                    ON hooks_log(session_id, executed_at);
             """)
+            # Databases created before plan_path existed
+            session_columns = {
+                row[1] for row in conn.execute("PRAGMA table_info(research_sessions)")
+            }
+            if "plan_path" not in session_columns:
+                conn.execute("ALTER TABLE research_sessions ADD COLUMN plan_path TEXT")
+
+            # Gather planner statistics once; close() keeps them current with
+            # PRAGMA optimize
+            analyzed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            if not analyzed:
+                conn.execute("ANALYZE")
 
     @contextmanager
     def _connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager for the serialized writer connection.
+
+        Inside ``transaction()`` on the same thread, writes join the open
+        transaction instead of committing on their own.
+        """
+        with self._write_lock:
+            if self._tx_owner == threading.get_ident():
+                assert self._writer is not None
+                yield self._writer
+                return
+            if self._writer is None:
+                # IMMEDIATE takes the write lock at BEGIN instead of upgrading mid-transaction
+                self._writer = sqlite3.connect(
+                    self.db_path, isolation_level="IMMEDIATE", check_same_thread=False
+                )
+                self._apply_pragmas(self._writer)
+            conn = self._writer
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """Group writes from this thread into a single commit.
+
+        Holds the writer for the whole block, so it must not span an ``await``.
+        """
+        if self._tx_owner == threading.get_ident():
+            with self._connection() as conn:
+                yield conn
+            return
+        with self._connection() as conn:
+            self._tx_owner = threading.get_ident()
+            try:
+                yield conn
+            finally:
+                self._tx_owner = None
+
+    @contextmanager
+    def _read_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """Context manager for a pooled read-only connection."""
+        if self._in_memory or self._tx_owner == threading.get_ident():
+            # Each :memory: connection is a separate database, and readers can't
+            # see an open transaction's writes, so read via the writer
+            with self._connection() as conn:
+                yield conn
+            return
+
+        conn = self._acquire_reader()
         try:
             yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
         finally:
-            conn.close()
+            self._readers.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Take an idle reader, opening a new one while under the pool size."""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._reader_lock:
+            can_open = self._reader_count < self.read_pool_size
+            if can_open:
+                self._reader_count += 1
+        if not can_open:
+            return self._readers.get()
+
+        conn = sqlite3.connect(
+            f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+            uri=True,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._apply_pragmas(conn, read_only=True)
+        return conn
+
+    def _apply_pragmas(self, conn: sqlite3.Connection, read_only: bool = False) -> None:
+        """Apply the configured PRAGMAs to a new connection."""
+        for name, value in self.pragmas.items():
+            if read_only and name in self.WRITE_ONLY_PRAGMAS:
+                continue
+            conn.execute(f"PRAGMA {name}={value}")
+
+    def close(self) -> None:
+        """Write pending hook logs, then close all reader connections and the writer."""
+        with self._hook_writer_lock:
+            if self._hook_writer is not None:
+                self._hook_queue.put(None)
+                self._hook_writer.join()
+                self._hook_writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._reader_lock:
+            self._reader_count = 0
+        # Closed last so it can checkpoint and remove the WAL file
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.execute("PRAGMA optimize")
+                self._writer.close()
+                self._writer = None
 
     # Research Sessions
     def create_session(
@@ -102,7 +333,7 @@ class SQLiteStore:
                 INSERT INTO research_sessions (id, problem, metadata)
                 VALUES (?, ?, ?)
                 """,
-                (session_id, problem, json.dumps(metadata or {})),
+                (session_id, problem, _dumps(metadata or {})),
             )
         logger.info(f"Created research session: {session_id}")
         session = self.get_session(session_id)
@@ -112,21 +343,16 @@ class SQLiteStore:
 
     def get_session(self, session_id: str) -> dict | None:
         """Get a research session by ID."""
-        with self._connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM research_sessions WHERE id = ?", (session_id,)
-            ).fetchone()
-            if row:
-                return dict(row)
-        return None
+        with self._read_connection() as conn:
+            return _fetch_dict(conn.execute(_SQL_GET_SESSION, (session_id,)))
 
     def update_session(self, session_id: str, **kwargs: Any) -> None:
         """Update a research session."""
-        allowed_fields = {"problem", "status", "plan", "metadata"}
+        allowed_fields = {"problem", "status", "plan", "plan_path", "metadata"}
         updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
 
         if "metadata" in updates and isinstance(updates["metadata"], dict):
-            updates["metadata"] = json.dumps(updates["metadata"])
+            updates["metadata"] = _dumps(updates["metadata"])
 
         if updates:
             set_clause = ", ".join(f"{k} = ?" for k in updates)
@@ -140,19 +366,52 @@ class SQLiteStore:
                     (*updates.values(), session_id),
                 )
 
-    def list_sessions(self, status: str | None = None) -> list[dict]:
-        """List all research sessions."""
-        with self._connection() as conn:
-            if status:
-                rows = conn.execute(
-                    "SELECT * FROM research_sessions WHERE status = ? ORDER BY created_at DESC",
-                    (status,),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    "SELECT * FROM research_sessions ORDER BY created_at DESC"
-                ).fetchall()
-            return [dict(row) for row in rows]
+    def list_sessions(
+        self,
+        status: str | None = None,
+        limit: int | None = None,
+        after_id: str | None = None,
+    ) -> list[dict]:
+        """List research sessions, newest first.
+
+        Pages are keyset-based: pass the last ID of a page as ``after_id`` to
+        get the next one, which stays an index seek however many sessions exist.
+        """
+        conditions = []
+        params: list[Any] = []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if after_id:
+            conditions.append(
+                "(created_at, id) < (SELECT created_at, id FROM research_sessions WHERE id = ?)"
+            )
+            params.append(after_id)
+
+        query = "SELECT * FROM research_sessions"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._read_connection() as conn:
+            return _fetch_dicts(conn.execute(query, params))
+
+    def iter_sessions(self, status: str | None = None, page_size: int = 100) -> Iterator[dict]:
+        """Stream research sessions, newest first, one keyset page at a time.
+
+        At most ``page_size`` rows are held in memory, and no connection stays
+        checked out between pages.
+        """
+        after_id = None
+        while True:
+            page = self.list_sessions(status, limit=page_size, after_id=after_id)
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1]["id"]
 
     # Agent States
     def create_agent_state(
@@ -170,7 +429,7 @@ class SQLiteStore:
                 INSERT INTO agent_states (id, session_id, agent_name, focus_area, state_data)
                 VALUES (?, ?, ?, ?, ?)
                 """,
-                (agent_id, session_id, agent_name, focus_area, json.dumps(state_data or {})),
+                (agent_id, session_id, agent_name, focus_area, _dumps(state_data or {})),
             )
         agent = self.get_agent_state(agent_id)
         if agent is None:
@@ -179,13 +438,8 @@ class SQLiteStore:
 
     def get_agent_state(self, agent_id: str) -> dict | None:
         """Get an agent state by ID."""
-        with self._connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM agent_states WHERE id = ?", (agent_id,)
-            ).fetchone()
-            if row:
-                return dict(row)
-        return None
+        with self._read_connection() as conn:
+            return _fetch_dict(conn.execute(_SQL_GET_AGENT_STATE, (agent_id,)))
 
     def update_agent_state(self, agent_id: str, **kwargs: Any) -> None:
         """Update an agent state."""
@@ -193,7 +447,7 @@ class SQLiteStore:
         updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
 
         if "state_data" in updates and isinstance(updates["state_data"], dict):
-            updates["state_data"] = json.dumps(updates["state_data"])
+            updates["state_data"] = _dumps(updates["state_data"])
 
         if updates:
             set_clause = ", ".join(f"{k} = ?" for k in updates)
@@ -207,14 +461,60 @@ class SQLiteStore:
                     (*updates.values(), agent_id),
                 )
 
+    def append_session_activity(
+        self,
+        session_id: str,
+        agents: list[dict[str, Any]] | None = None,
+        artifacts: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Record a batch of agent states and artifacts in one transaction.
+
+        Agents need ``id``, ``agent_name`` and ``focus_area``; artifacts need
+        ``id``, ``artifact_type`` and ``file_path``.
+        """
+        with self._connection() as conn:
+            if agents:
+                conn.executemany(
+                    """
+                    INSERT INTO agent_states (id, session_id, agent_name, focus_area, state_data)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            agent["id"],
+                            session_id,
+                            agent["agent_name"],
+                            agent.get("focus_area", ""),
+                            _dumps(agent.get("state_data") or {}),
+                        )
+                        for agent in agents
+                    ],
+                )
+            if artifacts:
+                conn.executemany(
+                    """
+                    INSERT INTO research_artifacts
+                    (id, session_id, agent_id, artifact_type, file_path, content_hash, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            artifact["id"],
+                            session_id,
+                            artifact.get("agent_id"),
+                            artifact["artifact_type"],
+                            artifact["file_path"],
+                            artifact.get("content_hash"),
+                            _dumps(artifact.get("metadata") or {}),
+                        )
+                        for artifact in artifacts
+                    ],
+                )
+
     def get_session_agents(self, session_id: str) -> list[dict]:
         """Get all agents for a session."""
-        with self._connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM agent_states WHERE session_id = ? ORDER BY created_at",
-                (session_id,),
-            ).fetchall()
-            return [dict(row) for row in rows]
+        with self._read_connection() as conn:
+            return _fetch_dicts(conn.execute(_SQL_GET_SESSION_AGENTS, (session_id,)))
 
     # Research Artifacts
     def create_artifact(
@@ -242,18 +542,98 @@ class SQLiteStore:
                     artifact_type,
                     file_path,
                     content_hash,
-                    json.dumps(metadata or {}),
+                    _dumps(metadata or {}),
                 ),
             )
 
     def get_session_artifacts(self, session_id: str) -> list[dict]:
         """Get all artifacts for a session."""
+        with self._read_connection() as conn:
+            return _fetch_dicts(conn.execute(_SQL_GET_SESSION_ARTIFACTS, (session_id,)))
+
+    # Search Cache
+    def get_search_result(self, key: str, max_age_seconds: float) -> dict | None:
+        """Get cached search results newer than ``max_age_seconds``."""
+        with self._read_connection() as conn:
+            row = conn.execute(
+                _SQL_GET_SEARCH_RESULT, (key, time.time() - max_age_seconds)
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def put_search_result(self, key: str, query: str, results: dict) -> None:
+        """Cache search results, replacing any older entry for the key."""
+        with self._connection() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO search_cache (key, query, results, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (key, query, _dumps(results), time.time()),
+            )
+
+    # Remembered content
+    def get_remembered_memory(self, content_hash: bytes) -> str | None:
+        """Get the memory ID already stored for a content hash."""
+        with self._read_connection() as conn:
+            row = conn.execute(_SQL_GET_REMEMBERED_MEMORY, (content_hash,)).fetchone()
+        return row[0] if row else None
+
+    def record_remembered_memory(self, content_hash: bytes, memory_id: str) -> None:
+        """Record the memory ID stored for a content hash."""
         with self._connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM research_artifacts WHERE session_id = ? ORDER BY created_at",
-                (session_id,),
-            ).fetchall()
-            return [dict(row) for row in rows]
+            conn.execute(
+                "INSERT OR IGNORE INTO remember_dedup (hash, memory_id) VALUES (?, ?)",
+                (content_hash, memory_id),
+            )
+
+    # Memory keyword index
+    def index_memories(self, records: list[dict]) -> None:
+        """Add prepared memory records to the keyword index, replacing any with the same ID."""
+        if not records:
+            return
+        ids = [record["id"] for record in records]
+        with self._connection() as conn:
+            # id is UNINDEXED, so this scans the table; one scan per batch
+            conn.execute(
+                f"DELETE FROM memories_fts WHERE id IN ({','.join('?' * len(ids))})", ids
+            )
+            conn.executemany(
+                "INSERT INTO memories_fts (content, id, metadata) VALUES (?, ?, ?)",
+                [
+                    (record["document"], record["id"], _dumps(record["metadata"]))
+                    for record in records
+                ],
+            )
+
+    def forget_memories(self, memory_ids: list[str]) -> None:
+        """Drop memories from the keyword index and the remember dedup table."""
+        if not memory_ids:
+            return
+        placeholders = ",".join("?" * len(memory_ids))
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM memories_fts WHERE id IN ({placeholders})", memory_ids)
+            conn.execute(
+                f"DELETE FROM remember_dedup WHERE memory_id IN ({placeholders})", memory_ids
+            )
+
+    def forget_all_memories(self) -> None:
+        """Empty the keyword index and the remember dedup table."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM memories_fts")
+            conn.execute("DELETE FROM remember_dedup")
+
+    def search_memories(self, query: str, limit: int = 10) -> list[dict]:
+        """Search indexed memories by BM25 rank, matching any query term."""
+        terms = _FTS_TERM.findall(query)
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        with self._read_connection() as conn:
+            rows = conn.execute(_SQL_SEARCH_MEMORIES, (match, limit)).fetchall()
+        return [
+            {"id": memory_id, "content": content, "metadata": orjson.loads(metadata)}
+            for memory_id, content, metadata in rows
+        ]
 
     # Hooks Log
     def log_hook(
@@ -264,51 +644,132 @@ class SQLiteStore:
         payload: dict | None = None,
         result: Any = None,
     ) -> None:
-        """Log a hook execution."""
-        with self._connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO hooks_log (session_id, hook_name, event_type, payload, result)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    hook_name,
-                    event_type,
-                    json.dumps(payload) if payload else None,
-                    json.dumps(result) if result else None,
-                ),
-            )
+        """Queue a hook execution log; it is written in the background."""
+        self._ensure_hook_writer()
+        self._hook_queue.put_nowait((
+            session_id,
+            hook_name,
+            event_type,
+            _dumps(payload) if payload else None,
+            _dumps(result) if result else None,
+        ))
+
+    def flush_hook_logs(self) -> None:
+        """Block until every queued hook log has been written."""
+        self._hook_queue.join()
+
+    def _ensure_hook_writer(self) -> None:
+        """Start the background hook log writer on first use."""
+        if self._hook_writer is not None:
+            return
+        with self._hook_writer_lock:
+            if self._hook_writer is None:
+                self._hook_writer = threading.Thread(
+                    target=self._write_hook_logs, name="hooks-log-writer", daemon=True
+                )
+                self._hook_writer.start()
+
+    def _write_hook_logs(self) -> None:
+        """Drain queued hook logs, writing each batch in one transaction."""
+        stopping = False
+        while not stopping:
+            rows = [self._hook_queue.get()]
+            while len(rows) < self.HOOK_LOG_BATCH_SIZE:
+                try:
+                    rows.append(self._hook_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = None in rows
+            batch = [row for row in rows if row is not None]
+            try:
+                if batch:
+                    with self._connection() as conn:
+                        conn.executemany(
+                            """
+                            INSERT INTO hooks_log
+                            (session_id, hook_name, event_type, payload, result)
+                            VALUES (?, ?, ?, ?, ?)
+                            """,
+                            batch,
+                        )
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(batch)} hook logs: {e}")
+            finally:
+                for _ in rows:
+                    self._hook_queue.task_done()
+
+
+def _close_at_exit(ref: "weakref.ref[SQLiteStore]") -> None:
+    """Close a store's connections when the interpreter exits."""
+    store = ref()
+    if store is not None:
+        store.close()
 
 
 class PersistenceManager:
     """High-level persistence manager combining SQLite with file system."""
 
-    def __init__(self, db_path: Path, base_output_dir: Path):
-        self.store = SQLiteStore(db_path)
+    def __init__(
+        self,
+        db_path: Path,
+        base_output_dir: Path,
+        pragmas: dict[str, str | int] | None = None,
+        read_pool_size: int | None = None,
+    ):
+        self.store = SQLiteStore(db_path, pragmas=pragmas, read_pool_size=read_pool_size)
         self.base_output_dir = base_output_dir
         self.base_output_dir.mkdir(parents=True, exist_ok=True)
+        self._known_sessions: set[str] = set()
+        # (session_id, agent_name) pairs whose directories already exist
+        self._known_agent_dirs: set[tuple[str, str]] = set()
 
-    def get_session_dir(self, session_id: str) -> Path:
-        """Get the output directory for a session."""
+    def transaction(self) -> AbstractContextManager[sqlite3.Connection]:
+        """Group store writes into a single commit."""
+        return self.store.transaction()
+
+    def get_session_dir(self, session_id: str, ensure_exists: bool = True) -> Path:
+        """Get the output directory for a session, creating it once if needed."""
         session_dir = self.base_output_dir / session_id
-        session_dir.mkdir(parents=True, exist_ok=True)
+        if ensure_exists and session_id not in self._known_sessions:
+            session_dir.mkdir(parents=True, exist_ok=True)
+            self._known_sessions.add(session_id)
         return session_dir
 
     def get_agent_dir(self, session_id: str, agent_name: str) -> Path:
         """Get the output directory for an agent within a session."""
         agent_dir = self.get_session_dir(session_id) / agent_name
-        agent_dir.mkdir(parents=True, exist_ok=True)
+        key = (session_id, agent_name)
+        if key not in self._known_agent_dirs:
+            agent_dir.mkdir(parents=True, exist_ok=True)
+            self._known_agent_dirs.add(key)
         return agent_dir
 
     def write_plan(self, session_id: str, plan_content: str) -> Path:
-        """Write the research plan to the session directory."""
+        """Write the research plan to the session directory.
+
+        Only the file's path is recorded on the session; read_plan loads it.
+        """
         session_dir = self.get_session_dir(session_id)
         plan_path = session_dir / "RESEARCH_PLAN.md"
-        plan_path.write_text(plan_content, encoding="utf-8")
-        self.store.update_session(session_id, plan=plan_content)
+        plan_path.write_bytes(plan_content.encode("utf-8"))
+        self.store.update_session(session_id, plan_path=str(plan_path))
         return plan_path
 
+    def read_plan(self, session_id: str) -> str | None:
+        """Get a session's research plan, reading the plan file on demand."""
+        session = self.store.get_session(session_id)
+        if session is None:
+            return None
+        # Sessions written before plan_path kept the plan inline
+        if session["plan"] is not None:
+            return str(session["plan"])
+        if session["plan_path"]:
+            plan_path = Path(session["plan_path"])
+            if plan_path.exists():
+                return plan_path.read_bytes().decode("utf-8")
+        return None
+
     def write_agent_result(
         self,
         session_id: str,
@@ -319,5 +780,5 @@ class PersistenceManager:
         """Write an agent's result file."""
         agent_dir = self.get_agent_dir(session_id, agent_name)
         result_path = agent_dir / filename
-        result_path.write_text(content, encoding="utf-8")
+        result_path.write_bytes(content.encode("utf-8"))
         return result_path
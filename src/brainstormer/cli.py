@@ -1,32 +1,123 @@
 """Command-line interface for Brainstormer."""
 
 import asyncio
+import os
+import sys
+from collections.abc import Coroutine
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import typer
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
-from .agents.orchestrator import ResearchOrchestrator
-from .agents.subagents import SubagentManager, create_default_subagents_file
-from .backends.memory import ChromaMemoryStore, MemoryManager
 from .config import Settings, load_settings
-from .middleware.hooks import HookManager, load_hooks_from_file
-from .skills.loader import SkillRegistry, create_skill_directory
-from .utils.file_parser import parse_files
 from .utils.logging import get_logger, setup_logging
 
+if TYPE_CHECKING:
+    # The orchestrator, memory and parsers pull in langchain, chromadb and
+    # embedding libraries, so commands import them only when they run
+    from .agents.orchestrator import ResearchOrchestrator
+
+_PACKAGE_ENV_SAMPLE = Path(__file__).parents[2] / ".env.sample"
+
+_MINIMAL_ENV_SAMPLE = """# LLM API Keys
+ANTHROPIC_API_KEY=your-anthropic-api-key
+OPENAI_API_KEY=your-openai-api-key
+TAVILY_API_KEY=your-tavily-api-key
+"""
+
+_SAMPLE_HOOKS_PY = '''"""Custom hooks for Brainstormer."""
+
+from brainstormer.middleware.hooks import hook, HookPhase, HookResult
+
+
+@hook("plan_creation", HookPhase.PRE, name="validate_plan")
+def validate_plan(data: dict, context: dict) -> HookResult:
+    """Validate plan before creation."""
+    # Add custom validation logic here
+    return HookResult(success=True)
+
+
+@hook("search", HookPhase.POST, name="log_search")
+def log_search(data: dict, context: dict) -> HookResult:
+    """Log search queries and results."""
+    query = data.get("query", {}).get("query", "")
+    results_count = len(data.get("results", []))
+    print(f"Search: {query} -> {results_count} results")
+    return HookResult(success=True)
+
+
+@hook("completion", HookPhase.POST, name="notify_completion")
+async def notify_completion(data: dict, context: dict) -> HookResult:
+    """Notify when an agent completes."""
+    agent_name = data.get("completion_data", {}).get("agent_name", "unknown")
+    print(f"Agent completed: {agent_name}")
+    return HookResult(success=True)
+'''
+
 app = typer.Typer(
     name="brainstormer",
     help="Orchestrated research CLI with configurable subagents and long-term memory",
     no_args_is_help=True,
 )
-console = Console()
+# Rich's automatic highlighter runs a regex pass over every printed string
+console = Console(highlight=False)
 logger = get_logger(__name__)
 
 
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine on uvloop (winloop on Windows) when installed, else asyncio."""
+    try:
+        if sys.platform == "win32":
+            import winloop as loop_impl
+        else:
+            import uvloop as loop_impl
+    except ImportError:
+        return asyncio.run(_with_eager_tasks(coro))
+    return loop_impl.run(_with_eager_tasks(coro))
+
+
+async def _with_eager_tasks(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Await a coroutine with eager task creation on Python 3.12+.
+
+    Tasks that finish without suspending, such as cached searches gathered by
+    the search tool, then complete without a trip through the scheduler.
+    """
+    factory = getattr(asyncio, "eager_task_factory", None)
+    if factory is not None:
+        asyncio.get_running_loop().set_task_factory(factory)
+    return await coro
+
+
+def _stat_or_none(path: Path | None) -> os.stat_result | None:
+    """Stat an optional path, returning None when it is unset or missing."""
+    if path is None:
+        return None
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _titled(body: str, title: str) -> Any:
+    """A titled box on a terminal; plain title and body lines when piped."""
+    if console.is_terminal:
+        return Panel(body, title=title, expand=False)
+    return f"[bold]{title}[/bold]\n{body}"
+
+
+async def _run_research_session(orchestrator: "ResearchOrchestrator", **kwargs: Any) -> dict:
+    """Run one research session and release the orchestrator's connections."""
+    try:
+        return await orchestrator.run_research(**kwargs)
+    finally:
+        await orchestrator.aclose()
+
+
 def get_settings(env_file: Path | None = None) -> Settings:
     """Load and validate settings."""
     settings = load_settings(env_file)
@@ -80,6 +171,12 @@ def research(
     The orchestrator will analyze your problem, create a research plan,
     delegate to specialized subagents, and synthesize the findings.
     """
+    from .agents.orchestrator import ResearchOrchestrator
+    from .agents.subagents import SubagentManager
+    from .middleware.hooks import HookManager, load_hooks_from_file
+    from .skills.loader import SkillRegistry
+    from .utils.file_parser import parse_files
+
     # Setup logging
     setup_logging("DEBUG" if verbose else "INFO")
 
@@ -90,37 +187,54 @@ def research(
     if skills_dir:
         settings.skills_dir = skills_dir
 
-    console.print(Panel.fit(
+    console.print(_titled(
         f"[bold blue]Brainstormer[/bold blue]\n\n"
         f"[yellow]Problem:[/yellow] {problem[:100]}{'...' if len(problem) > 100 else ''}",
         title="Research Session",
     ))
 
-    # Parse input files
-    input_files = []
+    # Input files, subagents, skills and hooks are independent, so read them
+    # concurrently and report in a fixed order once all are loaded
+    hook_manager = HookManager()
     if files:
         console.print("\n[bold]Parsing input files...[/bold]")
-        input_files = parse_files([Path(f) for f in files])
-        for f in input_files:
-            console.print(f"  - {f['name']} ({f['type']}, {f['size']} bytes)")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        files_future = pool.submit(parse_files, files) if files else None
+        subagents_future = (
+            pool.submit(SubagentManager, subagents_file) if _stat_or_none(subagents_file) else None
+        )
+        skills_future = (
+            pool.submit(SkillRegistry, settings.skills_dir)
+            if _stat_or_none(settings.skills_dir)
+            else None
+        )
+        hooks_future = (
+            pool.submit(load_hooks_from_file, hooks_file, hook_manager)
+            if hooks_file is not None and _stat_or_none(hooks_file)
+            else None
+        )
+
+    input_files = []
+    if files_future:
+        input_files = files_future.result()
+        console.print(
+            "\n".join(f"  - {f['name']} ({f['type']}, {f['size']} bytes)" for f in input_files)
+        )
 
-    # Load subagents
     subagent_manager = None
-    if subagents_file and subagents_file.exists():
-        subagent_manager = SubagentManager(subagents_file)
+    if subagents_future:
+        subagent_manager = subagents_future.result()
         console.print(f"\n[bold]Loaded {len(subagent_manager.list_all())} subagent configurations[/bold]")
 
-    # Load skills
     skills_registry = None
-    if settings.skills_dir.exists():
-        skills_registry = SkillRegistry(settings.skills_dir)
-        if skills_registry.list_all():
-            console.print(f"\n[bold]Loaded {len(skills_registry.list_all())} skills[/bold]")
-
-    # Load hooks
-    hook_manager = HookManager()
-    if hooks_file and hooks_file.exists():
-        hooks = load_hooks_from_file(hooks_file, hook_manager)
+    if skills_future:
+        skills_registry = skills_future.result()
+        skill_count = len(skills_registry.list_all())
+        if skill_count:
+            console.print(f"\n[bold]Loaded {skill_count} skills[/bold]")
+
+    if hooks_future:
+        hooks = hooks_future.result()
         console.print(f"\n[bold]Loaded {len(hooks)} hooks[/bold]")
 
     # Create orchestrator
@@ -136,13 +250,14 @@ def research(
     console.print("\n[bold green]Starting research...[/bold green]\n")
 
     try:
-        result = asyncio.run(orchestrator.run_research(
+        result = run_async(_run_research_session(
+            orchestrator,
             problem=problem,
             input_files=input_files if input_files else None,
             focus_areas=focus_areas,
         ))
 
-        console.print(Panel.fit(
+        console.print(_titled(
             f"[bold green]Research Complete![/bold green]\n\n"
             f"Session ID: {result['session_id']}\n"
             f"Output: {result['output_dir']}",
@@ -161,6 +276,14 @@ def sessions(
         str | None,
         typer.Option("--status", help="Filter by status (active, completed)"),
     ] = None,
+    limit: Annotated[
+        int,
+        typer.Option("--limit", help="Maximum number of sessions to show"),
+    ] = 100,
+    after: Annotated[
+        str | None,
+        typer.Option("--after", help="Show sessions older than this session ID"),
+    ] = None,
     env_file: Annotated[
         Path | None,
         typer.Option("--env", help="Path to .env file"),
@@ -170,8 +293,8 @@ def sessions(
     settings = get_settings(env_file)
 
     from .backends.persistence import SQLiteStore
-    store = SQLiteStore(settings.sqlite_db_path)
-    sessions_list = store.list_sessions(status)
+    store = SQLiteStore(settings.sqlite_db_path, pragmas=settings.get_sqlite_pragmas())
+    sessions_list = store.list_sessions(status, limit=limit, after_id=after)
 
     if not sessions_list:
         console.print("[yellow]No research sessions found.[/yellow]")
@@ -193,6 +316,8 @@ def sessions(
         )
 
     console.print(table)
+    if len(sessions_list) == limit:
+        console.print(f"[dim]More sessions may exist: --after {sessions_list[-1]['id']}[/dim]")
 
 
 @app.command()
@@ -210,6 +335,7 @@ def session(
     persistence = PersistenceManager(
         db_path=settings.sqlite_db_path,
         base_output_dir=Path("./research"),
+        pragmas=settings.get_sqlite_pragmas(),
     )
 
     session_data = persistence.store.get_session(session_id)
@@ -219,13 +345,13 @@ def session(
 
     agents = persistence.store.get_session_agents(session_id)
 
-    console.print(Panel.fit(
+    renderables: list[Any] = [_titled(
         f"[bold]Session:[/bold] {session_id}\n"
         f"[bold]Status:[/bold] {session_data['status']}\n"
         f"[bold]Created:[/bold] {session_data['created_at']}\n\n"
         f"[bold]Problem:[/bold]\n{session_data['problem']}",
         title="Research Session",
-    ))
+    )]
 
     if agents:
         table = Table(title="Agents")
@@ -240,7 +366,9 @@ def session(
                 agent["status"],
             )
 
-        console.print(table)
+        renderables.append(table)
+
+    console.print(Group(*renderables))
 
 
 @app.command()
@@ -263,6 +391,9 @@ def init(
     ] = True,
 ) -> None:
     """Initialize a new Brainstormer project directory."""
+    from .agents.subagents import create_default_subagents_file
+    from .skills.loader import create_skill_directory
+
     directory = directory.resolve()
     directory.mkdir(parents=True, exist_ok=True)
 
@@ -272,18 +403,10 @@ def init(
     env_sample = directory / ".env.sample"
     if not env_sample.exists():
         try:
-            # Try to read from package
-            import brainstormer
-            package_env = Path(brainstormer.__file__).parent.parent.parent / ".env.sample"
-            if package_env.exists():
-                env_sample.write_text(package_env.read_text())
-        except Exception:
-            # Create minimal .env.sample
-            env_sample.write_text("""# LLM API Keys
-ANTHROPIC_API_KEY=your-anthropic-api-key
-OPENAI_API_KEY=your-openai-api-key
-TAVILY_API_KEY=your-tavily-api-key
-""")
+            # Source checkouts have the full sample at the repository root
+            env_sample.write_text(_PACKAGE_ENV_SAMPLE.read_text())
+        except OSError:
+            env_sample.write_text(_MINIMAL_ENV_SAMPLE)
         console.print("  Created .env.sample")
 
     # Create skills directory
@@ -302,34 +425,7 @@ TAVILY_API_KEY=your-tavily-api-key
     if with_hooks:
         hooks_file = directory / "hooks.py"
         if not hooks_file.exists():
-            hooks_file.write_text('''"""Custom hooks for Brainstormer."""
-
-from brainstormer.middleware.hooks import hook, HookPhase, HookResult
-
-
-@hook("plan_creation", HookPhase.PRE, name="validate_plan")
-def validate_plan(data: dict, context: dict) -> HookResult:
-    """Validate plan before creation."""
-    # Add custom validation logic here
-    return HookResult(success=True)
-
-
-@hook("search", HookPhase.POST, name="log_search")
-def log_search(data: dict, context: dict) -> HookResult:
-    """Log search queries and results."""
-    query = data.get("query", {}).get("query", "")
-    results_count = len(data.get("results", []))
-    print(f"Search: {query} -> {results_count} results")
-    return HookResult(success=True)
-
-
-@hook("completion", HookPhase.POST, name="notify_completion")
-async def notify_completion(data: dict, context: dict) -> HookResult:
-    """Notify when an agent completes."""
-    agent_name = data.get("completion_data", {}).get("agent_name", "unknown")
-    print(f"Agent completed: {agent_name}")
-    return HookResult(success=True)
-''')
+            hooks_file.write_text(_SAMPLE_HOOKS_PY)
             console.print("  Created hooks.py")
 
     # Create research output directory
@@ -361,10 +457,17 @@ def memory(
     ] = None,
 ) -> None:
     """Search or list memories from long-term storage."""
+    from .backends.memory import MemoryManager, create_memory_store
+    from .backends.persistence import SQLiteStore
+
     settings = get_settings(env_file)
 
-    chroma_store = ChromaMemoryStore(persist_directory=settings.chromadb_path)
-    memory_manager = MemoryManager(chroma_store)
+    memory_store = create_memory_store(
+        settings.memory_backend,
+        persist_directory=settings.chromadb_path,
+    )
+    keyword_store = SQLiteStore(settings.sqlite_db_path, pragmas=settings.get_sqlite_pragmas())
+    memory_manager = MemoryManager(memory_store, keyword_store=keyword_store)
 
     if query:
         console.print(f"[bold]Searching memories for:[/bold] {query}\n")
@@ -378,15 +481,24 @@ def memory(
         console.print("[yellow]No memories found.[/yellow]")
         return
 
+    table = Table(show_lines=True)
+    table.add_column("#", style="cyan", justify="right")
+    table.add_column("Content")
+    table.add_column("Type", style="dim")
+    table.add_column("Session", style="dim")
+
     for i, mem in enumerate(memories, 1):
-        content = mem.get("content", "")[:200]
+        content = mem.get("content", "")
         metadata = mem.get("metadata", {})
-        console.print(Panel(
-            f"{content}{'...' if len(mem.get('content', '')) > 200 else ''}\n\n"
-            f"[dim]Type: {metadata.get('type', 'unknown')} | "
-            f"Session: {metadata.get('session_id', 'N/A')}[/dim]",
-            title=f"Memory {i}",
-        ))
+        table.add_row(
+            str(i),
+            # Plain Text: memory content is not Rich markup
+            Text(content[:200] + "..." if len(content) > 200 else content),
+            metadata.get("type", "unknown"),
+            metadata.get("session_id", "N/A"),
+        )
+
+    console.print(table)
 
 
 @app.command()
@@ -397,6 +509,8 @@ def skills(
     ] = None,
 ) -> None:
     """List available skills."""
+    from .skills.loader import SkillRegistry
+
     if skills_dir is None:
         skills_dir = Path("./skills")
 
@@ -430,6 +544,8 @@ def subagents(
     ] = None,
 ) -> None:
     """List configured subagents."""
+    from .agents.subagents import SubagentManager
+
     if subagents_file is None:
         subagents_file = Path("./subagents.jsonl")
 
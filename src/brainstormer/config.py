@@ -1,9 +1,10 @@
 """Configuration management for Brainstormer."""
 
+import functools
+import os
 from pathlib import Path
 from typing import Literal
 
-from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -28,18 +29,56 @@ class Settings(BaseSettings):
 
     # Web Search
     tavily_api_key: str | None = None
+    # Reuse identical search results for this long (0 disables the cache)
+    search_cache_ttl_seconds: int = 900
+    # Cap on Tavily requests per second across all sessions (0 disables)
+    search_rate_limit: float = 0.0
 
     # Database paths
-    sqlite_db_path: Path = Field(default_factory=lambda: Path("./brainstormer.db"))
-    chromadb_path: Path = Field(default_factory=lambda: Path("./chromadb"))
+    sqlite_db_path: Path = Path("./brainstormer.db")
+    chromadb_path: Path = Path("./chromadb")
 
     # Skills directory
-    skills_dir: Path = Field(default_factory=lambda: Path("./skills"))
+    skills_dir: Path = Path("./skills")
 
     # Default LLM settings
     default_llm_provider: Literal["anthropic", "openai", "openrouter"] = "anthropic"
     default_llm_model: str = "claude-sonnet-4-5-20250929"
 
+    # SQLite tuning (applied as PRAGMAs on every connection)
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -65536
+    sqlite_mmap_size: int = 10 * 1024**3
+    sqlite_temp_store: str = "MEMORY"
+    sqlite_foreign_keys: bool = True
+
+    # Send a 1-token request while a session is set up so the first real call
+    # may find the connection open; off by default as it is an extra request
+    model_warmup: bool = False
+
+    # Checkpointing: "per_step" saves after every super-step, "end_of_workflow"
+    # (opt-in) saves once when the research graph finishes, leaving nothing to
+    # resume from if a run fails midway
+    checkpoint_mode: Literal["per_step", "end_of_workflow"] = "per_step"
+    # "sqlite" keeps checkpoints and the /memories/ store in sqlite_db_path so
+    # they survive across sessions and processes
+    checkpoint_backend: Literal["memory", "sqlite"] = "memory"
+
+    # Subagent concurrency: cap in-flight subagents to stay under provider rate
+    # limits and bound how long any single subagent may run
+    max_parallel_agents: int = 4
+    agent_timeout_seconds: float = 600.0
+
+    # Vector memory: "faiss" keeps an exact in-process index (requires
+    # brainstormer[faiss]) and is faster for read-heavy use
+    memory_backend: Literal["chroma", "faiss"] = "chroma"
+
+    # Memory write batching
+    memory_batch_size: int = 128
+    memory_flush_interval_seconds: float = 0.5
+
     # Logging
     log_level: str = "INFO"
 
@@ -47,6 +86,18 @@ class Settings(BaseSettings):
         """Get the model string for langchain init_chat_model."""
         return f"{self.default_llm_provider}:{self.default_llm_model}"
 
+    def get_sqlite_pragmas(self) -> dict[str, str | int]:
+        """Get the PRAGMAs applied to SQLite connections."""
+        return {
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "busy_timeout": self.sqlite_busy_timeout_ms,
+            "cache_size": self.sqlite_cache_size,
+            "mmap_size": self.sqlite_mmap_size,
+            "temp_store": self.sqlite_temp_store,
+            "foreign_keys": "ON" if self.sqlite_foreign_keys else "OFF",
+        }
+
     def validate_api_keys(self) -> list[str]:
         """Validate that required API keys are present."""
         errors = []
@@ -62,8 +113,39 @@ class Settings(BaseSettings):
 
 
 def load_settings(env_file: Path | None = None) -> Settings:
-    """Load settings from environment and optional .env file."""
-    if env_file and env_file.exists():
+    """Load settings from environment and optional .env file.
+
+    Parsing is cached per env file (path and mtime) and environment; each call
+    returns a copy, so callers may modify their settings freely.
+    """
+    environ = frozenset(os.environ.items())
+    # One stat per candidate file both checks that it exists and keys the cache
+    if env_file is not None:
+        mtime = _mtime_ns(env_file)
+        if mtime is not None:
+            return _load_settings_cached(
+                str(env_file.absolute()), mtime, True, environ
+            ).model_copy()
+    default = Path(".env")
+    return _load_settings_cached(
+        str(default.absolute()), _mtime_ns(default), False, environ
+    ).model_copy()
+
+
+def _mtime_ns(path: Path) -> int | None:
+    """Modification time of a file, or None if it can't be read."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _load_settings_cached(
+    source: str, mtime: int | None, explicit: bool, environ: frozenset[tuple[str, str]]
+) -> Settings:
+    """Parse settings; arguments other than ``source`` only key the cache."""
+    if explicit:
         # pydantic-settings v2 uses _env_file in constructor
-        return Settings(_env_file=env_file)  # type: ignore[call-arg]
+        return Settings(_env_file=Path(source))  # type: ignore[call-arg]
     return Settings()
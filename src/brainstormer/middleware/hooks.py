@@ -1,10 +1,15 @@
 """Hook system for extensible middleware."""
 
 import asyncio
-from collections.abc import Callable
-from dataclasses import dataclass
+import bisect
+import importlib.util
+import itertools
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from types import ModuleType
 from typing import Any, ClassVar
 
 from ..utils.logging import get_logger
@@ -19,9 +24,17 @@ class HookPhase(str, Enum):
     POST = "post"
 
 
-@dataclass
+def _phase_value(phase: HookPhase | str) -> str:
+    """Plain string for a phase, so dispatch keys compare and hash as str."""
+    return phase.value if isinstance(phase, HookPhase) else HookPhase(phase).value
+
+
+@dataclass(slots=True, frozen=True)
 class HookResult:
-    """Result from a hook execution."""
+    """Result from a hook execution.
+
+    Frozen so the shared success result can't be changed through one caller.
+    """
 
     success: bool
     modified_data: Any = None
@@ -29,27 +42,38 @@ class HookResult:
     should_abort: bool = False
 
 
-@dataclass
+# Shared result for handlers that return None, the common case
+_SUCCESS = HookResult(success=True)
+
+
+@dataclass(slots=True)
 class Hook:
     """A registered hook."""
 
     name: str
     event: str
-    phase: HookPhase
+    phase: str  # HookPhase value; enum members are converted on init
     handler: Callable
     priority: int = 0  # Lower runs first
     enabled: bool = True
+    is_async: bool = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not callable(self.handler):
             raise ValueError(f"Hook handler must be callable: {self.name}")
+        self.phase = _phase_value(self.phase)
+        self.is_async = asyncio.iscoroutinefunction(self.handler)
 
 
 class HookManager:
-    """Manages registration and execution of hooks."""
+    """Manages registration and execution of hooks.
+
+    The execution log keeps the last ``results_capacity`` records; pass None
+    to disable it.
+    """
 
     # Event types supported by the system
-    EVENTS: ClassVar[set[str]] = {
+    EVENTS: ClassVar[frozenset[str]] = frozenset({
         "plan_creation",
         "agent_spawn",
         "research_write",
@@ -61,114 +85,270 @@ class HookManager:
         "memory_recall",
         "skill_load",
         "tool_call",
-    }
-
-    def __init__(self) -> None:
-        self._hooks: dict[str, list[Hook]] = {event: [] for event in self.EVENTS}
-        self._hook_results: list[dict[str, Any]] = []
+    })
+
+    def __init__(self, results_capacity: int | None = 1024) -> None:
+        # Lists are created on first registration for an event
+        self._hooks: defaultdict[str, list[Hook]] = defaultdict(list)
+        # Per (event, phase) hook lists, built on first dispatch and dropped
+        # when the event's hooks change
+        self._dispatch: dict[tuple[str, str], tuple[list[Hook], bool]] = {}
+        # Every registered hook, rebuilt on the first get_hooks() after a change
+        self._all_hooks: tuple[Hook, ...] | None = None
+        self._results_capacity = results_capacity
+        # (hook, event, phase, success, error) tuples; dicts are built on read
+        self._hook_results: deque[tuple[str, str, str, bool, str | None]] = deque(
+            maxlen=results_capacity or 0
+        )
 
     def register(
         self,
         event: str,
         handler: Callable,
-        phase: HookPhase = HookPhase.PRE,
+        phase: HookPhase | str = HookPhase.PRE,
         name: str | None = None,
         priority: int = 0,
     ) -> Hook:
         """Register a hook for an event."""
-        if event not in self.EVENTS:
-            raise ValueError(f"Unknown event: {event}. Valid events: {self.EVENTS}")
+        index = len(self._hooks.get(event, ()))
+        hook = self._new_hook(event, handler, phase, name, priority, index)
+        # Kept sorted on insert; insort places equal priorities after existing ones
+        bisect.insort(self._hooks[event], hook, key=lambda h: h.priority)
+        self._invalidate(event)
+
+        logger.debug(f"Registered hook: {hook.name} for {event} ({hook.phase})")
+        return hook
+
+    def register_many(self, specs: Iterable[dict[str, Any]]) -> list[Hook]:
+        """Register several hooks, each spec holding register()'s keyword arguments.
+
+        All specs are validated before any hook is added, and each affected
+        event is re-sorted once.
+        """
+        counts: dict[str, int] = {}
+        hooks = []
+        for spec in specs:
+            event = spec["event"]
+            index = counts.get(event, len(self._hooks.get(event, ())))
+            hooks.append(self._new_hook(
+                event,
+                spec["handler"],
+                spec.get("phase", HookPhase.PRE),
+                spec.get("name"),
+                spec.get("priority", 0),
+                index,
+            ))
+            counts[event] = index + 1
+
+        for hook in hooks:
+            self._hooks[hook.event].append(hook)
+        for event in counts:
+            # Stable sort keeps registration order among equal priorities
+            self._hooks[event].sort(key=lambda h: h.priority)
+            self._invalidate(event)
 
-        hook = Hook(
-            name=name or f"{event}_{phase.value}_{len(self._hooks[event])}",
+        logger.debug(f"Registered {len(hooks)} hooks across {len(counts)} events")
+        return hooks
+
+    def _new_hook(
+        self,
+        event: str,
+        handler: Callable,
+        phase: HookPhase | str,
+        name: str | None,
+        priority: int,
+        index: int,
+    ) -> Hook:
+        """Validate and build a hook; ``index`` numbers unnamed hooks per event."""
+        if event not in self.EVENTS:
+            raise ValueError(f"Unknown event: {event}. Valid events: {sorted(self.EVENTS)}")
+        phase = _phase_value(phase)
+        return Hook(
+            name=name or f"{event}_{phase}_{index}",
             event=event,
             phase=phase,
             handler=handler,
             priority=priority,
         )
-        self._hooks[event].append(hook)
-        self._hooks[event].sort(key=lambda h: h.priority)
-
-        logger.debug(f"Registered hook: {hook.name} for {event} ({phase.value})")
-        return hook
 
     def unregister(self, hook: Hook) -> bool:
         """Unregister a hook."""
         if hook.event in self._hooks and hook in self._hooks[hook.event]:
             self._hooks[hook.event].remove(hook)
+            self._invalidate(hook.event)
             return True
         return False
 
+    def _invalidate(self, event: str) -> None:
+        """Drop the cached dispatch lists for an event."""
+        self._all_hooks = None
+        for phase in HookPhase:
+            self._dispatch.pop((event, phase.value), None)
+
+    def _hooks_for(self, event: str, phase: str) -> tuple[list[Hook], bool]:
+        """Hooks registered for an event phase, in priority order, and whether
+        any of them is async."""
+        key = (event, phase)
+        plan = self._dispatch.get(key)
+        if plan is None:
+            hooks = [h for h in self._hooks.get(event, ()) if h.phase == phase]
+            plan = (hooks, any(h.is_async for h in hooks))
+            self._dispatch[key] = plan
+        return plan
+
+    def _record(self, hook: Hook, event: str, phase: str, result: Any) -> HookResult:
+        """Normalize a handler's return value and log the execution."""
+        if result is None:
+            hook_result = _SUCCESS
+        elif isinstance(result, HookResult):
+            hook_result = result
+        else:
+            hook_result = HookResult(success=True, modified_data=result)
+        if self._results_capacity is not None:
+            self._hook_results.append((
+                hook.name, event, phase, hook_result.success, hook_result.error
+            ))
+        return hook_result
+
     async def execute(
         self,
         event: str,
-        phase: HookPhase,
+        phase: HookPhase | str,
         data: Any,
-        context: dict | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> tuple[Any, list[HookResult]]:
-        """Execute all hooks for an event phase."""
+        """Execute all hooks for an event phase.
+
+        Execution stops at a hook that requests an abort, so its result is last.
+        """
+        phase = _phase_value(phase)
+        hooks, has_async = self._hooks_for(event, phase)
+        if not has_async:
+            return self.execute_sync(event, phase, data, context)
+
         results = []
         current_data = data
-
-        hooks = [h for h in self._hooks.get(event, []) if h.phase == phase and h.enabled]
+        ctx = context or {}
 
         for hook in hooks:
+            # Checked per call so toggling hook.enabled needs no invalidation
+            if not hook.enabled:
+                continue
             try:
-                if asyncio.iscoroutinefunction(hook.handler):
-                    result = await hook.handler(current_data, context or {})
+                if hook.is_async:
+                    result = await hook.handler(current_data, ctx)
                 else:
-                    result = hook.handler(current_data, context or {})
+                    result = hook.handler(current_data, ctx)
+                hook_result = self._record(hook, event, phase, result)
+            except Exception as e:
+                logger.error(f"Hook {hook.name} failed: {e}")
+                results.append(HookResult(success=False, error=str(e)))
+                continue
 
-                if isinstance(result, HookResult):
-                    hook_result = result
-                else:
-                    hook_result = HookResult(success=True, modified_data=result)
+            if hook_result.modified_data is not None:
+                current_data = hook_result.modified_data
+            results.append(hook_result)
 
-                if hook_result.modified_data is not None:
-                    current_data = hook_result.modified_data
+            if hook_result.should_abort:
+                logger.warning(f"Hook {hook.name} requested abort for {event}")
+                break
 
-                results.append(hook_result)
+        return current_data, results
+
+    def execute_sync(
+        self,
+        event: str,
+        phase: HookPhase | str,
+        data: Any,
+        context: Mapping[str, Any] | None = None,
+    ) -> tuple[Any, list[HookResult]]:
+        """Execute hooks for an event phase without awaiting.
 
-                # Log hook execution
-                self._hook_results.append({
-                    "hook": hook.name,
-                    "event": event,
-                    "phase": phase.value,
-                    "success": hook_result.success,
-                    "error": hook_result.error,
-                })
+        Raises RuntimeError if any hook for the phase is async.
+        """
+        phase = _phase_value(phase)
+        hooks, has_async = self._hooks_for(event, phase)
+        if has_async:
+            raise RuntimeError(f"Async hooks registered for {event} ({phase})")
 
-                if hook_result.should_abort:
-                    logger.warning(f"Hook {hook.name} requested abort for {event}")
-                    break
+        results = []
+        current_data = data
+        ctx = context or {}
 
+        for hook in hooks:
+            if not hook.enabled:
+                continue
+            try:
+                hook_result = self._record(hook, event, phase, hook.handler(current_data, ctx))
             except Exception as e:
                 logger.error(f"Hook {hook.name} failed: {e}")
                 results.append(HookResult(success=False, error=str(e)))
+                continue
+
+            if hook_result.modified_data is not None:
+                current_data = hook_result.modified_data
+            results.append(hook_result)
+
+            if hook_result.should_abort:
+                logger.warning(f"Hook {hook.name} requested abort for {event}")
+                break
 
         return current_data, results
 
+    async def execute_many(
+        self,
+        event: str,
+        phase: HookPhase | str,
+        payloads: Iterable[Any],
+        context: Mapping[str, Any] | None = None,
+    ) -> list[tuple[Any, list[HookResult]]]:
+        """Execute an event phase's hooks for each payload, in payload order.
+
+        Sync-only chains run inline; chains with async hooks run for all
+        payloads concurrently.
+        """
+        phase = _phase_value(phase)
+        hooks, has_async = self._hooks_for(event, phase)
+        if not hooks:
+            return [(data, []) for data in payloads]
+        if not has_async:
+            return [self.execute_sync(event, phase, data, context) for data in payloads]
+        return list(await asyncio.gather(
+            *(self.execute(event, phase, data, context) for data in payloads)
+        ))
+
     async def execute_pre(
-        self, event: str, data: Any, context: dict | None = None
+        self, event: str, data: Any, context: Mapping[str, Any] | None = None
     ) -> tuple[Any, list[HookResult]]:
         """Execute pre-event hooks."""
         return await self.execute(event, HookPhase.PRE, data, context)
 
     async def execute_post(
-        self, event: str, data: Any, context: dict | None = None
+        self, event: str, data: Any, context: Mapping[str, Any] | None = None
     ) -> tuple[Any, list[HookResult]]:
         """Execute post-event hooks."""
         return await self.execute(event, HookPhase.POST, data, context)
 
+    def has(self, event: str, phase: HookPhase | str | None = None) -> bool:
+        """Whether any hooks are registered for an event, or one of its phases."""
+        if phase is None:
+            return bool(self._hooks.get(event))
+        return bool(self._hooks_for(event, _phase_value(phase))[0])
+
     def get_hooks(self, event: str | None = None) -> list[Hook]:
         """Get registered hooks, optionally filtered by event."""
         if event:
             return self._hooks.get(event, [])
-        return [hook for hooks in self._hooks.values() for hook in hooks]
+        if self._all_hooks is None:
+            self._all_hooks = tuple(itertools.chain.from_iterable(self._hooks.values()))
+        return list(self._all_hooks)
 
     def get_results(self) -> list[dict]:
-        """Get execution results log."""
-        return self._hook_results.copy()
+        """Get the most recent execution results, oldest first."""
+        return [
+            {"hook": name, "event": event, "phase": phase, "success": success, "error": error}
+            for name, event, phase, success, error in self._hook_results
+        ]
 
     def clear_results(self) -> None:
         """Clear the results log."""
@@ -195,30 +375,45 @@ def hook(
     return decorator
 
 
-def load_hooks_from_file(file_path: Path, manager: HookManager) -> list[Hook]:
-    """Load hooks defined in a Python file."""
-    import importlib.util
+# Resolved hooks file path -> (mtime_ns, executed module)
+_hook_modules: dict[Path, tuple[int, ModuleType]] = {}
+
 
-    spec = importlib.util.spec_from_file_location("hooks_module", file_path)
+def _load_hooks_module(file_path: Path) -> ModuleType:
+    """Execute a hooks file, reusing the module while the file is unchanged."""
+    path = file_path.resolve()
+    mtime = path.stat().st_mtime_ns
+    cached = _hook_modules.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    spec = importlib.util.spec_from_file_location("hooks_module", path)
     if spec is None or spec.loader is None:
         raise ImportError(f"Could not load hooks from {file_path}")
 
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
+    _hook_modules[path] = (mtime, module)
+    return module
+
 
-    registered = []
-    for name in dir(module):
-        obj = getattr(module, name)
-        if callable(obj) and hasattr(obj, "_hook_config"):
-            config = obj._hook_config
-            hook = manager.register(
-                event=config["event"],
-                handler=obj,
-                phase=config["phase"],
-                name=config["name"],
-                priority=config["priority"],
-            )
-            registered.append(hook)
-            logger.info(f"Loaded hook from file: {hook.name}")
+def load_hooks_from_file(file_path: Path, manager: HookManager) -> list[Hook]:
+    """Load hooks defined in a Python file.
 
+    The file is executed once per modification; later loads reuse its module.
+    """
+    registered = _register_hooks_from_module(_load_hooks_module(file_path), manager)
+    logger.info(f"Loaded {len(registered)} hooks from {file_path}")
     return registered
+
+
+def _register_hooks_from_module(module: ModuleType, manager: HookManager) -> list[Hook]:
+    """Register every @hook-decorated callable defined in a module."""
+    specs = []
+    for obj in vars(module).values():
+        config = getattr(obj, "_hook_config", None)
+        if config is None or not callable(obj):
+            continue
+        specs.append({**config, "handler": obj})
+
+    return manager.register_many(specs)
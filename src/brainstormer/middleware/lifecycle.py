@@ -1,17 +1,87 @@
 """Lifecycle middleware integrating with DeepAgents."""
 
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, ClassVar
+
+import orjson
 
 from ..backends.memory import MemoryManager
 from ..backends.persistence import PersistenceManager
 from ..utils.logging import get_logger
-from .hooks import HookManager
+from .hooks import HookManager, HookPhase, HookResult
 
 logger = get_logger(__name__)
 
-
-@dataclass
+# Output file names that mark a research phase as completed: (phase, plain
+# keywords, words that may be joined by at most one character), matched
+# case-insensitively
+_PHASE_KEYWORDS: tuple[tuple[str, tuple[str, ...], tuple[str, str] | None], ...] = (
+    ("phase1", ("phase1", "phase_1"), ("initial", "research")),
+    ("phase2", ("phase2", "phase_2"), ("deep", "dive")),
+    ("phase3", ("phase3", "phase_3"), ("critical", "review")),
+    ("phase4", ("phase4", "phase_4", "synthesis"), None),
+    ("final", (), ("final", "report")),
+)
+# Citations and confidence ratings, scanned together in one pass over content
+_CONTENT_MARKERS = re.compile(
+    r'(?P<url>(?-i:https?)://[^\s\)\]\"\'<>]+)'
+    r"|(?P<confidence>\b(?:high|medium|low)\s*confidence\b|\bconfidence[:\s]*(?:high|medium|low)\b)",
+    re.IGNORECASE,
+)
+
+# Characters split at a time when counting words, bounding the temporary list
+_WORD_COUNT_CHUNK = 1 << 16
+
+
+def _count_words(text: str) -> int:
+    """Count whitespace-separated words without splitting the whole text at once."""
+    count = 0
+    for start in range(0, len(text), _WORD_COUNT_CHUNK):
+        end = start + _WORD_COUNT_CHUNK
+        count += len(text[start:end].split())
+        # A word spanning the chunk boundary was counted on both sides
+        if end < len(text) and not text[end - 1].isspace() and not text[end].isspace():
+            count -= 1
+    return count
+
+
+def _joined(text: str, first: str, second: str) -> bool:
+    """Whether ``first`` is followed by ``second``, directly or after one character."""
+    start = text.find(first)
+    while start != -1:
+        end = start + len(first)
+        if text.startswith(second, end) or text.startswith(second, end + 1):
+            return True
+        start = text.find(first, start + 1)
+    return False
+
+
+def _phases_in(file_path: str) -> list[str]:
+    """Research phases a file path marks as completed, in phase order."""
+    lowered = file_path.lower()
+    return [
+        phase
+        for phase, keywords, words in _PHASE_KEYWORDS
+        if any(keyword in lowered for keyword in keywords)
+        or (words is not None and _joined(lowered, *words))
+    ]
+
+
+def _aborted(results: list[HookResult]) -> bool:
+    """Whether a hook chain was aborted; execution stops at the aborting hook."""
+    return bool(results) and results[-1].should_abort
+
+
+@dataclass(slots=True)
 class MiddlewareContext:
     """Context passed through middleware chain."""
 
@@ -20,14 +90,49 @@ class MiddlewareContext:
     persistence: PersistenceManager
     memory: MemoryManager | None = None
     metadata: dict[str, Any] | None = field(default=None)
+    # Output directory for the session, when the runtime has already created it
+    session_dir: Path | None = None
+    # Context handed to every hook in the session; read-only because it is shared
+    hook_context: Mapping[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.hook_context = MappingProxyType({"session_id": self.session_id})
+
+
+_active_context: ContextVar[MiddlewareContext] = ContextVar("middleware_context")
+
+
+@contextmanager
+def middleware_session(context: MiddlewareContext) -> Iterator[MiddlewareContext]:
+    """Make ``context`` the active session for shared middleware in this task."""
+    token = _active_context.set(context)
+    try:
+        yield context
+    finally:
+        _active_context.reset(token)
 
 
 class LifecycleMiddleware:
-    """Base class for lifecycle middleware."""
+    """Base class for lifecycle middleware.
+
+    Middleware built without a context is shared across sessions and uses
+    the context activated by ``middleware_session`` for the current task.
+    ``before`` returns the data the pre-hooks produced without copying it;
+    callers must treat it as shared with the hooks.
+    """
+
+    def __init__(self, context: MiddlewareContext | None = None):
+        self._context = context
+
+    @property
+    def context(self) -> MiddlewareContext:
+        """The bound context, or the active session's context."""
+        return self._context or _active_context.get()
 
-    def __init__(self, context: MiddlewareContext):
-        self.context = context
-        self.hook_manager = context.hook_manager
+    @property
+    def hook_manager(self) -> HookManager:
+        """Hook manager for the current context."""
+        return self.context.hook_manager
 
     async def before(self, data: Any) -> Any:
         """Called before the operation."""
@@ -43,32 +148,35 @@ class PlanCreationMiddleware(LifecycleMiddleware):
 
     async def before(self, plan_data: dict[str, Any]) -> dict[str, Any]:
         """Pre-process plan creation."""
+        if not self.hook_manager.has("plan_creation", HookPhase.PRE):
+            return plan_data
+
         data, results = await self.hook_manager.execute_pre(
             "plan_creation",
             plan_data,
-            {"session_id": self.context.session_id},
+            self.context.hook_context,
         )
 
-        # Check for abort
-        for result in results:
-            if result.should_abort:
-                raise RuntimeError("Plan creation aborted by hook")
+        if _aborted(results):
+            raise RuntimeError("Plan creation aborted by hook")
 
-        return dict(data) if data else plan_data
+        return data or plan_data
 
     async def after(self, plan_data: dict, plan_content: str) -> str:
         """Post-process plan creation."""
-        # Store plan in persistence
-        plan_path = self.context.persistence.write_plan(
-            self.context.session_id, plan_content
+        # Store plan in persistence; file and SQLite writes run off the event loop
+        plan_path = await asyncio.to_thread(
+            self.context.persistence.write_plan, self.context.session_id, plan_content
         )
 
         # Execute post hooks
-        result, _ = await self.hook_manager.execute_post(
-            "plan_creation",
-            {"plan": plan_content, "path": str(plan_path)},
-            {"session_id": self.context.session_id},
-        )
+        result = None
+        if self.hook_manager.has("plan_creation", HookPhase.POST):
+            result, _ = await self.hook_manager.execute_post(
+                "plan_creation",
+                {"plan": plan_content, "path": str(plan_path)},
+                self.context.hook_context,
+            )
 
         # Store in long-term memory if available
         if self.context.memory:
@@ -78,7 +186,7 @@ class PlanCreationMiddleware(LifecycleMiddleware):
                 source="plan_creation",
             )
 
-        logger.info(f"Plan created and saved to {plan_path}")
+        logger.info("Plan created and saved to %s", plan_path)
         return result.get("plan", plan_content) if isinstance(result, dict) else plan_content
 
 
@@ -87,22 +195,40 @@ class AgentSpawnMiddleware(LifecycleMiddleware):
 
     async def before(self, agent_config: dict[str, Any]) -> dict[str, Any]:
         """Pre-process agent spawn."""
+        if not self.hook_manager.has("agent_spawn", HookPhase.PRE):
+            return agent_config
+
         data, results = await self.hook_manager.execute_pre(
             "agent_spawn",
             agent_config,
-            {"session_id": self.context.session_id},
+            self.context.hook_context,
         )
 
-        for result in results:
-            if result.should_abort:
-                raise RuntimeError(f"Agent spawn aborted by hook: {agent_config.get('name')}")
+        if _aborted(results):
+            raise RuntimeError(f"Agent spawn aborted by hook: {agent_config.get('name')}")
+
+        return data or agent_config
+
+    async def before_batch(self, agent_configs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Pre-process several agent spawns with one hook dispatch."""
+        if not self.hook_manager.has("agent_spawn", HookPhase.PRE):
+            return agent_configs
 
-        return dict(data) if data else agent_config
+        outcomes = await self.hook_manager.execute_many(
+            "agent_spawn", HookPhase.PRE, agent_configs, self.context.hook_context
+        )
+        configs = []
+        for agent_config, (data, results) in zip(agent_configs, outcomes, strict=True):
+            if _aborted(results):
+                raise RuntimeError(f"Agent spawn aborted by hook: {agent_config.get('name')}")
+            configs.append(data or agent_config)
+        return configs
 
     async def after(self, agent_config: dict, agent_id: str) -> str:
         """Post-process agent spawn."""
         # Record agent in persistence
-        self.context.persistence.store.create_agent_state(
+        await asyncio.to_thread(
+            self.context.persistence.store.create_agent_state,
             agent_id=agent_id,
             session_id=self.context.session_id,
             agent_name=agent_config.get("name", "unnamed"),
@@ -110,13 +236,14 @@ class AgentSpawnMiddleware(LifecycleMiddleware):
             state_data=agent_config,
         )
 
-        await self.hook_manager.execute_post(
-            "agent_spawn",
-            {"agent_id": agent_id, "config": agent_config},
-            {"session_id": self.context.session_id},
-        )
+        if self.hook_manager.has("agent_spawn", HookPhase.POST):
+            await self.hook_manager.execute_post(
+                "agent_spawn",
+                {"agent_id": agent_id, "config": agent_config},
+                self.context.hook_context,
+            )
 
-        logger.info(f"Agent spawned: {agent_config.get('name')} ({agent_id})")
+        logger.info("Agent spawned: %s (%s)", agent_config.get("name"), agent_id)
         return agent_id
 
 
@@ -125,12 +252,15 @@ class ResearchWriteMiddleware(LifecycleMiddleware):
 
     async def before(self, write_data: dict[str, Any]) -> dict[str, Any]:
         """Pre-process research write."""
+        if not self.hook_manager.has("research_write", HookPhase.PRE):
+            return write_data
+
         data, _ = await self.hook_manager.execute_pre(
             "research_write",
             write_data,
-            {"session_id": self.context.session_id},
+            self.context.hook_context,
         )
-        return dict(data) if data else write_data
+        return data or write_data
 
     async def after(self, write_data: dict, file_path: str) -> str:
         """Post-process research write."""
@@ -144,13 +274,14 @@ class ResearchWriteMiddleware(LifecycleMiddleware):
                 tags=write_data.get("tags", []),
             )
 
-        await self.hook_manager.execute_post(
-            "research_write",
-            {"path": file_path, "data": write_data},
-            {"session_id": self.context.session_id},
-        )
+        if self.hook_manager.has("research_write", HookPhase.POST):
+            await self.hook_manager.execute_post(
+                "research_write",
+                {"path": file_path, "data": write_data},
+                self.context.hook_context,
+            )
 
-        logger.debug(f"Research written to {file_path}")
+        logger.debug("Research written to %s", file_path)
         return file_path
 
 
@@ -159,20 +290,25 @@ class SearchMiddleware(LifecycleMiddleware):
 
     async def before(self, search_query: dict[str, Any]) -> dict[str, Any]:
         """Pre-process search query."""
+        if not self.hook_manager.has("search", HookPhase.PRE):
+            return search_query
+
         data, _ = await self.hook_manager.execute_pre(
             "search",
             search_query,
-            {"session_id": self.context.session_id},
+            self.context.hook_context,
         )
-        return dict(data) if data else search_query
+        return data or search_query
 
     async def after(self, search_query: dict, results: list) -> list:
         """Post-process search results."""
-        result, _ = await self.hook_manager.execute_post(
-            "search",
-            {"query": search_query, "results": results},
-            {"session_id": self.context.session_id},
-        )
+        result = None
+        if self.hook_manager.has("search", HookPhase.POST):
+            result, _ = await self.hook_manager.execute_post(
+                "search",
+                {"query": search_query, "results": results},
+                self.context.hook_context,
+            )
 
         # Cache search results in memory
         if self.context.memory and results:
@@ -191,52 +327,60 @@ class AgentCompletionMiddleware(LifecycleMiddleware):
 
     async def before(self, completion_data: dict[str, Any]) -> dict[str, Any]:
         """Pre-process completion."""
+        if not self.hook_manager.has("completion", HookPhase.PRE):
+            return completion_data
+
         data, _ = await self.hook_manager.execute_pre(
             "completion",
             completion_data,
-            {"session_id": self.context.session_id},
+            self.context.hook_context,
         )
-        return dict(data) if data else completion_data
+        return data or completion_data
 
     async def after(self, completion_data: dict, result: Any) -> Any:
         """Post-process completion."""
         # Update agent state
         agent_id = completion_data.get("agent_id")
         if agent_id:
-            self.context.persistence.store.update_agent_state(
+            await asyncio.to_thread(
+                self.context.persistence.store.update_agent_state,
                 agent_id,
                 status="completed",
                 result_path=completion_data.get("result_path"),
             )
 
-        await self.hook_manager.execute_post(
-            "completion",
-            {"completion_data": completion_data, "result": result},
-            {"session_id": self.context.session_id},
-        )
+        if self.hook_manager.has("completion", HookPhase.POST):
+            await self.hook_manager.execute_post(
+                "completion",
+                {"completion_data": completion_data, "result": result},
+                self.context.hook_context,
+            )
 
-        logger.info(f"Agent completed: {completion_data.get('agent_name', 'unknown')}")
+        logger.info("Agent completed: %s", completion_data.get("agent_name", "unknown"))
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class QualityMetrics:
     """Tracks quality metrics for a research session."""
 
     search_count: int = 0
     citation_count: int = 0
-    phases_completed: list[str] = field(default_factory=list)
+    # Used as an insertion-ordered set: O(1) membership, completion order kept
+    phases_completed: dict[str, None] = field(default_factory=dict)
     confidence_ratings_found: int = 0
     word_count: int = 0
     sources_cited: set[str] = field(default_factory=set)
     issues: list[str] = field(default_factory=list)
+    # Serialises updates from agents of the same session running on other threads
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
             "search_count": self.search_count,
             "citation_count": self.citation_count,
-            "phases_completed": self.phases_completed,
+            "phases_completed": list(self.phases_completed),
             "confidence_ratings_found": self.confidence_ratings_found,
             "word_count": self.word_count,
             "sources_cited": list(self.sources_cited),
@@ -244,7 +388,7 @@ class QualityMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class QualityThresholds:
     """Configurable quality thresholds for research."""
 
@@ -264,96 +408,120 @@ class QualityGateMiddleware(LifecycleMiddleware):
     that quality thresholds are met before allowing phase transitions.
     """
 
-    # Class-level storage for session metrics
-    _session_metrics: dict[str, QualityMetrics] = {}
+    # Class-level storage for session metrics, least recently used first.
+    # Bounded so sessions that fail before their report is written don't
+    # accumulate in long-running processes.
+    _session_metrics: ClassVar[OrderedDict[str, QualityMetrics]] = OrderedDict()
+    _metrics_lock: ClassVar[threading.Lock] = threading.Lock()
+    max_tracked_sessions: ClassVar[int] = 1024
 
     def __init__(
         self,
-        context: MiddlewareContext,
+        context: MiddlewareContext | None = None,
         thresholds: QualityThresholds | None = None,
     ):
         super().__init__(context)
         self.thresholds = thresholds or QualityThresholds()
 
-        # Initialize metrics for this session
-        if context.session_id not in self._session_metrics:
-            self._session_metrics[context.session_id] = QualityMetrics()
-
     @property
     def metrics(self) -> QualityMetrics:
         """Get metrics for current session."""
-        return self._session_metrics[self.context.session_id]
+        session_id = self.context.session_id
+        with self._metrics_lock:
+            metrics = self._session_metrics.get(session_id)
+            if metrics is None:
+                metrics = self._session_metrics[session_id] = QualityMetrics()
+                if len(self._session_metrics) > self.max_tracked_sessions:
+                    self._session_metrics.popitem(last=False)
+            else:
+                self._session_metrics.move_to_end(session_id)
+            return metrics
+
+    def clear_metrics(self) -> None:
+        """Drop the current session's metrics once its report is written."""
+        with self._metrics_lock:
+            self._session_metrics.pop(self.context.session_id, None)
 
     def record_search(self, query: str) -> None:
         """Record a search was performed."""
-        self.metrics.search_count += 1
-        logger.debug(f"Quality: Search #{self.metrics.search_count}: {query[:50]}...")
+        metrics = self.metrics
+        with metrics.lock:
+            metrics.search_count += 1
+            search_number = metrics.search_count
+        logger.debug("Quality: Search #%d: %.50s...", search_number, query)
 
     def record_write(self, content: str, file_path: str) -> None:
         """Analyze written content for quality metrics."""
-        import re
-
-        # Count words
-        self.metrics.word_count += len(content.split())
-
-        # Detect phase completion
-        phase_patterns = [
-            ("phase1", r"phase1|phase_1|initial.?research"),
-            ("phase2", r"phase2|phase_2|deep.?dive"),
-            ("phase3", r"phase3|phase_3|critical.?review"),
-            ("phase4", r"phase4|phase_4|synthesis"),
-            ("final", r"final.?report|FINAL_REPORT"),
-        ]
-        for phase_name, pattern in phase_patterns:
-            if re.search(pattern, file_path, re.IGNORECASE):
-                if phase_name not in self.metrics.phases_completed:
-                    self.metrics.phases_completed.append(phase_name)
-                    logger.info(f"Quality: Phase '{phase_name}' completed")
-
-        # Count citations (URLs, references)
-        url_pattern = r'https?://[^\s\)\]\"\'<>]+'
-        urls = re.findall(url_pattern, content)
-        self.metrics.citation_count += len(urls)
-        self.metrics.sources_cited.update(urls)
-
-        # Check for confidence ratings
-        confidence_pattern = r'\b(high|medium|low)\s*confidence\b|\bconfidence[:\s]*(high|medium|low)\b'
-        confidence_matches = re.findall(confidence_pattern, content, re.IGNORECASE)
-        self.metrics.confidence_ratings_found += len(confidence_matches)
+        metrics = self.metrics
+
+        # Scan the content before taking the lock; only the updates are serialised
+        word_count = _count_words(content)
+        urls = []
+        confidence_ratings = 0
+        for match in _CONTENT_MARKERS.finditer(content):
+            if match.lastgroup == "url":
+                urls.append(match.group())
+            else:
+                confidence_ratings += 1
+
+        with metrics.lock:
+            metrics.word_count += word_count
+            metrics.citation_count += len(urls)
+            metrics.confidence_ratings_found += confidence_ratings
+            metrics.sources_cited.update(urls)
+
+            # Detect phase completion, unless every phase is already recorded
+            phases = (
+                _phases_in(file_path)
+                if len(metrics.phases_completed) < len(_PHASE_KEYWORDS)
+                else ()
+            )
+            new_phases = [phase for phase in phases if phase not in metrics.phases_completed]
+            metrics.phases_completed.update(dict.fromkeys(new_phases))
+
+        for phase_name in new_phases:
+            logger.info("Quality: Phase '%s' completed", phase_name)
+        # Phase boundaries are natural batch points for memory writes
+        if new_phases and self.context.memory:
+            self.context.memory.flush_soon()
 
     def validate_phase_transition(self, from_phase: str, to_phase: str) -> tuple[bool, list[str]]:
         """Validate if transition between phases meets quality standards."""
+        metrics = self.metrics
+        thresholds = self.thresholds
         issues = []
 
         if from_phase == "phase1":
-            if self.metrics.search_count < self.thresholds.min_searches_phase1:
+            if metrics.search_count < thresholds.min_searches_phase1:
                 issues.append(
-                    f"Phase 1 requires at least {self.thresholds.min_searches_phase1} searches, "
-                    f"found {self.metrics.search_count}"
+                    f"Phase 1 requires at least {thresholds.min_searches_phase1} searches, "
+                    f"found {metrics.search_count}"
                 )
 
         if to_phase == "final":
-            if self.metrics.search_count < self.thresholds.min_searches_total:
+            if metrics.search_count < thresholds.min_searches_total:
                 issues.append(
-                    f"Research requires at least {self.thresholds.min_searches_total} total searches, "
-                    f"found {self.metrics.search_count}"
+                    f"Research requires at least {thresholds.min_searches_total} total searches, "
+                    f"found {metrics.search_count}"
                 )
-            if self.thresholds.require_confidence_ratings and self.metrics.confidence_ratings_found == 0:
+            if thresholds.require_confidence_ratings and metrics.confidence_ratings_found == 0:
                 issues.append("Final report should include confidence ratings for conclusions")
 
-        self.metrics.issues.extend(issues)
+        with metrics.lock:
+            metrics.issues.extend(issues)
         return len(issues) == 0, issues
 
     def get_quality_report(self) -> dict[str, Any]:
         """Generate a quality assessment report."""
         metrics = self.metrics
+        thresholds = self.thresholds
 
         # Calculate quality score (0-100)
         score = 0
         max_score = 100
 
         # Search coverage (30 points)
-        search_ratio = min(metrics.search_count / self.thresholds.min_searches_total, 1.0)
+        search_ratio = min(metrics.search_count / thresholds.min_searches_total, 1.0)
         score += int(search_ratio * 30)
 
         # Citation density (25 points)
@@ -363,8 +531,8 @@ class QualityGateMiddleware(LifecycleMiddleware):
             score += int(citation_score * 25)
 
         # Phase completion (25 points)
-        expected_phases = ["phase1", "phase2", "phase3", "phase4", "final"]
-        phase_ratio = len([p for p in expected_phases if p in metrics.phases_completed]) / len(expected_phases)
+        expected_phases = {"phase1", "phase2", "phase3", "phase4", "final"}
+        phase_ratio = len(metrics.phases_completed.keys() & expected_phases) / len(expected_phases)
         score += int(phase_ratio * 25)
 
         # Confidence ratings (10 points)
@@ -397,20 +565,20 @@ class QualityGateMiddleware(LifecycleMiddleware):
             "grade": grade,
             "metrics": metrics.to_dict(),
             "thresholds": {
-                "min_searches_total": self.thresholds.min_searches_total,
-                "min_citations_per_phase": self.thresholds.min_citations_per_phase,
+                "min_searches_total": thresholds.min_searches_total,
+                "min_citations_per_phase": thresholds.min_citations_per_phase,
             },
-            "recommendations": self._get_recommendations(),
+            "recommendations": self._get_recommendations(metrics),
         }
 
-    def _get_recommendations(self) -> list[str]:
+    def _get_recommendations(self, metrics: QualityMetrics) -> list[str]:
         """Generate recommendations for improving research quality."""
         recommendations = []
-        metrics = self.metrics
+        min_searches = self.thresholds.min_searches_total
 
-        if metrics.search_count < self.thresholds.min_searches_total:
+        if metrics.search_count < min_searches:
             recommendations.append(
-                f"Conduct more web searches ({self.thresholds.min_searches_total - metrics.search_count} more needed)"
+                f"Conduct more web searches ({min_searches - metrics.search_count} more needed)"
             )
 
         if metrics.citation_count < 10:
@@ -451,14 +619,17 @@ class QualityGateMiddleware(LifecycleMiddleware):
         # On session end, generate quality report
         if event_type == "session_end":
             report = self.get_quality_report()
-            logger.info(f"Quality Report - Score: {report['score']}/100 (Grade: {report['grade']})")
+            logger.info("Quality Report - Score: %d/100 (Grade: %s)", report["score"], report["grade"])
 
             # Store report in persistence
             if self.context.persistence:
-                session_dir = self.context.persistence.get_session_dir(self.context.session_id)
+                session_dir = self.context.session_dir or self.context.persistence.get_session_dir(
+                    self.context.session_id
+                )
                 report_path = session_dir / "QUALITY_REPORT.json"
-                import json
-                report_path.write_text(json.dumps(report, indent=2))
-                logger.info(f"Quality report saved to {report_path}")
+                report_data = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+                await asyncio.to_thread(report_path.write_bytes, report_data)
+                logger.info("Quality report saved to %s", report_path)
+            self.clear_metrics()
 
         return result
@@ -1,8 +1,13 @@
 """Skills loader following Anthropic's skills format."""
 
+import os
 import re
+import sqlite3
+import sys
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 import yaml
 
@@ -10,20 +15,66 @@ from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# libyaml's C parser when PyYAML was built with it; same safe subset, much faster
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass
+
+@dataclass(slots=True)
 class Skill:
-    """A loaded skill with instructions and metadata."""
+    """A loaded skill with instructions and metadata.
+
+    Skills loaded from disk read their instructions from ``source`` on first
+    access, so listing and matching skills only reads the frontmatter. The
+    body is found at ``body_offset`` while the file still matches ``stamp``;
+    a file edited since loading has its frontmatter split again instead.
+    """
 
     name: str
     description: str
-    instructions: str
+    instructions: str = field(repr=False)
     path: Path
-    metadata: dict = field(default_factory=dict)
+    metadata: dict = field(default_factory=dict, repr=False)
+    source: Path | None = field(default=None, kw_only=True, repr=False, compare=False)
+    body_offset: int = field(default=0, kw_only=True, repr=False, compare=False)
+    stamp: tuple[int, int, int] | None = field(
+        default=None, kw_only=True, repr=False, compare=False
+    )
+    _system_prompt: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Interned: the name is the registry key and compared on every lookup
+        self.name = sys.intern(self.name)
+        if self.source is not None:
+            # Left unset so the first access goes through __getattr__
+            del self.instructions
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for unset slots, i.e. instructions not yet read
+        if name != "instructions" or self.source is None:
+            raise AttributeError(name)
+        self.instructions = self._read_instructions(self.source)
+        return self.instructions
+
+    def _read_instructions(self, source: Path) -> str:
+        """Read the body from the source file, re-splitting it if it changed."""
+        try:
+            stat = source.stat()
+            with source.open(encoding="utf-8") as f:
+                if (stat.st_mtime_ns, stat.st_size, stat.st_ino) == self.stamp:
+                    f.read(self.body_offset)
+                    return f.read().strip()
+                content = f.read()
+        except FileNotFoundError:
+            logger.warning(f"Skill file not found: {source}")
+            return ""
+        split = _split_frontmatter(content)
+        return content[split[1] :].strip() if split else content.strip()
 
-    def to_system_prompt(self) -> str:
-        """Convert skill to system prompt format."""
-        return f"""## Skill: {self.name}
+    @property
+    def system_prompt(self) -> str:
+        """The skill in system prompt format, rendered on first access."""
+        if self._system_prompt is None:
+            self._system_prompt = f"""## Skill: {self.name}
 
 {self.description}
 
@@ -31,13 +82,63 @@ class Skill:
 
 {self.instructions}
 """
+        return self._system_prompt
+
+    def to_system_prompt(self) -> str:
+        """Convert skill to system prompt format."""
+        return self.system_prompt
+
+
+# Words indexed from skill names and descriptions
+_WORD_PATTERN = re.compile(r"\w+")
+
+# BM25-ranked skill search; names weigh twice as much as descriptions
+_SQL_RANK_SKILLS = (
+    "SELECT name FROM skills_fts WHERE skills_fts MATCH ? "
+    "ORDER BY bm25(skills_fts, 10.0, 5.0) LIMIT ?"
+)
+
+
+def _split_frontmatter(text: str) -> tuple[str, int] | None:
+    """(frontmatter, body offset) of text opening with a ``---`` delimited block.
+
+    Delimiter lines are ``---`` plus optional trailing whitespace, and the
+    closing one must end in a newline.
+    """
+    if not text.startswith("---"):
+        return None
+    opening_end = text.find("\n", 3)
+    if opening_end == -1 or text[3:opening_end].strip():
+        return None
+    # The closing line starts after the opening line's own newline
+    search_from = opening_end + 1
+    while True:
+        end = text.find("\n---", search_from)
+        if end == -1:
+            return None
+        line_end = text.find("\n", end + 4)
+        if line_end == -1:
+            return None
+        if not text[end + 4 : line_end].strip():
+            return text[opening_end + 1 : end], line_end + 1
+        search_from = end + 1
+
+
+# Characters read at first when looking for a skill file's frontmatter
+_FRONTMATTER_READ_SIZE = 4096
+
+# Absolute skill file path -> ((mtime_ns, size, inode), parsed skill or None),
+# least recently used first
+_parsed_skills: OrderedDict[Path, tuple[tuple[int, int, int], Skill | None]] = OrderedDict()
+
+# Skill files whose parses are kept across reloads
+_PARSED_SKILLS_CACHE_SIZE = 256
 
 
 class SkillLoader:
     """Loads skills from SKILL.md files following Anthropic's format."""
 
     SKILL_FILENAME = "SKILL.md"
-    FRONTMATTER_PATTERN = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
 
     def __init__(self, skills_dir: Path):
         self.skills_dir = skills_dir
@@ -45,21 +146,58 @@ class SkillLoader:
     def load_skill(self, skill_path: Path) -> Skill | None:
         """Load a single skill from a directory or SKILL.md file."""
         skill_file = skill_path / self.SKILL_FILENAME if skill_path.is_dir() else skill_path
-
-        if not skill_file.exists():
-            logger.warning(f"Skill file not found: {skill_file}")
-            return None
-
-        content = skill_file.read_text(encoding="utf-8")
-
+        return self._load_skill_file(skill_file)
+
+    def _load_skill_file(
+        self, skill_file: Path, stat: os.stat_result | None = None
+    ) -> Skill | None:
+        """Load a skill file, reusing the parse while the file is unchanged."""
+        key = skill_file.absolute()
+        if stat is None:
+            try:
+                stat = skill_file.stat()
+            except FileNotFoundError:
+                _parsed_skills.pop(key, None)
+                logger.warning(f"Skill file not found: {skill_file}")
+                return None
+
+        # The inode catches files replaced atomically with the same mtime and size
+        stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached = _parsed_skills.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, self._parse_skill(skill_file, stamp))
+            _parsed_skills[key] = cached
+            if len(_parsed_skills) > _PARSED_SKILLS_CACHE_SIZE:
+                _parsed_skills.popitem(last=False)
+        _parsed_skills.move_to_end(key)
+        return cached[1]
+
+    def _read_frontmatter(self, skill_file: Path) -> tuple[str, int] | None:
+        """Find the frontmatter, reading only as much of the file as it needs."""
+        with skill_file.open(encoding="utf-8") as f:
+            head = f.read(_FRONTMATTER_READ_SIZE)
+            if not head.startswith("---"):
+                return None
+            while True:
+                split = _split_frontmatter(head)
+                if split:
+                    return split
+                more = f.read(len(head))
+                if not more:
+                    return None
+                head += more
+
+    def _parse_skill(self, skill_file: Path, stamp: tuple[int, int, int]) -> Skill | None:
+        """Parse a skill file's frontmatter; instructions are read on demand."""
         # Parse YAML frontmatter
-        frontmatter_match = self.FRONTMATTER_PATTERN.match(content)
-        if not frontmatter_match:
+        split = self._read_frontmatter(skill_file)
+        if not split:
             logger.warning(f"No frontmatter found in {skill_file}")
             return None
 
+        frontmatter_text, body_offset = split
         try:
-            frontmatter = yaml.safe_load(frontmatter_match.group(1))
+            frontmatter = yaml.load(frontmatter_text, Loader=_YamlLoader)
         except yaml.YAMLError as e:
             logger.error(f"Invalid YAML frontmatter in {skill_file}: {e}")
             return None
@@ -75,18 +213,18 @@ class SkillLoader:
             logger.error(f"Missing required fields (name, description) in {skill_file}")
             return None
 
-        # Extract instructions (content after frontmatter)
-        instructions = content[frontmatter_match.end():].strip()
-
         # Extract additional metadata
         metadata = {k: v for k, v in frontmatter.items() if k not in {"name", "description"}}
 
         skill = Skill(
             name=name,
             description=description,
-            instructions=instructions,
+            instructions="",
             path=skill_file.parent if skill_file.name == self.SKILL_FILENAME else skill_file,
             metadata=metadata,
+            source=skill_file,
+            body_offset=body_offset,
+            stamp=stamp,
         )
 
         logger.info(f"Loaded skill: {name}")
@@ -95,26 +233,32 @@ class SkillLoader:
     def load_all(self) -> list[Skill]:
         """Load all skills from the skills directory."""
         skills: list[Skill] = []
+        # Standalone .md files with frontmatter are skills too, loaded after directories
+        file_skills: list[Skill] = []
 
-        if not self.skills_dir.exists():
+        try:
+            entries = os.scandir(self.skills_dir)
+        except FileNotFoundError:
             logger.info(f"Skills directory does not exist: {self.skills_dir}")
             return skills
 
-        # Look for SKILL.md in subdirectories
-        for skill_dir in self.skills_dir.iterdir():
-            if skill_dir.is_dir():
-                skill = self.load_skill(skill_dir)
-                if skill:
-                    skills.append(skill)
-
-        # Also check for SKILL.md files directly in skills_dir
-        for skill_file in self.skills_dir.glob("*.md"):
-            if skill_file.name != self.SKILL_FILENAME:
-                # Treat .md files with frontmatter as skills
-                skill = self.load_skill(skill_file)
-                if skill:
-                    skills.append(skill)
-
+        # One directory pass; entry types come from the listing without extra stats
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    skill = self._load_skill_file(Path(entry.path, self.SKILL_FILENAME))
+                    if skill:
+                        skills.append(skill)
+                elif (
+                    entry.name.endswith(".md")
+                    and entry.name != self.SKILL_FILENAME
+                    and entry.is_file()
+                ):
+                    skill = self._load_skill_file(Path(entry.path), entry.stat())
+                    if skill:
+                        file_skills.append(skill)
+
+        skills.extend(file_skills)
         logger.info(f"Loaded {len(skills)} skills from {self.skills_dir}")
         return skills
 
@@ -126,6 +270,12 @@ class SkillRegistry:
         self.skills_dir = skills_dir
         self._skills: dict[str, Skill] = {}
         self._loader: SkillLoader | None = None
+        # get_combined_prompt() for all skills, dropped whenever skills change
+        self._combined_prompt: str | None = None
+        # Lowercased (words, "name\ndescription") per skill name, for match_skills
+        self._match_terms: dict[str, tuple[frozenset[str], str]] = {}
+        # In-memory FTS5 index for rank_skills, built on first use after a change
+        self._fts: sqlite3.Connection | None = None
 
         if skills_dir:
             self._loader = SkillLoader(skills_dir)
@@ -135,8 +285,22 @@ class SkillRegistry:
         """Reload all skills from the skills directory."""
         if self._loader:
             self._skills.clear()
+            self._match_terms.clear()
+            self._combined_prompt = None
+            self._fts = None
             for skill in self._loader.load_all():
-                self._skills[skill.name] = skill
+                existing = self._skills.get(skill.name)
+                if existing is not None:
+                    logger.warning(
+                        f"Duplicate skill name {skill.name!r}: {skill.path} replaces {existing.path}"
+                    )
+                self._add(skill)
+
+    def _add(self, skill: Skill) -> None:
+        """Store a skill and index its name and description for matching."""
+        self._skills[skill.name] = skill
+        text = f"{skill.name}\n{skill.description}".lower()
+        self._match_terms[skill.name] = (frozenset(_WORD_PATTERN.findall(text)), text)
 
     def get(self, name: str) -> Skill | None:
         """Get a skill by name."""
@@ -148,44 +312,74 @@ class SkillRegistry:
 
     def register(self, skill: Skill) -> None:
         """Register a skill manually."""
-        self._skills[skill.name] = skill
+        self._add(skill)
+        self._combined_prompt = None
+        self._fts = None
         logger.info(f"Registered skill: {skill.name}")
 
     def unregister(self, name: str) -> bool:
         """Unregister a skill by name."""
         if name in self._skills:
             del self._skills[name]
+            del self._match_terms[name]
+            self._combined_prompt = None
+            self._fts = None
             return True
         return False
 
     def get_combined_prompt(self, skill_names: list[str] | None = None) -> str:
         """Get combined system prompt for selected skills."""
         if skill_names:
-            skills = [self._skills[name] for name in skill_names if name in self._skills]
-        else:
-            skills = list(self._skills.values())
-
-        if not skills:
-            return ""
-
-        prompts = [skill.to_system_prompt() for skill in skills]
-        return "\n\n---\n\n".join(prompts)
+            skills = [
+                skill
+                for skill in (self._skills.get(name) for name in skill_names)
+                if skill is not None
+            ]
+            return "\n\n---\n\n".join(skill.system_prompt for skill in skills)
+
+        if self._combined_prompt is None:
+            self._combined_prompt = "\n\n---\n\n".join(
+                skill.system_prompt for skill in self._skills.values()
+            )
+        return self._combined_prompt
 
     def match_skills(self, query: str) -> list[Skill]:
         """Find skills relevant to a query based on description."""
-        query_lower = query.lower()
+        query_words = query.lower().split()
         matches = []
 
-        for skill in self._skills.values():
-            # Simple keyword matching
-            if any(
-                word in skill.description.lower() or word in skill.name.lower()
-                for word in query_lower.split()
-            ):
+        for name, skill in self._skills.items():
+            words, text = self._match_terms[name]
+            # Whole words hit the index; other fragments fall back to substring search
+            if any(word in words or word in text for word in query_words):
                 matches.append(skill)
 
         return matches
 
+    def rank_skills(self, query: str, limit: int = 5) -> list[Skill]:
+        """Find skills for a query ranked by BM25, matching word prefixes."""
+        terms = _WORD_PATTERN.findall(query)
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"*' for term in terms)
+        rows = self._fts_index().execute(_SQL_RANK_SKILLS, (match, limit)).fetchall()
+        return [self._skills[name] for (name,) in rows]
+
+    def _fts_index(self) -> sqlite3.Connection:
+        """The FTS5 index over skill names and descriptions, rebuilt after changes."""
+        if self._fts is None:
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.execute(
+                "CREATE VIRTUAL TABLE skills_fts USING fts5("
+                "name, description, tokenize='porter unicode61')"
+            )
+            conn.executemany(
+                "INSERT INTO skills_fts (name, description) VALUES (?, ?)",
+                [(skill.name, skill.description) for skill in self._skills.values()],
+            )
+            self._fts = conn
+        return self._fts
+
 
 def create_skill_directory(base_dir: Path) -> Path:
     """Create the skills directory structure."""
@@ -198,7 +392,8 @@ def create_skill_directory(base_dir: Path) -> Path:
 
     sample_skill = sample_skill_dir / "SKILL.md"
     if not sample_skill.exists():
-        sample_skill.write_text("""---
+        sample_skill.write_text(
+            """---
 name: research-assistant
 description: Expert at conducting thorough research and synthesizing findings into clear reports
 ---
@@ -231,7 +426,9 @@ Structure your research outputs as:
 3. **Detailed Findings** - Organized by topic/theme
 4. **Sources** - All references used
 5. **Recommendations** - Actionable next steps
-""", encoding="utf-8")
+""",
+            encoding="utf-8",
+        )
 
     logger.info(f"Created skills directory at {skills_dir}")
     return skills_dir
@@ -1,6 +1,15 @@
 """Utility modules for Brainstormer."""
 
-from .file_parser import parse_file, parse_pdf, parse_text
+from .file_parser import parse_file, parse_pdf, parse_pdf_stream, parse_text
 from .logging import get_logger, setup_logging
+from .rate_limit import AsyncRateLimiter
 
-__all__ = ["get_logger", "parse_file", "parse_pdf", "parse_text", "setup_logging"]
+__all__ = [
+    "AsyncRateLimiter",
+    "get_logger",
+    "parse_file",
+    "parse_pdf",
+    "parse_pdf_stream",
+    "parse_text",
+    "setup_logging",
+]
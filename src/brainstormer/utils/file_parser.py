@@ -1,45 +1,84 @@
 """File parsing utilities for text and PDF files."""
 
+import io
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from pypdf import PdfReader
-
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# (absolute path, mtime_ns, size) -> parse_file result, least recently used first
+_PARSE_CACHE_SIZE = 128
+_parsed_files: OrderedDict[tuple[str, int, int], dict] = OrderedDict()
+_parsed_lock = threading.Lock()
+
 
 def parse_text(file_path: Path) -> str:
     """Parse a text file and return its contents."""
+    # Read once so the fallback decode doesn't read the file again
+    data = file_path.read_bytes()
     try:
-        return file_path.read_text(encoding="utf-8")
+        text = data.decode("utf-8")
     except UnicodeDecodeError:
         # Try with latin-1 as fallback
-        return file_path.read_text(encoding="latin-1")
+        text = data.decode("latin-1")
+    # Normalise line endings as text-mode reads do
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
-def parse_pdf(file_path: Path) -> str:
-    """Parse a PDF file and extract text content."""
-    reader = PdfReader(file_path)
-    text_parts = []
+def parse_pdf_stream(file_path: Path) -> Iterator[str]:
+    """Yield the text of each non-empty PDF page, headed by its page number."""
+    # pypdf is slow to import and only needed when a PDF is given
+    from pypdf import PdfReader
 
+    reader = PdfReader(file_path)
     for i, page in enumerate(reader.pages):
+        # Blank pages have no content stream; skip the layout pass for them
+        if page.get_contents() is None:
+            continue
         text = page.extract_text()
         if text:
-            text_parts.append(f"--- Page {i + 1} ---\n{text}")
+            yield f"--- Page {i + 1} ---\n{text}"
 
-    return "\n\n".join(text_parts)
+
+def parse_pdf(file_path: Path) -> str:
+    """Parse a PDF file and extract text content."""
+    # Pages are written out as they are extracted rather than all held in a list
+    buffer = io.StringIO()
+    for i, page_text in enumerate(parse_pdf_stream(file_path)):
+        if i:
+            buffer.write("\n\n")
+        buffer.write(page_text)
+    return buffer.getvalue()
 
 
 def parse_file(file_path: Path) -> dict:
     """
     Parse a file and return its contents with metadata.
 
+    Results are cached per path until the file's mtime or size changes.
+
     Returns:
         dict with keys: 'path', 'name', 'type', 'content', 'size'
     """
-    if not file_path.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}") from None
+
+    path = str(file_path.absolute())
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _parsed_lock:
+        cached = _parsed_files.get(key)
+        if cached is not None:
+            _parsed_files.move_to_end(key)
+            return dict(cached)
 
     suffix = file_path.suffix.lower()
 
@@ -58,21 +97,38 @@ def parse_file(file_path: Path) -> dict:
             logger.warning(f"Could not parse {file_path}: {e}")
             raise ValueError(f"Unsupported file type: {suffix}") from e
 
-    return {
-        "path": str(file_path.absolute()),
+    result = {
+        "path": path,
         "name": file_path.name,
         "type": file_type,
         "content": content,
-        "size": file_path.stat().st_size,
+        "size": stat.st_size,
     }
+    with _parsed_lock:
+        _parsed_files[key] = result
+        while len(_parsed_files) > _PARSE_CACHE_SIZE:
+            _parsed_files.popitem(last=False)
+    return dict(result)
+
+
+def _parse_or_none(file_path: Path) -> dict | None:
+    """Parse a file, logging and returning None on failure."""
+    try:
+        return parse_file(file_path)
+    except Exception as e:
+        logger.error(f"Failed to parse {file_path}: {e}")
+        return None
 
 
 def parse_files(file_paths: list[Path]) -> list[dict]:
-    """Parse multiple files and return their contents."""
-    results = []
-    for path in file_paths:
-        try:
-            results.append(parse_file(path))
-        except Exception as e:
-            logger.error(f"Failed to parse {path}: {e}")
-    return results
+    """Parse multiple files and return their contents, in the order given.
+
+    Several files are read and parsed on a small thread pool so file I/O
+    overlaps with PDF text extraction.
+    """
+    if len(file_paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(file_paths))) as pool:
+            parsed = list(pool.map(_parse_or_none, file_paths))
+    else:
+        parsed = [_parse_or_none(path) for path in file_paths]
+    return [result for result in parsed if result is not None]
@@ -0,0 +1,35 @@
+"""Async rate limiting for outbound API calls."""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """Token bucket allowing ``rate`` calls per second with bursts up to ``burst``.
+
+    Callers that find the bucket empty reserve the next free slot and sleep
+    until it, so waiters are released in arrival order. No lock is held, so
+    one limiter can be shared across event loops.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    async def acquire(self) -> None:
+        """Wait until a call is allowed."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -1,16 +1,30 @@
 """Pytest configuration and fixtures."""
 
-import tempfile
 from pathlib import Path
 
 import pytest
 
 
 @pytest.fixture
-def temp_dir():
+def temp_dir(tmp_path):
     """Create a temporary directory for tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def shared_temp_dir(tmp_path_factory):
+    """Session-wide temporary directory; tests must use file names unique to them."""
+    return tmp_path_factory.mktemp("shared")
+
+
+@pytest.fixture
+def sqlite_store():
+    """Create an in-memory SQLite store for testing."""
+    from brainstormer.backends.persistence import SQLiteStore
+
+    store = SQLiteStore(Path(":memory:"))
+    yield store
+    store.close()
 
 
 @pytest.fixture
@@ -36,10 +50,9 @@ def sample_text_file(temp_dir):
     return file_path
 
 
-@pytest.fixture
-def sample_skill_dir(temp_dir):
-    """Create a sample skill directory."""
-    skill_dir = temp_dir / "skills" / "test-skill"
+def _write_sample_skill(skills_dir: Path) -> Path:
+    """Write the sample skill under skills_dir and return skills_dir."""
+    skill_dir = skills_dir / "test-skill"
     skill_dir.mkdir(parents=True)
 
     skill_file = skill_dir / "SKILL.md"
@@ -57,15 +70,37 @@ This is a test skill.
 - Guideline 1
 - Guideline 2
 """)
-    return temp_dir / "skills"
+    return skills_dir
 
 
 @pytest.fixture
-def sample_subagents_file(temp_dir):
-    """Create a sample subagents.jsonl file."""
-    file_path = temp_dir / "subagents.jsonl"
+def sample_skill_dir(temp_dir):
+    """Create a sample skill directory."""
+    return _write_sample_skill(temp_dir / "skills")
+
+
+@pytest.fixture(scope="module")
+def shared_skill_dir(tmp_path_factory):
+    """Sample skill directory shared by a test module; tests must not modify it."""
+    return _write_sample_skill(tmp_path_factory.mktemp("skills"))
+
+
+def _write_sample_subagents(file_path: Path) -> Path:
+    """Write two sample subagent configs to file_path and return it."""
     file_path.write_text("""\
 {"name": "test-agent-1", "description": "Test agent 1", "system_prompt": "You are test agent 1", "focus_areas": ["testing", "qa"]}
 {"name": "test-agent-2", "description": "Test agent 2", "system_prompt": "You are test agent 2", "focus_areas": ["research"]}
 """)
     return file_path
+
+
+@pytest.fixture
+def sample_subagents_file(temp_dir):
+    """Create a sample subagents.jsonl file."""
+    return _write_sample_subagents(temp_dir / "subagents.jsonl")
+
+
+@pytest.fixture(scope="module")
+def shared_subagents_file(tmp_path_factory):
+    """Sample subagents.jsonl shared by a test module; tests must not modify it."""
+    return _write_sample_subagents(tmp_path_factory.mktemp("subagents") / "subagents.jsonl")
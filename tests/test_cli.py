@@ -1,10 +1,11 @@
 """Tests for CLI module."""
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 from typer.testing import CliRunner
 
-from brainstormer.cli import app
+from brainstormer.cli import app, run_async
 
 runner = CliRunner()
 
@@ -112,7 +113,7 @@ OPENAI_API_KEY=test-key
 """)
 
         # Mock the orchestrator to avoid actual API calls
-        with patch("brainstormer.cli.ResearchOrchestrator") as mock_orch:
+        with patch("brainstormer.agents.orchestrator.ResearchOrchestrator") as mock_orch:
             mock_instance = MagicMock()
             mock_instance.run_research = MagicMock(return_value={
                 "session_id": "test-session",
@@ -130,3 +131,21 @@ OPENAI_API_KEY=test-key
 
         # Check file was mentioned in output
         assert "sample.txt" in result.output or result.exit_code == 0
+
+
+class TestRunAsync:
+    """Tests for run_async helper."""
+
+    def test_returns_coroutine_result(self):
+        """Test coroutine runs to completion on the selected loop."""
+        async def answer() -> int:
+            return 42
+
+        assert run_async(answer()) == 42
+
+    def test_uses_eager_task_factory_when_available(self):
+        """Test the loop starts tasks eagerly on Python versions that support it."""
+        async def task_factory():
+            return asyncio.get_running_loop().get_task_factory()
+
+        assert run_async(task_factory()) is getattr(asyncio, "eager_task_factory", None)
@@ -1,6 +1,6 @@
 """Tests for configuration module."""
 
-
+import os
 
 from brainstormer.config import Settings, load_settings
 
@@ -16,6 +16,11 @@ class TestSettings:
         assert settings.default_llm_model == "claude-sonnet-4-5-20250929"
         assert settings.embedding_provider == "openai"
         assert settings.log_level == "INFO"
+        assert settings.checkpoint_mode == "per_step"
+        assert settings.checkpoint_backend == "memory"
+        assert settings.max_parallel_agents == 4
+        assert settings.agent_timeout_seconds == 600.0
+        assert settings.model_warmup is False
 
     def test_get_model_string(self):
         """Test model string generation."""
@@ -30,6 +35,16 @@ class TestSettings:
         settings.default_llm_model = "gpt-4o"
         assert settings.get_model_string() == "openai:gpt-4o"
 
+    def test_get_sqlite_pragmas(self):
+        """Test SQLite PRAGMAs are built from settings."""
+        settings = Settings(sqlite_synchronous="FULL", sqlite_foreign_keys=False)
+
+        pragmas = settings.get_sqlite_pragmas()
+
+        assert pragmas["journal_mode"] == "WAL"
+        assert pragmas["synchronous"] == "FULL"
+        assert pragmas["foreign_keys"] == "OFF"
+
     def test_validate_api_keys_anthropic(self):
         """Test API key validation for Anthropic provider."""
         settings = Settings(
@@ -65,6 +80,23 @@ class TestSettings:
         errors = settings.validate_api_keys()
         assert not any("OPENROUTER_API_KEY" in e for e in errors)
 
+    def test_load_settings_cached_per_env_file(self, temp_dir):
+        """Test repeated loads reuse parsing but return independent copies."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("LOG_LEVEL=WARNING\n")
+
+        first = load_settings(env_file)
+        second = load_settings(env_file)
+        first.log_level = "ERROR"
+
+        assert second is not first
+        assert second.log_level == "WARNING"
+        assert load_settings(env_file).log_level == "WARNING"
+
+        env_file.write_text("LOG_LEVEL=DEBUG\n")
+        os.utime(env_file, ns=(0, env_file.stat().st_mtime_ns + 1_000_000))
+        assert load_settings(env_file).log_level == "DEBUG"
+
     def test_load_settings_from_env(self, temp_dir, monkeypatch):
         """Test loading settings from environment variables."""
         # Settings now reads from environment variables via pydantic-settings
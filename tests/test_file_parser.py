@@ -1,10 +1,18 @@
 """Tests for file parsing utilities."""
 
 from pathlib import Path
+from types import SimpleNamespace
 
+import pypdf
 import pytest
 
-from brainstormer.utils.file_parser import parse_file, parse_files, parse_text
+from brainstormer.utils.file_parser import (
+    parse_file,
+    parse_files,
+    parse_pdf,
+    parse_pdf_stream,
+    parse_text,
+)
 
 
 class TestParseText:
@@ -29,6 +37,44 @@ class TestParseText:
         assert result == content
 
 
+    def test_parse_text_latin1_fallback(self, temp_dir):
+        """Test non-UTF-8 text falls back to latin-1 with newlines normalised."""
+        file_path = temp_dir / "legacy.txt"
+        file_path.write_bytes("caf\xe9\r\nna\xefve\rend".encode("latin-1"))
+
+        assert parse_text(file_path) == "caf\xe9\nna\xefve\nend"
+
+
+class TestParsePdf:
+    """Tests for PDF text extraction."""
+
+    @pytest.fixture
+    def fake_reader(self, monkeypatch):
+        """Replace pypdf's reader with one returning fixed page texts."""
+        pages = ["First page", "", "Third page", None]
+
+        def page(text):
+            if text is None:
+                # No content stream: extraction must not be attempted
+                return SimpleNamespace(get_contents=lambda: None, extract_text=None)
+            return SimpleNamespace(get_contents=lambda: b"BT ET", extract_text=lambda: text)
+
+        def reader(_path):
+            return SimpleNamespace(pages=[page(text) for text in pages])
+
+        monkeypatch.setattr(pypdf, "PdfReader", reader)
+
+    def test_parse_pdf_stream(self, fake_reader):
+        """Test pages are yielded one by one, skipping empty and blank pages."""
+        pages = list(parse_pdf_stream(Path("doc.pdf")))
+        assert pages == ["--- Page 1 ---\nFirst page", "--- Page 3 ---\nThird page"]
+
+    def test_parse_pdf(self, fake_reader):
+        """Test pages are joined by blank lines."""
+        text = parse_pdf(Path("doc.pdf"))
+        assert text == "--- Page 1 ---\nFirst page\n\n--- Page 3 ---\nThird page"
+
+
 class TestParseFile:
     """Tests for generic file parsing."""
 
@@ -50,6 +96,18 @@ class TestParseFile:
         assert result["type"] == "text"
         assert "# Title" in result["content"]
 
+    def test_parse_file_cached_until_changed(self, temp_dir):
+        """Test unchanged files are served from cache as independent copies."""
+        file_path = temp_dir / "notes.txt"
+        file_path.write_text("first")
+
+        result = parse_file(file_path)
+        result["content"] = "mutated"
+        assert parse_file(file_path)["content"] == "first"
+
+        file_path.write_text("second draft")
+        assert parse_file(file_path)["content"] == "second draft"
+
     def test_parse_nonexistent_file(self, temp_dir):
         """Test parsing a non-existent file raises error."""
         with pytest.raises(FileNotFoundError):
@@ -80,6 +138,7 @@ class TestParseFiles:
 
         assert len(results) == 3
         assert all(r["type"] == "text" for r in results)
+        assert [r["name"] for r in results] == ["file0.txt", "file1.txt", "file2.txt"]
 
     def test_parse_files_with_invalid(self, temp_dir):
         """Test parsing with some invalid files."""
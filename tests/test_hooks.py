@@ -1,5 +1,7 @@
 """Tests for hooks system."""
 
+import dataclasses
+from types import ModuleType
 
 import pytest
 
@@ -8,6 +10,7 @@ from brainstormer.middleware.hooks import (
     HookManager,
     HookPhase,
     HookResult,
+    _register_hooks_from_module,
     hook,
     load_hooks_from_file,
 )
@@ -57,6 +60,13 @@ class TestHookResult:
 
         assert result.should_abort is True
 
+    def test_results_are_immutable(self):
+        """Test a shared result can't be modified by one caller."""
+        result = HookResult(success=True)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.success = False
+
 
 class TestHookManager:
     """Tests for HookManager."""
@@ -98,7 +108,6 @@ class TestHookManager:
         assert result is True
         assert len(manager.get_hooks("plan_creation")) == 0
 
-    @pytest.mark.asyncio
     async def test_execute_hooks(self):
         """Test executing hooks."""
         manager = HookManager()
@@ -122,7 +131,6 @@ class TestHookManager:
         assert len(results) == 1
         assert results[0].success is True
 
-    @pytest.mark.asyncio
     async def test_execute_async_hook(self):
         """Test executing async hooks."""
         manager = HookManager()
@@ -144,65 +152,193 @@ class TestHookManager:
 
         assert data["async"] is True
 
-    @pytest.mark.asyncio
-    async def test_hook_priority(self):
-        """Test hooks execute in priority order."""
+    async def test_dispatch_tracks_hook_changes(self):
+        """Test cached dispatch lists follow register, unregister and enabled."""
         manager = HookManager()
-        execution_order = []
+        calls = []
+        first = manager.register(event="search", handler=lambda d, c: calls.append("first"))
+        await manager.execute_pre("search", {})
 
-        def hook1(data, ctx):
-            execution_order.append(1)
-            return data
+        manager.register(event="search", handler=lambda d, c: calls.append("second"))
+        await manager.execute_pre("search", {})
 
-        def hook2(data, ctx):
-            execution_order.append(2)
-            return data
+        first.enabled = False
+        await manager.execute_pre("search", {})
 
-        manager.register(
-            event="plan_creation",
-            handler=hook2,
-            priority=10,
-        )
-        manager.register(
-            event="plan_creation",
-            handler=hook1,
-            priority=1,
+        first.enabled = True
+        manager.unregister(first)
+        await manager.execute_pre("search", {})
+
+        assert calls == ["first", "first", "second", "second", "second"]
+
+    async def test_results_log_is_bounded(self):
+        """Test the execution log keeps only the most recent records."""
+        manager = HookManager(results_capacity=2)
+        manager.register(event="search", handler=lambda d, c: d, name="logger")
+
+        for _ in range(3):
+            await manager.execute_pre("search", {})
+
+        assert len(manager.get_results()) == 2
+        assert manager.get_results()[0] == {
+            "hook": "logger", "event": "search", "phase": "pre", "success": True, "error": None,
+        }
+
+        disabled = HookManager(results_capacity=None)
+        disabled.register(event="search", handler=lambda d, c: d)
+        await disabled.execute_pre("search", {})
+        assert disabled.get_results() == []
+
+    async def test_none_result_counts_as_success(self):
+        """Test a handler returning None succeeds and leaves data unchanged."""
+        manager = HookManager()
+        manager.register("search", lambda d, c: None)
+
+        data, results = await manager.execute("search", HookPhase.PRE, {"query": "q"})
+
+        assert data == {"query": "q"}
+        assert results[0].success
+        assert results[0].modified_data is None
+
+    async def test_execute_many(self):
+        """Test batch execution runs the chain per payload, keeping order."""
+        manager = HookManager()
+
+        async def add_flag(data, ctx):
+            return {**data, "seen": True}
+
+        manager.register("agent_spawn", add_flag)
+
+        outcomes = await manager.execute_many(
+            "agent_spawn", HookPhase.PRE, [{"name": "a"}, {"name": "b"}]
         )
 
-        await manager.execute_pre("plan_creation", {})
+        assert [data for data, _ in outcomes] == [
+            {"name": "a", "seen": True},
+            {"name": "b", "seen": True},
+        ]
+        assert all(results[0].success for _, results in outcomes)
+
+    def test_has(self):
+        """Test checking for hooks by event and phase."""
+        manager = HookManager()
+        assert not manager.has("search")
+
+        manager.register("search", lambda d, c: d, phase=HookPhase.POST)
 
-        assert execution_order == [1, 2]
+        assert manager.has("search")
+        assert manager.has("search", HookPhase.POST)
+        assert not manager.has("search", HookPhase.PRE)
 
-    @pytest.mark.asyncio
-    async def test_hook_abort(self):
-        """Test hook can abort execution."""
+    def test_register_many(self):
+        """Test bulk registration sorts by priority and validates first."""
         manager = HookManager()
-        executed = []
+        manager.register("search", lambda d, c: d, name="existing", priority=5)
+
+        manager.register_many([
+            {"event": "search", "handler": lambda d, c: d, "name": "late", "priority": 10},
+            {"event": "search", "handler": lambda d, c: d, "name": "early", "priority": 1},
+        ])
+        assert [h.name for h in manager.get_hooks("search")] == ["early", "existing", "late"]
+
+        with pytest.raises(ValueError, match="Unknown event"):
+            manager.register_many([
+                {"event": "completion", "handler": lambda d, c: d},
+                {"event": "unknown", "handler": lambda d, c: d},
+            ])
+        assert manager.get_hooks("completion") == []
+
+    def test_get_all_hooks_tracks_changes(self):
+        """Test listing every hook reflects registrations and removals."""
+        manager = HookManager()
+        search_hook = manager.register("search", lambda d, c: d)
+        manager.register("completion", lambda d, c: d)
+
+        assert len(manager.get_hooks()) == 2
 
-        def abort_hook(data, ctx):
-            executed.append("abort")
-            return HookResult(success=True, should_abort=True)
+        manager.unregister(search_hook)
+        assert search_hook not in manager.get_hooks()
+        assert len(manager.get_hooks()) == 1
+
+    async def test_string_phase_shares_dispatch(self):
+        """Test string and enum phases reach the same hooks after changes."""
+        manager = HookManager()
+        manager.register("search", lambda d, c: [*d, "a"], phase="pre")
 
-        def second_hook(data, ctx):
-            executed.append("second")
+        data, _ = await manager.execute("search", HookPhase.PRE, [])
+        assert data == ["a"]
+
+        manager.register("search", lambda d, c: [*d, "b"], phase=HookPhase.PRE, priority=1)
+        data, _ = await manager.execute("search", "pre", [])
+        assert data == ["a", "b"]
+
+    def test_execute_sync(self):
+        """Test sync hook chains run without an event loop."""
+        manager = HookManager()
+        manager.register(event="search", handler=lambda d, c: {**d, "seen": True})
+
+        data, results = manager.execute_sync("search", HookPhase.PRE, {"query": "q"})
+
+        assert data == {"query": "q", "seen": True}
+        assert results[0].success
+
+        async def async_hook(data, ctx):
             return data
 
-        manager.register(
-            event="agent_spawn",
-            handler=abort_hook,
-            priority=1,
-        )
-        manager.register(
-            event="agent_spawn",
-            handler=second_hook,
-            priority=2,
-        )
+        manager.register(event="search", handler=async_hook)
+        with pytest.raises(RuntimeError, match="Async hooks"):
+            manager.execute_sync("search", HookPhase.PRE, {})
+
+    def test_equal_priority_keeps_registration_order(self):
+        """Test hooks with the same priority stay in registration order."""
+        manager = HookManager()
+        for name in ("first", "second", "third"):
+            manager.register(event="search", handler=lambda d, c: d, name=name, priority=5)
+        manager.register(event="search", handler=lambda d, c: d, name="early", priority=0)
+
+        names = [h.name for h in manager.get_hooks("search")]
+        assert names == ["early", "first", "second", "third"]
+
+    @pytest.mark.parametrize(
+        ("hooks", "expected"),
+        [
+            pytest.param(
+                [("hook2", 10, False), ("hook1", 1, False)], ["hook1", "hook2"], id="priority"
+            ),
+            pytest.param(
+                [("first", 5, False), ("second", 5, False)], ["first", "second"], id="tie"
+            ),
+            pytest.param([("abort", 1, True), ("second", 2, False)], ["abort"], id="abort"),
+            pytest.param(
+                [("second", 2, False), ("abort", 1, True)], ["abort"], id="abort-registered-last"
+            ),
+        ],
+    )
+    async def test_execution_order(self, hooks, expected):
+        """Test hooks run in priority order and an aborting hook stops the rest."""
+        manager = HookManager()
+        executed = []
+
+        def make_handler(name, aborts):
+            def handler(data, ctx):
+                executed.append(name)
+                return HookResult(success=True, should_abort=aborts)
 
-        await manager.execute_pre("agent_spawn", {})
+            return handler
 
-        assert executed == ["abort"]
+        for name, priority, aborts in hooks:
+            manager.register(
+                event="agent_spawn",
+                handler=make_handler(name, aborts),
+                name=name,
+                priority=priority,
+            )
+
+        _data, results = await manager.execute_pre("agent_spawn", {})
+
+        assert executed == expected
+        assert results[-1].should_abort == any(aborts for _, _, aborts in hooks)
 
-    @pytest.mark.asyncio
     async def test_hook_error_handling(self):
         """Test hooks handle errors gracefully."""
         manager = HookManager()
@@ -240,19 +376,49 @@ class TestHookDecorator:
 class TestLoadHooksFromFile:
     """Tests for loading hooks from files."""
 
-    def test_load_hooks_from_file(self, temp_dir):
-        """Test loading hooks from a Python file."""
-        hooks_file = temp_dir / "test_hooks.py"
-        hooks_file.write_text('''
+    def test_register_hooks_from_module(self):
+        """Test decorated callables in a hooks module are registered."""
+        module = ModuleType("inline_hooks")
+        source = '''
 from brainstormer.middleware.hooks import hook, HookPhase, HookResult
 
 @hook("plan_creation", HookPhase.PRE, name="file_hook")
 def my_hook(data, ctx):
     return HookResult(success=True)
-''')
+'''
+        exec(compile(source, "<test>", "exec"), module.__dict__)
 
         manager = HookManager()
-        loaded = load_hooks_from_file(hooks_file, manager)
+        loaded = _register_hooks_from_module(module, manager)
 
         assert len(loaded) == 1
         assert loaded[0].name == "file_hook"
+        assert manager.get_hooks("plan_creation") == loaded
+
+    @pytest.fixture(scope="class")
+    def hooks_file(self, tmp_path_factory):
+        """Hooks file written once and shared by the tests in this class."""
+        hooks_file = tmp_path_factory.mktemp("hooks") / "cached_hooks.py"
+        hooks_file.write_text('''
+from brainstormer.middleware.hooks import hook, HookResult
+
+@hook("search")
+def cached(data, ctx):
+    return HookResult(success=True)
+''')
+        return hooks_file
+
+    def test_load_hooks_from_file(self, hooks_file):
+        """Test hooks defined in a file are registered with the manager."""
+        manager = HookManager()
+        loaded = load_hooks_from_file(hooks_file, manager)
+
+        assert [h.name for h in loaded] == ["cached"]
+        assert manager.get_hooks("search") == loaded
+
+    def test_load_hooks_reuses_unchanged_file(self, hooks_file):
+        """Test an unchanged hooks file is executed only once."""
+        first = load_hooks_from_file(hooks_file, HookManager())
+        second = load_hooks_from_file(hooks_file, HookManager())
+
+        assert first[0].handler is second[0].handler
@@ -0,0 +1,98 @@
+"""Tests for lifecycle middleware."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from brainstormer.backends.persistence import PersistenceManager
+from brainstormer.middleware import lifecycle
+from brainstormer.middleware.hooks import HookManager, HookResult
+from brainstormer.middleware.lifecycle import (
+    AgentSpawnMiddleware,
+    MiddlewareContext,
+    QualityGateMiddleware,
+    _count_words,
+    _phases_in,
+)
+
+
+@pytest.fixture
+def context(temp_dir):
+    """Create a middleware context for testing."""
+    return MiddlewareContext(
+        session_id="lifecycle-test",
+        hook_manager=HookManager(),
+        persistence=PersistenceManager(Path(":memory:"), temp_dir / "out"),
+    )
+
+
+class TestCountWords:
+    """Tests for chunked word counting."""
+
+    def test_matches_split(self, monkeypatch):
+        """Test counts match str.split across chunk boundaries."""
+        monkeypatch.setattr(lifecycle, "_WORD_COUNT_CHUNK", 4)
+        for text in ["", "one", "one two", "abcdefgh ij", "  lead trail  ", "ab cd\nefgh\tij klmnop"]:
+            assert _count_words(text) == len(text.split())
+
+
+class TestPhasesIn:
+    """Tests for phase detection from output paths."""
+
+    def test_detects_phases(self):
+        """Test keywords and joined words are matched case-insensitively."""
+        assert _phases_in("research/Phase_1/notes.md") == ["phase1"]
+        assert _phases_in("research/deep-dive/initial research.md") == ["phase1", "phase2"]
+        assert _phases_in("CriticalReview.md") == ["phase3"]
+        assert _phases_in("out/FINAL_REPORT.md") == ["final"]
+        assert _phases_in("final/summary-report.md") == []
+
+
+class TestQualityGateMiddleware:
+    """Tests for quality metric recording."""
+
+    def test_concurrent_writes_are_counted(self, context):
+        """Test writes recorded from several threads are all counted."""
+        gate = QualityGateMiddleware(context)
+        content = "See https://example.com/a with high confidence. " * 20
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for _ in range(200):
+                pool.submit(gate.record_write, content, "phase1_notes.md")
+                pool.submit(gate.record_search, "query")
+
+        metrics = gate.metrics
+        assert metrics.search_count == 200
+        assert metrics.word_count == 200 * _count_words(content)
+        assert metrics.citation_count == 200 * 20
+        assert metrics.confidence_ratings_found == 200 * 20
+        assert list(metrics.phases_completed) == ["phase1"]
+        gate.clear_metrics()
+
+
+class TestAgentSpawnMiddleware:
+    """Tests for agent spawn pre-hooks."""
+
+    async def test_abort_raises(self, context):
+        """Test a hook requesting abort stops the spawn and later hooks."""
+        executed = []
+
+        def tag(data, ctx):
+            executed.append("tag")
+            return {**data, "tagged": True}
+
+        def abort(data, ctx):
+            executed.append("abort")
+            return HookResult(success=True, should_abort=True)
+
+        context.hook_manager.register("agent_spawn", tag, priority=1)
+        context.hook_manager.register("agent_spawn", abort, priority=2)
+        context.hook_manager.register("agent_spawn", lambda d, c: executed.append("late"), priority=3)
+        middleware = AgentSpawnMiddleware(context)
+
+        with pytest.raises(RuntimeError, match="aborted by hook: scout"):
+            await middleware.before({"name": "scout"})
+        with pytest.raises(RuntimeError, match="aborted by hook: scout"):
+            await middleware.before_batch([{"name": "scout"}])
+        assert executed == ["tag", "abort", "tag", "abort"]
@@ -1,9 +1,90 @@
 """Tests for memory module."""
 
+import asyncio
+import gc
+import re
+import threading
+import weakref
+import zlib
 
 import pytest
 
-from brainstormer.backends.memory import ChromaMemoryStore, MemoryManager
+chromadb = pytest.importorskip("chromadb")
+
+from brainstormer.agents.tools import create_memory_tools  # noqa: E402
+from brainstormer.backends import memory  # noqa: E402
+from brainstormer.backends.memory import (  # noqa: E402
+    ChromaMemoryStore,
+    FaissMemoryStore,
+    MemoryManager,
+    MemoryStore,
+)
+
+
+class CountingEmbedder(chromadb.EmbeddingFunction):
+    """Deterministic embedder that records the texts it embeds."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [[float(len(text)), 1.0] for text in input]
+
+
+class HashingEmbedder(chromadb.EmbeddingFunction):
+    """Bag-of-words embedder hashing each word to a dimension; no model needed."""
+
+    dimensions = 64
+
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            # Constant last component keeps texts without words off the zero vector
+            vector = [0.0] * (self.dimensions - 1) + [1.0]
+            for word in re.findall(r"\w+", text.lower()):
+                vector[zlib.crc32(word.encode()) % (self.dimensions - 1)] += 1.0
+            vectors.append(vector)
+        return vectors
+
+
+@pytest.fixture(scope="module")
+def chroma_client():
+    """In-memory ChromaDB client shared by the tests in this module."""
+    return chromadb.EphemeralClient()
+
+
+@pytest.fixture
+def make_chroma_store(chroma_client, temp_dir):
+    """Factory for ChromaDB stores on the shared client, dropped after the test."""
+    stores = []
+
+    def make(embedding_function=None):
+        store = ChromaMemoryStore(
+            persist_directory=temp_dir / "chroma",
+            collection_name=f"test_memory_{len(stores)}",
+            embedding_function=embedding_function or HashingEmbedder(),
+            client=chroma_client,
+        )
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        if store._collection is not None:
+            chroma_client.delete_collection(store.collection_name)
+
+
+@pytest.fixture
+def chroma_store(make_chroma_store):
+    """Create a ChromaDB memory store backed by the in-memory client."""
+    return make_chroma_store()
+
+
+def test_memory_store_is_abstract(temp_dir):
+    """Test the base store can't be instantiated without a backend."""
+    with pytest.raises(TypeError, match="abstract"):
+        MemoryStore(persist_directory=temp_dir)
 
 
 class TestChromaMemoryStore:
@@ -15,84 +96,173 @@ class TestChromaMemoryStore:
 
         assert store.count() == 0
 
-    def test_add_memory(self, temp_dir):
+    def test_add_memory(self, chroma_store):
         """Test adding a memory."""
-        store = ChromaMemoryStore(persist_directory=temp_dir / "chroma")
-
-        memory_id = store.add_memory(
+        memory_id = chroma_store.add_memory(
             content="This is a test memory",
             metadata={"type": "test"},
         )
 
         assert memory_id is not None
-        assert store.count() == 1
+        assert chroma_store.count() == 1
 
-    def test_search_memory(self, temp_dir):
+    def test_search_memory(self, chroma_store):
         """Test searching memories."""
-        store = ChromaMemoryStore(persist_directory=temp_dir / "chroma")
-
-        store.add_memory("Python is a programming language")
-        store.add_memory("JavaScript runs in browsers")
-        store.add_memory("Machine learning uses algorithms")
+        chroma_store.add_memories(
+            [
+                "Python is a programming language",
+                "JavaScript runs in browsers",
+                "Machine learning uses algorithms",
+            ]
+        )
 
-        results = store.search("programming language", n_results=2)
+        results = chroma_store.search("programming language", n_results=2)
 
         assert len(results) <= 2
         # Python should be most relevant
         assert any("Python" in r["content"] for r in results)
 
-    def test_get_memory(self, temp_dir):
-        """Test getting a specific memory."""
-        store = ChromaMemoryStore(persist_directory=temp_dir / "chroma")
+    def test_query_embeddings_cached(self, make_chroma_store):
+        """Test repeated queries reuse their embedding."""
+        embedder = CountingEmbedder()
+        store = make_chroma_store(embedder)
+        store.add_memory("Python is a programming language")
 
-        store.add_memory("Test content", memory_id="test-id-123")
+        store.search("python")
+        store.search_many(["python", "rust"])
 
-        memory = store.get_memory("test-id-123")
+        assert embedder.calls[1:] == [["python"], ["rust"]]
+
+    def test_get_memory(self, chroma_store):
+        """Test getting a specific memory."""
+        chroma_store.add_memory("Test content", memory_id="test-id-123")
+
+        memory = chroma_store.get_memory("test-id-123")
 
         assert memory is not None
         assert memory["content"] == "Test content"
 
-    def test_delete_memory(self, temp_dir):
+    def test_delete_memory(self, chroma_store):
         """Test deleting a memory."""
-        store = ChromaMemoryStore(persist_directory=temp_dir / "chroma")
-
-        memory_id = store.add_memory("To be deleted")
-        assert store.count() == 1
+        memory_id = chroma_store.add_memory("To be deleted")
+        assert chroma_store.count() == 1
 
-        store.delete_memory(memory_id)
-        assert store.count() == 0
+        chroma_store.delete_memory(memory_id)
+        assert chroma_store.count() == 0
 
-    def test_update_memory(self, temp_dir):
+    def test_update_memory(self, chroma_store):
         """Test updating a memory."""
-        store = ChromaMemoryStore(persist_directory=temp_dir / "chroma")
+        memory_id = chroma_store.add_memory("Original content")
 
-        memory_id = store.add_memory("Original content")
+        chroma_store.update_memory(memory_id, content="Updated content")
 
-        store.update_memory(memory_id, content="Updated content")
-
-        memory = store.get_memory(memory_id)
+        memory = chroma_store.get_memory(memory_id)
         assert memory["content"] == "Updated content"
 
-    def test_clear_memories(self, temp_dir):
+    def test_clear_memories(self, chroma_store):
         """Test clearing all memories."""
-        store = ChromaMemoryStore(persist_directory=temp_dir / "chroma")
+        ids = chroma_store.add_memories(["Memory 1", "Memory 2"], [{"n": 1}, None])
+        assert chroma_store.count() == 2
+        assert chroma_store.get_memory(ids[0])["metadata"]["n"] == "1"
+
+        chroma_store.clear()
+        assert chroma_store.count() == 0
+
+
+class TestFaissMemoryStore:
+    """Tests for FaissMemoryStore."""
+
+    @pytest.fixture
+    def store(self, temp_dir):
+        """Create a FAISS store with a deterministic embedder."""
+        pytest.importorskip("faiss")
+        return FaissMemoryStore(temp_dir / "faiss", embedding_function=CountingEmbedder())
+
+    def test_add_and_search(self, store):
+        """Test memories are ranked by similarity and filtered by metadata."""
+        short_id = store.add_memory("kiwi", metadata={"type": "fruit"})
+        store.add_memory("a much longer memory", metadata={"type": "note"})
 
-        store.add_memory("Memory 1")
-        store.add_memory("Memory 2")
         assert store.count() == 2
+        assert store.search("pear", n_results=1)[0]["id"] == short_id
+        assert [m["id"] for m in store.search("pear", where={"type": "fruit"})] == [short_id]
 
-        store.clear()
-        assert store.count() == 0
+    def test_reload_from_disk(self, store, temp_dir):
+        """Test the index is rebuilt from the sidecar database."""
+        memory_id = store.add_memory("kiwi")
+        store.close()
+
+        reopened = FaissMemoryStore(temp_dir / "faiss", embedding_function=CountingEmbedder())
+
+        assert reopened.count() == 1
+        assert reopened.search("pear")[0]["id"] == memory_id
+
+    def test_delete_memory(self, store):
+        """Test deleted memories are no longer returned."""
+        memory_id = store.add_memory("kiwi")
+        store.delete_memory(memory_id)
+
+        assert store.get_memory(memory_id) is None
+        assert store.search("kiwi") == []
+
+    def test_update_merges_metadata(self, store):
+        """Test a metadata-only update keeps the other keys, as Chroma does."""
+        memory_id = store.add_memory("kiwi", metadata={"type": "fruit", "session_id": "s1"})
+
+        store.update_memory(memory_id, metadata={"verified": True})
+
+        metadata = store.get_memory(memory_id)["metadata"]
+        assert metadata["type"] == "fruit"
+        assert metadata["verified"] == "True"
+        assert "timestamp" in metadata
+        assert [m["id"] for m in store.search("kiwi", where={"session_id": "s1"})] == [memory_id]
+
+    def test_where_filters_before_ranking(self, store, monkeypatch):
+        """Test filtered searches only rank matching rows, fetched in chunks."""
+        monkeypatch.setattr(memory, "_SQLITE_MAX_VARIABLES", 2)
+        store.add_memories(
+            ["pear", "plum", "fig"] + ["a much longer note"] * 3,
+            [{"type": "note"}] * 3 + [{"type": "fruit"}] * 3,
+        )
+
+        results = store.search("kiwi", n_results=5, where={"type": "fruit"})
+
+        assert len(results) == 3
+        assert all(m["metadata"]["type"] == "fruit" for m in results)
+        assert store.search("kiwi", where={"type": "missing"}) == []
+
+    def test_failed_replace_keeps_index(self, store):
+        """Test a write that fails leaves the replaced memory searchable."""
+        memory_id = store.add_memory("kiwi")
+
+        with pytest.raises(TypeError):
+            store.add_records(
+                [{"id": memory_id, "document": "mango", "metadata": {"bad": object()}}]
+            )
+
+        assert [m["id"] for m in store.search("kiwi")] == [memory_id]
+
+    def test_keyword_index_follows_writes(self, store, sqlite_store):
+        """Test updates and deletes are mirrored into the keyword index."""
+        store.keyword_store = sqlite_store
+        kept = store.add_memory("kiwi")
+        dropped = store.add_memory("mango")
+
+        store.update_memory(kept, content="papaya")
+        store.delete_memory(dropped)
+
+        assert sqlite_store.search_memories("kiwi") == []
+        assert sqlite_store.search_memories("mango") == []
+        assert [m["id"] for m in sqlite_store.search_memories("papaya")] == [kept]
 
 
 class TestMemoryManager:
     """Tests for MemoryManager."""
 
     @pytest.fixture
-    def manager(self, temp_dir):
+    def manager(self, chroma_store):
         """Create a memory manager for testing."""
-        store = ChromaMemoryStore(persist_directory=temp_dir / "chroma")
-        return MemoryManager(store)
+        return MemoryManager(chroma_store)
 
     def test_remember_research(self, manager):
         """Test storing research memory."""
@@ -160,3 +330,231 @@ class TestMemoryManager:
 
         # Should return at least one result
         assert isinstance(results, list)
+
+    def test_writes_are_buffered_until_flush(self, manager):
+        """Test remembered memories are held until flushed."""
+        memory_id = manager.remember_insight("Buffered insight")
+
+        assert manager.store.count() == 0
+
+        assert manager.flush() == 1
+        assert manager.store.count() == 1
+        assert manager.store.get_memory(memory_id) is not None
+
+    def test_flush_when_batch_full(self, chroma_store):
+        """Test buffer flushes automatically at batch size."""
+        manager = MemoryManager(chroma_store, batch_size=2)
+
+        manager.remember_insight("First insight")
+        assert chroma_store.count() == 0
+
+        manager.remember_insight("Second insight")
+        assert chroma_store.count() == 2
+
+    async def test_full_batch_flushed_off_event_loop(self, make_chroma_store):
+        """Test a full batch is written from a worker thread inside an event loop."""
+        store = make_chroma_store(CountingEmbedder())
+        manager = MemoryManager(store, batch_size=2)
+        writer_threads = []
+        add_records = store.add_records
+
+        def recording_add(records):
+            writer_threads.append(threading.current_thread())
+            return add_records(records)
+
+        store.add_records = recording_add
+        manager.remember_insight("First insight")
+        manager.remember_insight("Second insight")
+
+        for _ in range(500):
+            if store.count() == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert store.count() == 2
+        assert writer_threads
+        assert threading.main_thread() not in writer_threads
+
+    async def test_failed_background_flush_is_logged_and_retried(
+        self, make_chroma_store, caplog
+    ):
+        """Test a failed background write is reported and its records kept for aflush."""
+        store = make_chroma_store(CountingEmbedder())
+        manager = MemoryManager(store, batch_size=1, flush_interval=0)
+        add_records = store.add_records
+        calls = []
+
+        def flaky_add(records):
+            calls.append(len(records))
+            if len(calls) == 1:
+                raise RuntimeError("store unavailable")
+            return add_records(records)
+
+        store.add_records = flaky_add
+        manager.remember_insight("Insight")
+
+        assert await manager.aflush() == 1
+        assert calls == [1, 1]
+        assert store.count() == 1
+        assert "Background memory flush failed: store unavailable" in caplog.text
+
+    def test_timed_flush_without_event_loop(self, chroma_store):
+        """Test synchronous callers are flushed by the interval timer."""
+        manager = MemoryManager(chroma_store, flush_interval=0.05)
+
+        manager.remember_insight("Timed insight")
+        timer = manager._flush_timer
+        assert isinstance(timer, threading.Timer)
+
+        timer.join(timeout=30)
+        assert chroma_store.count() == 1
+
+    async def test_flush_off_loop_cancels_timer_on_loop(self, chroma_store):
+        """Test a worker-thread flush cancels the loop's timer through the loop."""
+        manager = MemoryManager(chroma_store, flush_interval=60)
+        manager.remember_insight("Timed insight")
+        handle = manager._flush_timer
+        assert isinstance(handle, asyncio.TimerHandle)
+
+        assert await asyncio.to_thread(manager.flush) == 1
+        await asyncio.sleep(0)
+
+        assert handle.cancelled()
+        assert manager._flush_timer is None
+
+    def test_exit_flush_tracks_live_managers(self, chroma_store):
+        """Test the exit hook flushes live managers without keeping them alive."""
+        manager = MemoryManager(chroma_store, flush_interval=0)
+        memory_id = manager.remember_insight("Unflushed insight")
+
+        memory._flush_at_exit()
+        assert chroma_store.get_memory(memory_id) is not None
+
+        ref = weakref.ref(manager)
+        del manager
+        gc.collect()
+        assert ref() is None
+        assert not any(m.store is chroma_store for m in memory._live_managers)
+
+    def test_failed_flush_requeues_records(self, chroma_store, monkeypatch):
+        """Test records survive a failed store write and are written next time."""
+        manager = MemoryManager(chroma_store, flush_interval=0)
+        manager.remember_insight("First")
+        add_records = chroma_store.add_records
+
+        def failing_add(records):
+            raise RuntimeError("store unavailable")
+
+        monkeypatch.setattr(chroma_store, "add_records", failing_add)
+        with pytest.raises(RuntimeError):
+            manager.flush()
+        manager.remember_insight("Second")
+
+        monkeypatch.setattr(chroma_store, "add_records", add_records)
+        assert manager.flush() == 2
+        assert chroma_store.count() == 2
+
+    def test_remember_batch(self, manager):
+        """Test a batch of memories is written at once."""
+        memory_ids = manager.remember_batch([
+            {"content": "First finding", "metadata": {"type": "research"}},
+            {"content": "Second finding"},
+        ])
+
+        assert len(memory_ids) == 2
+        assert manager.store.count() == 2
+        assert manager.store.get_memory(memory_ids[1]) is not None
+
+    def test_recall_many(self, manager):
+        """Test recalling memories for several queries at once."""
+        manager.remember_insight("Python is great for data science")
+        manager.remember_insight("Rust is great for systems programming")
+
+        results = manager.recall_many(["data science", "systems"], n_results=1)
+
+        assert len(results) == 2
+        assert all(len(memories) == 1 for memories in results)
+
+    def test_hybrid_recall_finds_exact_terms(self, make_chroma_store, sqlite_store):
+        """Test keyword matches are fused into vector recall results."""
+        store = make_chroma_store(CountingEmbedder())
+        manager = MemoryManager(store, keyword_store=sqlite_store)
+        manager.remember_insight("Filler", session_id="session-1")
+        target = manager.remember_insight("Agent zeta-7 cited a report", session_id="session-1")
+        manager.remember_insight("Agent zeta-7 elsewhere", session_id="session-2")
+
+        results = manager.recall_relevant("zeta-7", n_results=1, session_id="session-1")
+
+        assert [r["id"] for r in results] == [target]
+
+    def test_hybrid_recall_after_delete_and_update(self, make_chroma_store, sqlite_store):
+        """Test deleted or rewritten memories stop matching their old keywords."""
+        store = make_chroma_store(CountingEmbedder())
+        manager = MemoryManager(store, keyword_store=sqlite_store)
+        deleted, updated = manager.remember_batch(
+            [{"content": "Agent zeta-7 cited a report"}, {"content": "Agent omega-3 noted"}]
+        )
+
+        store.delete_memory(deleted)
+        store.update_memory(updated, content="Agent kappa-9 noted")
+
+        assert sqlite_store.search_memories("zeta") == []
+        assert sqlite_store.search_memories("omega") == []
+        assert [m["id"] for m in sqlite_store.search_memories("kappa")] == [updated]
+        assert deleted not in [r["id"] for r in manager.recall_relevant("zeta-7")]
+
+        store.clear()
+        assert sqlite_store.search_memories("kappa") == []
+
+
+class TestRememberTool:
+    """Tests for the remember tool's duplicate detection."""
+
+    @pytest.fixture
+    def manager(self, make_chroma_store, sqlite_store):
+        """Manager that only writes on explicit flushes."""
+        store = make_chroma_store(CountingEmbedder())
+        return MemoryManager(store, flush_interval=0, keyword_store=sqlite_store)
+
+    def test_dedup_recorded_only_after_write(self, manager, sqlite_store, monkeypatch):
+        """Test a memory whose write failed is stored again by a later call."""
+        remember = create_memory_tools(manager, dedup_store=sqlite_store)["remember"]
+        first = remember("Zeta-7 cited a report")
+        assert remember("Zeta-7 cited a report") == first
+
+        def failing_add(records):
+            raise RuntimeError("store unavailable")
+
+        monkeypatch.setattr(manager.store, "add_records", failing_add)
+        with pytest.raises(RuntimeError):
+            manager.flush()
+        manager._pending.clear()
+
+        # A new session only sees what was actually written
+        remember = create_memory_tools(manager, dedup_store=sqlite_store)["remember"]
+        assert remember("Zeta-7 cited a report") != first
+
+    def test_dedup_forgotten_on_delete(self, manager, sqlite_store):
+        """Test content can be remembered again once its memory is deleted."""
+        remember = create_memory_tools(manager, dedup_store=sqlite_store)["remember"]
+        first = remember("Zeta-7 cited a report")
+        manager.flush()
+        assert remember("Zeta-7 cited a report") == first
+
+        manager.store.delete_memory(first.removeprefix("Stored with ID: "))
+
+        second = remember("Zeta-7 cited a report")
+        assert second != first
+        manager.flush()
+        manager.store.clear()
+        assert remember("Zeta-7 cited a report") != second
+
+    def test_in_process_dedup_checks_store(self, manager):
+        """Test without a dedup store, deleted memories are not reported as stored."""
+        remember = create_memory_tools(manager)["remember"]
+        first = remember("Zeta-7 cited a report")
+        manager.flush()
+        assert remember("Zeta-7 cited a report") == first
+
+        manager.store.delete_memory(first.removeprefix("Stored with ID: "))
+
+        assert remember("Zeta-7 cited a report") != first
@@ -0,0 +1,59 @@
+"""Tests for research orchestrator."""
+
+import asyncio
+
+import pytest
+
+from brainstormer.agents.orchestrator import ResearchOrchestrator
+from brainstormer.agents.subagents import SubagentManager
+
+
+@pytest.fixture
+async def orchestrator(sample_settings, sample_subagents_file, temp_dir):
+    """Orchestrator with the sample subagents, closed after the test."""
+    orchestrator = ResearchOrchestrator(
+        sample_settings,
+        temp_dir / "output",
+        subagent_manager=SubagentManager(sample_subagents_file),
+    )
+    yield orchestrator
+    await orchestrator.aclose()
+
+
+class TestSubagentRegistration:
+    """Tests for per-session subagent rosters."""
+
+    def test_focus_areas_sharing_a_subagent(self, orchestrator):
+        """Test two focus areas matching one subagent register it once."""
+        subagents = orchestrator._create_subagents_config(["testing strategy", "qa process"])
+        assert [s["name"] for s in subagents] == ["test-agent-1"]
+
+        store = orchestrator.persistence.store
+        with orchestrator.persistence.transaction():
+            store.create_session("session-1", "Problem")
+            orchestrator._register_subagents("session-1", subagents)
+
+        assert len(store.get_session_agents("session-1")) == 1
+
+    def test_truncated_dynamic_names_are_unique(self, orchestrator):
+        """Test dynamic subagents whose names truncate alike are numbered."""
+        subagents = orchestrator._create_subagents_config(
+            ["supply chain resilience in europe", "supply chain resilience in asia"]
+        )
+
+        names = [s["name"] for s in subagents]
+        assert names == ["research-supply-chain-resilie", "research-supply-chain-resilie-2"]
+
+
+class TestWarmup:
+    """Tests for the optional model warm-up."""
+
+    async def test_aclose_cancels_pending_warmup(self, orchestrator):
+        """Test closing the orchestrator doesn't wait for a slow warm-up."""
+        warmup = asyncio.create_task(asyncio.sleep(60))
+        orchestrator._warmup_task = warmup
+
+        await orchestrator.aclose()
+
+        assert warmup.cancelled()
+        assert orchestrator._warmup_task is None
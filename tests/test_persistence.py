@@ -1,25 +1,82 @@
 """Tests for persistence module."""
 
+import sqlite3
+import threading
+from pathlib import Path
 
+import pytest
 
 from brainstormer.backends.persistence import PersistenceManager, SQLiteStore
 
+# Skips fsync on commit; fine for throwaway test databases, never for real ones
+FAST_PRAGMAS = {"synchronous": "OFF"}
+
 
 class TestSQLiteStore:
     """Tests for SQLiteStore."""
 
+    @pytest.fixture(scope="class")
+    def seeded_store(self):
+        """In-memory store with two sessions, shared by read-only tests."""
+        store = SQLiteStore(Path(":memory:"))
+        store.create_session("session-1", "Problem 1")
+        store.create_session("session-2", "Problem 2")
+        store.create_agent_state("agent-1", "session-1", "Agent 1", "Focus 1")
+        store.create_agent_state("agent-2", "session-1", "Agent 2", "Focus 2")
+        yield store
+        store.close()
+
     def test_store_initialization(self, temp_dir):
         """Test store creates database and tables."""
         db_path = temp_dir / "test.db"
-        SQLiteStore(db_path)
+        SQLiteStore(db_path, pragmas=FAST_PRAGMAS)
 
         assert db_path.exists()
 
-    def test_create_session(self, temp_dir):
-        """Test creating a research session."""
-        store = SQLiteStore(temp_dir / "test.db")
+    def test_pragmas_applied(self, temp_dir):
+        """Test connections use WAL and configured PRAGMAs."""
+        store = SQLiteStore(temp_dir / "test.db", pragmas={"synchronous": "FULL"})
 
-        session = store.create_session(
+        with store._connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+    def test_reads_do_not_wait_for_writer(self, temp_dir):
+        """Test reads use the reader pool while the writer is busy."""
+        store = SQLiteStore(temp_dir / "test.db", pragmas=FAST_PRAGMAS)
+        store.create_session("session-1", "Problem")
+
+        held, release = threading.Event(), threading.Event()
+
+        def hold_writer():
+            with store._connection():
+                held.set()
+                release.wait(timeout=5)
+
+        writer = threading.Thread(target=hold_writer)
+        writer.start()
+        try:
+            assert held.wait(timeout=5)
+            with store._read_connection() as conn:
+                assert conn is not store._writer
+            assert store.get_session("session-1") is not None
+            assert len(store.list_sessions()) == 1
+        finally:
+            release.set()
+            writer.join()
+
+    def test_read_connections_are_read_only(self, temp_dir):
+        """Test pooled reader connections reject writes."""
+        store = SQLiteStore(temp_dir / "test.db", pragmas=FAST_PRAGMAS, read_pool_size=1)
+
+        with store._read_connection() as conn, pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM research_sessions")
+
+    def test_create_session(self, sqlite_store):
+        """Test creating a research session."""
+        session = sqlite_store.create_session(
             session_id="test-session-1",
             problem="Test research problem",
             metadata={"key": "value"},
@@ -29,64 +86,73 @@ class TestSQLiteStore:
         assert session["problem"] == "Test research problem"
         assert session["status"] == "active"
 
-    def test_get_session(self, temp_dir):
+    def test_get_session(self, seeded_store):
         """Test getting a session by ID."""
-        store = SQLiteStore(temp_dir / "test.db")
-        store.create_session("session-1", "Problem 1")
-
-        session = store.get_session("session-1")
+        session = seeded_store.get_session("session-1")
 
         assert session is not None
         assert session["id"] == "session-1"
 
-    def test_get_nonexistent_session(self, temp_dir):
+    def test_get_nonexistent_session(self, seeded_store):
         """Test getting a non-existent session."""
-        store = SQLiteStore(temp_dir / "test.db")
-
-        session = store.get_session("nonexistent")
+        session = seeded_store.get_session("nonexistent")
 
         assert session is None
 
-    def test_update_session(self, temp_dir):
+    def test_update_session(self, sqlite_store):
         """Test updating a session."""
-        store = SQLiteStore(temp_dir / "test.db")
-        store.create_session("session-1", "Original problem")
+        sqlite_store.create_session("upd-1", "Original problem")
 
-        store.update_session("session-1", status="completed", plan="The plan")
+        sqlite_store.update_session("upd-1", status="completed", plan="The plan")
 
-        session = store.get_session("session-1")
+        session = sqlite_store.get_session("upd-1")
         assert session["status"] == "completed"
         assert session["plan"] == "The plan"
 
-    def test_list_sessions(self, temp_dir):
+    def test_list_sessions(self, seeded_store):
         """Test listing all sessions."""
-        store = SQLiteStore(temp_dir / "test.db")
-        store.create_session("session-1", "Problem 1")
-        store.create_session("session-2", "Problem 2")
-
-        sessions = store.list_sessions()
+        sessions = seeded_store.list_sessions()
 
         assert len(sessions) == 2
 
-    def test_list_sessions_by_status(self, temp_dir):
+    def test_list_sessions_by_status(self, sqlite_store):
         """Test filtering sessions by status."""
-        store = SQLiteStore(temp_dir / "test.db")
-        store.create_session("session-1", "Problem 1")
-        store.create_session("session-2", "Problem 2")
-        store.update_session("session-2", status="completed")
+        sqlite_store.create_session("session-1", "Problem 1")
+        sqlite_store.create_session("session-2", "Problem 2")
+        sqlite_store.update_session("session-2", status="completed")
 
-        active = store.list_sessions(status="active")
-        completed = store.list_sessions(status="completed")
+        active = sqlite_store.list_sessions(status="active")
+        completed = sqlite_store.list_sessions(status="completed")
 
         assert len(active) == 1
         assert len(completed) == 1
 
-    def test_create_agent_state(self, temp_dir):
+    def test_list_sessions_paginated(self, sqlite_store):
+        """Test keyset pagination walks sessions newest first without repeats."""
+        for i in range(5):
+            sqlite_store.create_session(f"session-{i}", f"Problem {i}")
+
+        first = sqlite_store.list_sessions(limit=2)
+        second = sqlite_store.list_sessions(limit=2, after_id=first[-1]["id"])
+        third = sqlite_store.list_sessions(limit=2, after_id=second[-1]["id"])
+
+        ids = [s["id"] for s in first + second + third]
+        assert ids == [f"session-{i}" for i in range(4, -1, -1)]
+
+    def test_iter_sessions(self, sqlite_store):
+        """Test streaming sessions page by page yields each session once."""
+        for i in range(5):
+            sqlite_store.create_session(f"session-{i}", f"Problem {i}")
+
+        ids = [s["id"] for s in sqlite_store.iter_sessions(page_size=2)]
+
+        assert ids == [f"session-{i}" for i in range(4, -1, -1)]
+
+    def test_create_agent_state(self, sqlite_store):
         """Test creating an agent state."""
-        store = SQLiteStore(temp_dir / "test.db")
-        store.create_session("session-1", "Problem")
+        sqlite_store.create_session("session-1", "Problem")
 
-        agent = store.create_agent_state(
+        agent = sqlite_store.create_agent_state(
             agent_id="agent-1",
             session_id="session-1",
             agent_name="test-agent",
@@ -96,74 +162,176 @@ class TestSQLiteStore:
         assert agent["id"] == "agent-1"
         assert agent["agent_name"] == "test-agent"
 
-    def test_get_session_agents(self, temp_dir):
+    def test_get_session_agents(self, seeded_store):
         """Test getting all agents for a session."""
-        store = SQLiteStore(temp_dir / "test.db")
-        store.create_session("session-1", "Problem")
-        store.create_agent_state("agent-1", "session-1", "Agent 1", "Focus 1")
-        store.create_agent_state("agent-2", "session-1", "Agent 2", "Focus 2")
-
-        agents = store.get_session_agents("session-1")
+        agents = seeded_store.get_session_agents("session-1")
 
         assert len(agents) == 2
 
-    def test_log_hook(self, temp_dir):
+    def test_session_lookups_use_composite_index(self, sqlite_store):
+        """Test per-session reads are served by the (session_id, created_at) index."""
+        with sqlite_store._read_connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM agent_states "
+                "WHERE session_id = ? ORDER BY created_at",
+                ("session-1",),
+            ).fetchall()
+
+        details = " ".join(row[3] for row in plan)
+        assert "idx_agent_states_session_created" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_transaction_commits_once(self, sqlite_store):
+        """Test writes inside a transaction are visible together after commit."""
+        with sqlite_store.transaction():
+            sqlite_store.create_session("session-1", "Problem")
+            sqlite_store.append_session_activity(
+                "session-1",
+                agents=[{"id": "agent-1", "agent_name": "Agent 1", "focus_area": "Focus"}],
+                artifacts=[{"id": "artifact-1", "artifact_type": "report", "file_path": "r.md"}],
+            )
+            assert sqlite_store._writer is not None
+            assert sqlite_store._writer.in_transaction
+
+        assert len(sqlite_store.get_session_agents("session-1")) == 1
+        assert len(sqlite_store.get_session_artifacts("session-1")) == 1
+
+    def test_transaction_rolls_back_on_error(self, sqlite_store):
+        """Test a failed transaction discards all of its writes."""
+        def create_then_fail():
+            with sqlite_store.transaction():
+                sqlite_store.create_session("session-1", "Problem")
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            create_then_fail()
+
+        assert sqlite_store.get_session("session-1") is None
+
+    def test_search_cache(self, sqlite_store):
+        """Test cached search results are returned until they expire."""
+        results = {"results": [{"title": "A", "url": "https://example.com"}]}
+
+        sqlite_store.put_search_result("key-1", "query", results)
+
+        assert sqlite_store.get_search_result("key-1", max_age_seconds=60) == results
+        assert sqlite_store.get_search_result("key-1", max_age_seconds=-1) is None
+        assert sqlite_store.get_search_result("missing", max_age_seconds=60) is None
+
+    def test_remembered_memory(self, sqlite_store):
+        """Test content hashes map to the memory first stored for them."""
+        sqlite_store.record_remembered_memory(b"hash-1", "memory-1")
+        sqlite_store.record_remembered_memory(b"hash-1", "memory-2")
+
+        assert sqlite_store.get_remembered_memory(b"hash-1") == "memory-1"
+        assert sqlite_store.get_remembered_memory(b"hash-2") is None
+
+    def test_forget_memories(self, sqlite_store):
+        """Test forgotten memories leave neither keyword rows nor dedup entries."""
+        sqlite_store.index_memories([
+            {"id": "memory-1", "document": "alpha", "metadata": {}},
+            {"id": "memory-2", "document": "beta", "metadata": {}},
+        ])
+        sqlite_store.record_remembered_memory(b"hash-1", "memory-1")
+        sqlite_store.record_remembered_memory(b"hash-2", "memory-2")
+
+        sqlite_store.forget_memories(["memory-1"])
+        assert sqlite_store.search_memories("alpha") == []
+        assert sqlite_store.get_remembered_memory(b"hash-1") is None
+        assert sqlite_store.get_remembered_memory(b"hash-2") == "memory-2"
+
+        sqlite_store.forget_all_memories()
+        assert sqlite_store.search_memories("beta") == []
+        assert sqlite_store.get_remembered_memory(b"hash-2") is None
+
+    def test_search_memories(self, sqlite_store):
+        """Test the keyword index matches exact terms ranked by BM25."""
+        sqlite_store.index_memories([
+            {"id": "m-1", "document": "Pricing data from https://example.com", "metadata": {}},
+            {"id": "m-2", "document": "Unrelated note", "metadata": {"type": "insight"}},
+        ])
+
+        results = sqlite_store.search_memories("example.com pricing?")
+
+        assert [r["id"] for r in results] == ["m-1"]
+        assert sqlite_store.search_memories("note")[0]["metadata"] == {"type": "insight"}
+        assert sqlite_store.search_memories("???") == []
+
+    def test_log_hook(self, sqlite_store):
         """Test logging hook execution."""
-        store = SQLiteStore(temp_dir / "test.db")
-
-        store.log_hook(
+        sqlite_store.log_hook(
             hook_name="test_hook",
             event_type="plan_creation",
             session_id="session-1",
             payload={"key": "value"},
         )
 
-        # Verify log was created (no public method to read, but no error)
+        sqlite_store.flush_hook_logs()
+
+        with sqlite_store._read_connection() as conn:
+            rows = conn.execute("SELECT hook_name, payload FROM hooks_log").fetchall()
+        assert [tuple(row) for row in rows] == [("test_hook", '{"key":"value"}')]
+
+    def test_close_writes_pending_hook_logs(self, temp_dir):
+        """Test closing the store writes hook logs still in the queue."""
+        db_path = temp_dir / "test.db"
+        store = SQLiteStore(db_path, pragmas=FAST_PRAGMAS)
+        for i in range(300):
+            store.log_hook(hook_name=f"hook-{i}", event_type="search")
+
+        store.close()
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM hooks_log").fetchone()[0] == 300
 
 
 class TestPersistenceManager:
     """Tests for PersistenceManager."""
 
+    @pytest.fixture
+    def manager(self, temp_dir):
+        """Create a persistence manager backed by an in-memory database."""
+        manager = PersistenceManager(
+            db_path=Path(":memory:"),
+            base_output_dir=temp_dir / "output",
+        )
+        yield manager
+        manager.store.close()
+
     def test_manager_initialization(self, temp_dir):
         """Test manager creates directories."""
         PersistenceManager(
             db_path=temp_dir / "test.db",
             base_output_dir=temp_dir / "output",
+            pragmas=FAST_PRAGMAS,
         )
 
         assert (temp_dir / "output").exists()
 
-    def test_get_session_dir(self, temp_dir):
+    def test_get_session_dir(self, manager):
         """Test getting session directory."""
-        manager = PersistenceManager(
-            db_path=temp_dir / "test.db",
-            base_output_dir=temp_dir / "output",
-        )
-
         session_dir = manager.get_session_dir("test-session")
 
         assert session_dir.exists()
         assert session_dir.name == "test-session"
 
-    def test_get_agent_dir(self, temp_dir):
-        """Test getting agent directory."""
-        manager = PersistenceManager(
-            db_path=temp_dir / "test.db",
-            base_output_dir=temp_dir / "output",
-        )
+    def test_get_session_dir_without_creating(self, manager):
+        """Test getting a session directory path without creating it."""
+        session_dir = manager.get_session_dir("lazy-session", ensure_exists=False)
+
+        assert not session_dir.exists()
+        assert manager.get_session_dir("lazy-session").exists()
 
+    def test_get_agent_dir(self, manager):
+        """Test getting agent directory."""
         agent_dir = manager.get_agent_dir("session-1", "agent-1")
 
         assert agent_dir.exists()
         assert agent_dir.name == "agent-1"
         assert agent_dir.parent.name == "session-1"
 
-    def test_write_plan(self, temp_dir):
+    def test_write_plan(self, manager):
         """Test writing research plan."""
-        manager = PersistenceManager(
-            db_path=temp_dir / "test.db",
-            base_output_dir=temp_dir / "output",
-        )
         manager.store.create_session("session-1", "Problem")
 
         plan_path = manager.write_plan("session-1", "# Research Plan\n\nContent here.")
@@ -172,13 +340,39 @@ class TestPersistenceManager:
         assert plan_path.name == "RESEARCH_PLAN.md"
         assert "Research Plan" in plan_path.read_text()
 
-    def test_write_agent_result(self, temp_dir):
-        """Test writing agent result file."""
+    def test_read_plan(self, manager):
+        """Test the plan is stored once on disk and read back through the session."""
+        manager.store.create_session("session-1", "Problem")
+
+        plan_path = manager.write_plan("session-1", "# Research Plan")
+
+        session = manager.store.get_session("session-1")
+        assert session["plan"] is None
+        assert session["plan_path"] == str(plan_path)
+        assert manager.read_plan("session-1") == "# Research Plan"
+        assert manager.read_plan("missing") is None
+
+    def test_plan_path_added_to_existing_database(self, temp_dir):
+        """Test opening an older database adds the plan_path column."""
+        db_path = temp_dir / "test.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE research_sessions (id TEXT PRIMARY KEY, problem TEXT NOT NULL, "
+                "status TEXT DEFAULT 'active', plan TEXT, created_at TIMESTAMP, "
+                "updated_at TIMESTAMP, metadata TEXT)"
+            )
+            conn.execute("INSERT INTO research_sessions (id, problem, plan) VALUES ('s', 'p', 'old')")
+        conn.close()
+
         manager = PersistenceManager(
-            db_path=temp_dir / "test.db",
-            base_output_dir=temp_dir / "output",
+            db_path=db_path, base_output_dir=temp_dir / "output", pragmas=FAST_PRAGMAS
         )
 
+        assert manager.store.get_session("s")["plan_path"] is None
+        assert manager.read_plan("s") == "old"
+
+    def test_write_agent_result(self, manager):
+        """Test writing agent result file."""
         result_path = manager.write_agent_result(
             session_id="session-1",
             agent_name="agent-1",
@@ -0,0 +1,35 @@
+"""Tests for rate limiting utilities."""
+
+import asyncio
+import time
+
+import pytest
+
+from brainstormer.utils.rate_limit import AsyncRateLimiter
+
+
+class TestAsyncRateLimiter:
+    """Tests for AsyncRateLimiter."""
+
+    def test_rejects_non_positive_rate(self):
+        """Test a limiter needs a positive rate."""
+        with pytest.raises(ValueError, match="rate"):
+            AsyncRateLimiter(0)
+
+    async def test_burst_is_immediate(self):
+        """Test calls within the burst are not delayed."""
+        limiter = AsyncRateLimiter(rate=1, burst=3)
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+        assert time.monotonic() - start < 0.05
+
+    async def test_calls_beyond_burst_are_spaced(self):
+        """Test calls past the burst wait for refilled tokens."""
+        limiter = AsyncRateLimiter(rate=20, burst=1)
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+        assert time.monotonic() - start >= 0.09
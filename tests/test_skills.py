@@ -1,11 +1,17 @@
 """Tests for skills loader."""
 
+import copy
+import os
 from pathlib import Path
 
+import pytest
+
+from brainstormer.skills import loader as skills_loader
 from brainstormer.skills.loader import (
     Skill,
     SkillLoader,
     SkillRegistry,
+    _split_frontmatter,
     create_skill_directory,
 )
 
@@ -39,6 +45,25 @@ class TestSkill:
         assert "## Skill: test-skill" in prompt
         assert "A test skill" in prompt
         assert "Do something" in prompt
+        assert skill.to_system_prompt() is prompt
+
+
+class TestSplitFrontmatter:
+    """Tests for frontmatter splitting."""
+
+    def test_split(self):
+        """Test the block and body offset are found between delimiter lines."""
+        text = "---  \nname: a\n----\n--- \n\nBody\n"
+        frontmatter, body_start = _split_frontmatter(text)
+        assert frontmatter == "name: a\n----"
+        assert text[body_start:] == "\nBody\n"
+
+    def test_no_frontmatter(self):
+        """Test unterminated or missing blocks are rejected."""
+        assert _split_frontmatter("# Title\n---\n") is None
+        assert _split_frontmatter("--- x\na\n---\n") is None
+        assert _split_frontmatter("---\n---\n") is None
+        assert _split_frontmatter("---\na\n---") is None
 
 
 class TestSkillLoader:
@@ -53,6 +78,60 @@ class TestSkillLoader:
         assert skill.name == "test-skill"
         assert "test skill for unit testing" in skill.description
 
+    def test_instructions_read_on_demand(self, temp_dir, monkeypatch):
+        """Test only the frontmatter is read until instructions are needed."""
+        monkeypatch.setattr(skills_loader, "_FRONTMATTER_READ_SIZE", 8)
+        skill_file = temp_dir / "lazy.md"
+        skill_file.write_text("---\nname: lazy\ndescription: Read later\n---\n\nBody text\n")
+
+        skill = SkillLoader(temp_dir).load_skill(skill_file)
+        assert skill.description == "Read later"
+        with pytest.raises(AttributeError):
+            Skill.instructions.__get__(skill)
+
+        assert skill.instructions == "Body text"
+        assert "Body text" in skill.to_system_prompt()
+
+    def test_frontmatter_read_stops_at_delimiter(self, temp_dir):
+        """Test loading never decodes the body past the frontmatter."""
+        skill_file = temp_dir / "large.md"
+        # Undecodable bytes well past the first read only fail once the body is read
+        skill_file.write_bytes(
+            b"---\nname: large\ndescription: Big body\n---\n" + b"x" * 65536 + b"\xff\n"
+        )
+
+        skill = SkillLoader(temp_dir).load_skill(skill_file)
+        assert skill.description == "Big body"
+        with pytest.raises(UnicodeDecodeError):
+            skill.to_system_prompt()
+
+    def test_instructions_follow_file_edits(self, temp_dir):
+        """Test a file edited before its body is read is split again."""
+        skill_file = temp_dir / "edited.md"
+        skill_file.write_text("---\nname: edited\ndescription: Before\n---\n\nBody text\n")
+
+        skill = SkillLoader(temp_dir).load_skill(skill_file)
+        skill_file.write_text("---\nname: edited\ndescription: After, longer\n---\n\nNew\n")
+
+        assert skill.instructions == "New"
+
+    def test_parsed_skills_are_bounded(self, temp_dir, monkeypatch):
+        """Test the parse cache evicts old files and forgets deleted ones."""
+        monkeypatch.setattr(skills_loader, "_parsed_skills", skills_loader.OrderedDict())
+        monkeypatch.setattr(skills_loader, "_PARSED_SKILLS_CACHE_SIZE", 2)
+        loader = SkillLoader(temp_dir)
+        files = []
+        for i in range(3):
+            files.append(temp_dir / f"skill-{i}.md")
+            files[-1].write_text(f"---\nname: skill-{i}\ndescription: Skill {i}\n---\n")
+            loader.load_skill(files[-1])
+
+        assert list(skills_loader._parsed_skills) == [f.absolute() for f in files[1:]]
+
+        files[2].unlink()
+        assert loader.load_skill(files[2]) is None
+        assert list(skills_loader._parsed_skills) == [files[1].absolute()]
+
     def test_load_skill_no_frontmatter(self, temp_dir):
         """Test loading skill without frontmatter fails gracefully."""
         skill_dir = temp_dir / "bad-skill"
@@ -65,6 +144,21 @@ class TestSkillLoader:
 
         assert skill is None
 
+    def test_load_skill_reparses_replaced_file(self, sample_skill_dir):
+        """Test a file swapped in with the same mtime and size is re-parsed."""
+        loader = SkillLoader(sample_skill_dir)
+        skill_file = sample_skill_dir / "test-skill" / "SKILL.md"
+        first = loader.load_skill(skill_file)
+        assert loader.load_skill(skill_file) is first
+
+        stat = skill_file.stat()
+        replacement = skill_file.with_name("SKILL.md.new")
+        replacement.write_text(skill_file.read_text().replace("test-skill", "tset-skill"))
+        os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        replacement.replace(skill_file)
+
+        assert loader.load_skill(skill_file).name == "tset-skill"
+
     def test_load_all_skills(self, sample_skill_dir):
         """Test loading all skills from directory."""
         loader = SkillLoader(sample_skill_dir)
@@ -74,28 +168,34 @@ class TestSkillLoader:
         assert any(s.name == "test-skill" for s in skills)
 
 
+@pytest.fixture(scope="module")
+def base_registry(shared_skill_dir):
+    """Registry loaded once per module; tests must not modify it."""
+    return SkillRegistry(shared_skill_dir)
+
+
+@pytest.fixture
+def registry(base_registry):
+    """Private copy of the shared registry for tests that modify it."""
+    return copy.deepcopy(base_registry)
+
+
 class TestSkillRegistry:
     """Tests for SkillRegistry."""
 
-    def test_registry_initialization(self, sample_skill_dir):
+    def test_registry_initialization(self, base_registry):
         """Test registry loads skills on init."""
-        registry = SkillRegistry(sample_skill_dir)
+        assert len(base_registry.list_all()) >= 1
 
-        assert len(registry.list_all()) >= 1
-
-    def test_get_skill(self, sample_skill_dir):
+    def test_get_skill(self, base_registry):
         """Test getting a skill by name."""
-        registry = SkillRegistry(sample_skill_dir)
-
-        skill = registry.get("test-skill")
+        skill = base_registry.get("test-skill")
         assert skill is not None
         assert skill.name == "test-skill"
 
-    def test_get_nonexistent_skill(self, sample_skill_dir):
+    def test_get_nonexistent_skill(self, base_registry):
         """Test getting a non-existent skill."""
-        registry = SkillRegistry(sample_skill_dir)
-
-        skill = registry.get("nonexistent")
+        skill = base_registry.get("nonexistent")
         assert skill is None
 
     def test_register_skill(self):
@@ -112,36 +212,102 @@ class TestSkillRegistry:
 
         assert registry.get("manual-skill") is not None
 
-    def test_unregister_skill(self, sample_skill_dir):
+    def test_unregister_skill(self, registry):
         """Test unregistering a skill."""
-        registry = SkillRegistry(sample_skill_dir)
-
         result = registry.unregister("test-skill")
         assert result is True
         assert registry.get("test-skill") is None
 
-    def test_get_combined_prompt(self, sample_skill_dir):
+    def test_get_combined_prompt(self, base_registry):
         """Test getting combined prompt for all skills."""
-        registry = SkillRegistry(sample_skill_dir)
+        prompt = base_registry.get_combined_prompt()
+
+        assert "## Skill:" in prompt
 
+    def test_combined_prompt_refreshed_on_unregister(self, registry):
+        """Test the cached combined prompt tracks registry changes."""
         prompt = registry.get_combined_prompt()
 
-        assert "## Skill:" in prompt
+        assert registry.get_combined_prompt() is prompt
+
+        registry.unregister("test-skill")
+        assert registry.get_combined_prompt() == ""
+
+    def test_reload_reuses_unchanged_skills(self, sample_skill_dir):
+        """Test unchanged skill files are not re-parsed, edited ones are."""
+        first = SkillRegistry(sample_skill_dir)
+        second = SkillRegistry(sample_skill_dir)
+        assert second.get("test-skill") is first.get("test-skill")
+
+        (sample_skill_dir / "test-skill" / "SKILL.md").write_text(
+            "---\nname: test-skill\ndescription: Edited description\n---\n\nNew body\n"
+        )
+        second.reload()
+        assert second.get("test-skill").description == "Edited description"
+
+    def test_reload_warns_on_duplicate_names(self, sample_skill_dir, caplog):
+        """Test a standalone file reusing a directory skill's name is reported."""
+        (sample_skill_dir / "copy.md").write_text(
+            "---\nname: test-skill\ndescription: Standalone copy\n---\n\nBody\n"
+        )
 
-    def test_match_skills(self, sample_skill_dir):
-        """Test matching skills by query."""
         registry = SkillRegistry(sample_skill_dir)
 
-        matches = registry.match_skills("test")
+        assert registry.get("test-skill").description == "Standalone copy"
+        assert "Duplicate skill name 'test-skill'" in caplog.text
+
+    def test_match_skills(self, base_registry):
+        """Test matching skills by query."""
+        matches = base_registry.match_skills("test")
         assert len(matches) >= 1
 
+    def test_match_skills_words_and_fragments(self):
+        """Test whole words and word fragments both match, case-insensitively."""
+        registry = SkillRegistry()
+        registry.register(
+            Skill(
+                name="market-sizing",
+                description="Estimates TAM",
+                instructions="",
+                path=Path("/tmp"),
+            )
+        )
+
+        assert [s.name for s in registry.match_skills("tam")] == ["market-sizing"]
+        assert [s.name for s in registry.match_skills("Estim")] == ["market-sizing"]
+        assert registry.match_skills("pricing") == []
+
+        registry.unregister("market-sizing")
+        assert registry.match_skills("tam") == []
+
+    def test_rank_skills(self):
+        """Test ranked search prefers name hits and matches stems and prefixes."""
+        registry = SkillRegistry()
+        for name, description in [
+            ("pricing-notes", "Collects notes on market pricing"),
+            ("market-sizing", "Estimates total addressable market"),
+        ]:
+            registry.register(
+                Skill(name=name, description=description, instructions="", path=Path("/tmp"))
+            )
+
+        ranked = registry.rank_skills("market")
+        assert [s.name for s in ranked] == ["market-sizing", "pricing-notes"]
+        assert [s.name for s in registry.rank_skills("estimating")] == ["market-sizing"]
+        assert [s.name for s in registry.rank_skills("addr")] == ["market-sizing"]
+        assert registry.rank_skills("market", limit=1)[0].name == "market-sizing"
+        assert registry.rank_skills("?!") == []
+
+        registry.unregister("market-sizing")
+        assert [s.name for s in registry.rank_skills("market")] == ["pricing-notes"]
+
 
 class TestCreateSkillDirectory:
     """Tests for skill directory creation."""
 
-    def test_create_skill_directory(self, temp_dir):
+    def test_create_skill_directory(self, shared_temp_dir):
         """Test creating skills directory with sample."""
-        skills_dir = create_skill_directory(temp_dir)
+        skills_dir = create_skill_directory(shared_temp_dir)
 
         assert skills_dir.exists()
         assert (skills_dir / "research-assistant" / "SKILL.md").exists()
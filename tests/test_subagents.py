@@ -1,8 +1,9 @@
 """Tests for subagent configuration and management."""
 
-
+import pytest
 
 from brainstormer.agents.subagents import (
+    DEFAULT_SUBAGENTS_JSONL,
     SubagentConfig,
     SubagentManager,
     create_default_subagents_file,
@@ -42,6 +43,20 @@ class TestSubagentConfig:
         assert deep_config["description"] == "A test agent"
         assert deep_config["model"] == "gpt-4o"
 
+    def test_deepagent_config_cached(self):
+        """Test the deepagents dict is built once and refreshed on register."""
+        config = SubagentConfig(
+            name="test-agent",
+            description="A test agent",
+            system_prompt="You are a test agent.",
+        )
+
+        assert config.deepagent_config is config.deepagent_config
+
+        config.model = "gpt-4o"
+        SubagentManager().register(config)
+        assert config.deepagent_config["model"] == "gpt-4o"
+
     def test_from_dict(self):
         """Test creating config from dictionary."""
         data = {
@@ -84,17 +99,17 @@ class TestLoadSubagents:
         assert configs[0].name == "test-agent-1"
         assert configs[1].name == "test-agent-2"
 
-    def test_load_empty_file(self, temp_dir):
+    def test_load_empty_file(self, shared_temp_dir):
         """Test loading from empty file."""
-        file_path = temp_dir / "empty.jsonl"
+        file_path = shared_temp_dir / "empty.jsonl"
         file_path.write_text("")
 
         configs = load_subagents_from_jsonl(file_path)
         assert len(configs) == 0
 
-    def test_load_with_comments(self, temp_dir):
+    def test_load_with_comments(self, shared_temp_dir):
         """Test loading with comment lines."""
-        file_path = temp_dir / "comments.jsonl"
+        file_path = shared_temp_dir / "comments.jsonl"
         file_path.write_text("""\
 # This is a comment
 {"name": "agent", "description": "desc", "system_prompt": "prompt"}
@@ -137,36 +152,105 @@ class TestSaveSubagents:
         assert loaded[0].name == "agent1"
 
 
+@pytest.fixture(scope="module")
+def subagent_manager(shared_subagents_file):
+    """Manager loaded once per module; tests must not register or reload."""
+    return SubagentManager(shared_subagents_file)
+
+
 class TestSubagentManager:
     """Tests for SubagentManager."""
 
-    def test_manager_initialization(self, sample_subagents_file):
+    def test_manager_initialization(self, subagent_manager):
         """Test manager loads configs on init."""
-        manager = SubagentManager(sample_subagents_file)
-
-        assert len(manager.list_all()) == 2
+        assert len(subagent_manager.list_all()) == 2
 
-    def test_get_subagent(self, sample_subagents_file):
+    def test_get_subagent(self, subagent_manager):
         """Test getting subagent by name."""
-        manager = SubagentManager(sample_subagents_file)
-
-        config = manager.get("test-agent-1")
+        config = subagent_manager.get("test-agent-1")
         assert config is not None
         assert config.name == "test-agent-1"
 
-    def test_match_for_focus(self, sample_subagents_file):
+    def test_match_for_focus(self, subagent_manager):
         """Test matching subagents for focus area."""
-        manager = SubagentManager(sample_subagents_file)
-
-        matches = manager.match_for_focus("testing")
+        matches = subagent_manager.match_for_focus("testing")
         assert len(matches) >= 1
         assert any(m.name == "test-agent-1" for m in matches)
 
-    def test_create_dynamic_subagent(self, sample_subagents_file):
-        """Test creating dynamic subagent config."""
+    def test_match_for_focus_sees_registered_configs(self, sample_subagents_file):
+        """Test cached matches are refreshed when a config is registered."""
+        manager = SubagentManager(sample_subagents_file)
+        assert manager.match_for_focus("quantum") == []
+
+        manager.register(SubagentConfig(
+            name="quantum-agent",
+            description="Quantum computing specialist",
+            system_prompt="You study quantum computing.",
+            focus_areas=["quantum"],
+        ))
+
+        matches = manager.match_for_focus("quantum")
+        assert [m.name for m in matches] == ["quantum-agent"]
+
+    def test_match_for_focus_substrings(self):
+        """Test matching keeps substring semantics in both directions."""
+        manager = SubagentManager()
+        manager.register(SubagentConfig(
+            name="market-agent",
+            description="Studies markets",
+            system_prompt="Prompt.",
+            focus_areas=["market"],
+        ))
+        manager.register(SubagentConfig(
+            name="ml-agent",
+            description="Machine learning",
+            system_prompt="Prompt.",
+            capabilities=["ml"],
+        ))
+
+        assert [m.name for m in manager.match_for_focus("Marketing Strategy")] == ["market-agent"]
+        assert [m.name for m in manager.match_for_focus("mark")] == ["market-agent"]
+        assert [m.name for m in manager.match_for_focus("applied ml")] == ["ml-agent"]
+
+        manager.register(SubagentConfig(
+            name="market-agent",
+            description="Studies pricing",
+            system_prompt="Prompt.",
+            focus_areas=["pricing"],
+        ))
+        assert manager.match_for_focus("marketing") == []
+
+    def test_reload_reuses_unchanged_file(self, sample_subagents_file):
+        """Test an unchanged subagents file is parsed once and edits are seen."""
+        first = SubagentManager(sample_subagents_file)
+        second = SubagentManager(sample_subagents_file)
+        name = first.list_all()[0].name
+        assert second.get(name) is first.get(name)
+
+        sample_subagents_file.write_text(
+            '{"name": "only-agent", "description": "Replaced", "system_prompt": "Prompt"}\n'
+        )
+        second.reload()
+        assert [config.name for config in second.list_all()] == ["only-agent"]
+
+    def test_deepagent_configs(self, sample_subagents_file):
+        """Test converted configs are cached and refreshed on register."""
         manager = SubagentManager(sample_subagents_file)
 
-        config = manager.create_dynamic_subagent(
+        configs = manager.deepagent_configs
+        assert len(configs) == 2
+        assert manager.deepagent_configs is configs
+
+        manager.register(SubagentConfig(
+            name="extra-agent",
+            description="Extra",
+            system_prompt="Extra prompt.",
+        ))
+        assert [c["name"] for c in manager.deepagent_configs][-1] == "extra-agent"
+
+    def test_create_dynamic_subagent(self, subagent_manager):
+        """Test creating dynamic subagent config."""
+        config = subagent_manager.create_dynamic_subagent(
             name="dynamic-agent",
             focus_area="Machine Learning",
             base_prompt="Additional context here.",
@@ -185,7 +269,7 @@ class TestCreateDefaultSubagents:
         file_path = temp_dir / "subagents.jsonl"
         create_default_subagents_file(file_path)
 
-        assert file_path.exists()
+        assert file_path.read_bytes() == DEFAULT_SUBAGENTS_JSONL
 
         configs = load_subagents_from_jsonl(file_path)
         assert len(configs) >= 4  # Default has 4 agents
@@ -0,0 +1,75 @@
+"""Tests for agent tools."""
+
+import threading
+
+import pytest
+
+from brainstormer.agents import tools
+from brainstormer.agents.tools import create_search_tool
+
+
+class FakeSearchClient:
+    """Tavily stand-in that counts searches."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def search(self, query, **kwargs):
+        self.calls += 1
+        return {"results": [{"title": query, "url": "https://example.com"}]}
+
+
+@pytest.fixture
+def search_client(monkeypatch):
+    """Fake search client behind an empty in-process cache."""
+    client = FakeSearchClient()
+    monkeypatch.setattr(tools, "_get_search_client", lambda *args: client)
+    monkeypatch.setattr(tools, "_search_cache", tools.OrderedDict())
+    return client
+
+
+class TestSearchCache:
+    """Tests for search result caching."""
+
+    async def test_hits_are_copies(self, search_client):
+        """Test changing returned results doesn't change the cached ones."""
+        search = create_search_tool(api_key="test-key", cache_ttl=60)
+
+        first = await search("solar panels")
+        first["results"].clear()
+        second = await search("solar panels")
+        second["results"][0]["title"] = "changed"
+
+        assert (await search("solar panels"))["results"][0]["title"] == "solar panels"
+        assert search_client.calls == 1
+
+    async def test_news_is_not_cached(self, search_client):
+        """Test news searches always go to the API."""
+        search = create_search_tool(api_key="test-key", cache_ttl=60)
+
+        await search("election results", topic="news")
+        await search("election results", topic="news")
+
+        assert search_client.calls == 2
+        assert not tools._search_cache
+
+    async def test_store_is_used_off_the_event_loop(self, search_client, sqlite_store, monkeypatch):
+        """Test persistent cache reads and writes run on worker threads."""
+        threads = []
+        for name in ("get_search_result", "put_search_result"):
+            method = getattr(sqlite_store, name)
+
+            def record(*args, _method=method, **kwargs):
+                threads.append(threading.get_ident())
+                return _method(*args, **kwargs)
+
+            monkeypatch.setattr(sqlite_store, name, record)
+        search = create_search_tool(api_key="test-key", cache_ttl=60, cache_store=sqlite_store)
+
+        await search("solar panels")
+        tools._search_cache.clear()
+        assert (await search("solar panels"))["results"][0]["title"] == "solar panels"
+
+        assert search_client.calls == 1
+        assert len(threads) == 3
+        assert threading.get_ident() not in threads